@@ -43,6 +43,34 @@ def get_binance_us_secret():
     return load_config('BINANCE_US_SECRET')
 
 
+
+def get_http_transport(asynchronous: bool = True, **transport_kwargs):
+    """
+    Get the httpx record/replay transport configured by HTTP_FIXTURES_DIR, HTTP_FIXTURES_MODE
+    ('replay', 'record' or 'auto') and HTTP_FIXTURES_LATENCY (seconds or 'recorded').
+    Returns None when HTTP_FIXTURES_DIR is unset, so requests go to the network as usual.
+    """
+    path = load_config('HTTP_FIXTURES_DIR')
+    if not path:
+        return None
+
+    try:
+        import httpx
+        from tmai_api.transport import AsyncRecordReplayTransport, RecordReplayTransport
+    except ImportError as e:
+        raise ImportError("HTTP_FIXTURES_DIR requires the SDK: pip install ./python[async]") from e
+
+    latency = load_config('HTTP_FIXTURES_LATENCY')
+    if latency not in (None, 'recorded'):
+        latency = float(latency)
+    mode = load_config('HTTP_FIXTURES_MODE', 'replay')
+
+    if asynchronous:
+        return AsyncRecordReplayTransport(path, mode=mode, latency=latency,
+                                          transport=httpx.AsyncHTTPTransport(**transport_kwargs))
+    return RecordReplayTransport(path, mode=mode, latency=latency,
+                                 transport=httpx.HTTPTransport(**transport_kwargs))
+
 if __name__ == "__main__":
     # Example usage
     print(load_config('MASA_API_KEY'))
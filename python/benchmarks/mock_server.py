@@ -0,0 +1,237 @@
+import datetime
+import gzip
+import json
+import random
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+# Token IDs served by the synthetic tokens catalog
+DEFAULT_TOKENS = 500
+
+# Endpoints with one row per token per hour; the others have one row per day
+HOURLY_ENDPOINTS = ('hourly-ohlcv',)
+
+# Endpoints whose rows are not per token
+MARKET_ENDPOINTS = ('market-metrics', 'trader-indices')
+
+def _seeded(*parts):
+    # Deterministic pseudo-random value in [0, 1) for a row, so pages are stable across requests
+    return (zlib.crc32(":".join(str(p) for p in parts).encode()) & 0xffffffff) / 2 ** 32
+
+def _token(token_id):
+    return {"TOKEN_ID": token_id, "TOKEN_NAME": f"Token {token_id}", "TOKEN_SYMBOL": f"T{token_id}"}
+
+def _ohlcv_row(token_id, timestamp):
+    base = 1 + 1000 * _seeded(token_id)
+    close = base * (0.5 + _seeded(token_id, timestamp))
+    return dict(_token(token_id), DATE=timestamp, OPEN=close * 0.99, HIGH=close * 1.02,
+                LOW=close * 0.97, CLOSE=close, VOLUME=1e6 * _seeded(token_id, timestamp, "v"))
+
+def _row(endpoint, token_id, timestamp):
+    """Build one synthetic row of an endpoint.
+    
+    Args:
+        endpoint (str): API endpoint path
+        token_id (int): Token ID, or None for market-level endpoints
+        timestamp (str): ISO 8601 timestamp of the row
+    
+    Returns:
+        dict: Row shaped like the real API response
+    """
+    value = _seeded(endpoint, token_id, timestamp)
+    if endpoint in ('daily-ohlcv', 'hourly-ohlcv'):
+        return _ohlcv_row(token_id, timestamp)
+    if endpoint == 'trader-grades':
+        return dict(_token(token_id), DATE=timestamp, TM_TRADER_GRADE=100 * value,
+                    TA_GRADE=100 * _seeded(token_id, timestamp, "ta"),
+                    QUANT_GRADE=100 * _seeded(token_id, timestamp, "quant"))
+    if endpoint == 'investor-grades':
+        return dict(_token(token_id), DATE=timestamp, TM_INVESTOR_GRADE=100 * value)
+    if endpoint == 'trading-signals':
+        signal = int(value * 3) - 1
+        return dict(_token(token_id), DATE=timestamp, TRADING_SIGNAL=signal, TOKEN_TREND=signal or 1,
+                    TRADING_SIGNALS_RETURNS=2 * value, HOLDING_RETURNS=1.5 * value,
+                    TM_TRADER_GRADE=100 * value, TM_INVESTOR_GRADE=100 * (1 - value),
+                    tm_link="", TM_LINK=f"https://app.tokenmetrics.com/en/token-{token_id}")
+    if endpoint == 'market-metrics':
+        return {"DATE": timestamp, "FEAR_AND_GREED_VALUE": 100 * value}
+    return {"DATE": timestamp, "TOKEN_ID": int(value * DEFAULT_TOKENS), "WEIGHT": value}
+
+class MockTokenMetricsAPI:
+    """Local HTTP stand-in for api.tokenmetrics.com/v2 serving synthetic data.
+    
+    Rows are generated deterministically from the token ID and timestamp, so
+    repeated and concurrent page requests see a consistent dataset. Latency,
+    the server-side page limit and the error rate are configurable to mimic
+    production behaviour.
+    """
+    
+    def __init__(self, latency=0.0, max_limit=None, error_rate=0.0, tokens=DEFAULT_TOKENS,
+                 compress=True, seed=0, host="127.0.0.1", port=0):
+        """Initialize the stand-in.
+        
+        Args:
+            latency (float, optional): Seconds added to every response
+            max_limit (int, optional): Largest page size honoured; larger limits are capped
+            error_rate (float, optional): Fraction of requests answered with a 500 or 429
+            tokens (int, optional): Number of tokens in the synthetic catalog
+            compress (bool, optional): gzip responses when the client accepts it
+            seed (int, optional): Seed of the error injection
+            host (str, optional): Interface to bind
+            port (int, optional): Port to bind; 0 picks a free one
+        """
+        self.latency = latency
+        self.max_limit = max_limit
+        self.error_rate = error_rate
+        self.tokens = tokens
+        self.compress = compress
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+        self.rows = 0
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._thread = None
+    
+    @property
+    def url(self):
+        """Base URL to use in place of https://api.tokenmetrics.com/v2."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v2"
+    
+    def start(self):
+        """Serve requests on a background thread.
+        
+        Returns:
+            MockTokenMetricsAPI: This server, for chaining
+        """
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+    
+    def stop(self):
+        """Stop serving and release the port."""
+        self._server.shutdown()
+        self._server.server_close()
+    
+    def __enter__(self):
+        return self.start()
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+    
+    def stats(self):
+        """Return the number of requests, injected errors and rows served so far.
+        
+        Returns:
+            dict: requests, errors and rows counters
+        """
+        with self._lock:
+            return {"requests": self.requests, "errors": self.errors, "rows": self.rows}
+    
+    def _token_ids(self, params):
+        if 'token_id' in params:
+            return [int(t) for t in params['token_id'].split(',') if t.strip()]
+        if 'symbol' in params:
+            return [int(s.strip()[1:]) for s in params['symbol'].split(',') if s.strip()[1:].isdigit()]
+        return list(range(1, self.tokens + 1))
+    
+    def _timestamps(self, endpoint, params):
+        today = datetime.date.today()
+        start = datetime.date.fromisoformat(params.get('startDate', str(today)))
+        end = datetime.date.fromisoformat(params.get('endDate', str(today)))
+        hours = range(24) if endpoint in HOURLY_ENDPOINTS else (0,)
+        timestamps = []
+        day = start
+        while day <= end:
+            timestamps.extend(f"{day}T{hour:02d}:00:00.000Z" for hour in hours)
+            day += datetime.timedelta(days=1)
+        return timestamps
+    
+    def rows_for(self, endpoint, params):
+        """Generate every row matching a request, before pagination.
+        
+        Args:
+            endpoint (str): API endpoint path
+            params (dict): Query parameters
+        
+        Returns:
+            list: Rows sorted by token and date
+        """
+        if endpoint == 'tokens':
+            return [_token(token_id) for token_id in self._token_ids(params)]
+        timestamps = self._timestamps(endpoint, params)
+        if endpoint in MARKET_ENDPOINTS:
+            return [_row(endpoint, None, timestamp) for timestamp in timestamps]
+        return [_row(endpoint, token_id, timestamp)
+                for token_id in self._token_ids(params) for timestamp in timestamps]
+    
+    def _respond(self, path, params):
+        """Build the status code, headers and JSON body of a request.
+        
+        Args:
+            path (str): Request path, e.g. /v2/daily-ohlcv
+            params (dict): Query parameters
+        
+        Returns:
+            tuple: (status code, headers dict, body dict)
+        """
+        endpoint = path.rstrip('/').rsplit('/', 1)[-1]
+        with self._lock:
+            self.requests += 1
+            fail = self.error_rate and self._random.random() < self.error_rate
+            if fail:
+                self.errors += 1
+                throttled = self._random.random() < 0.5
+        if fail:
+            if throttled:
+                return 429, {"Retry-After": "0"}, {"success": False, "message": "Too many requests"}
+            return 500, {}, {"success": False, "message": "Internal server error"}
+        
+        limit = int(params.get('limit', 1000))
+        if self.max_limit:
+            limit = min(limit, self.max_limit)
+        page = int(params.get('page', 0))
+        rows = self.rows_for(endpoint, params)[page * limit:(page + 1) * limit]
+        with self._lock:
+            self.rows += len(rows)
+        return 200, {}, {"success": True, "message": "Data fetched successfully",
+                         "length": len(rows), "data": rows}
+    
+    def _handler(self):
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body go out in separate writes; avoid Nagle delays on keep-alive
+            disable_nagle_algorithm = True
+            
+            def do_GET(self):
+                url = urlparse(self.path)
+                # Repeated parameters (token_id=1&token_id=2) behave like comma-separated lists
+                params = {k: ",".join(v) for k, v in parse_qs(url.query).items()}
+                if api.latency:
+                    time.sleep(api.latency)
+                status, headers, body = api._respond(url.path, params)
+                
+                payload = json.dumps(body).encode()
+                if api.compress and "gzip" in self.headers.get("Accept-Encoding", ""):
+                    payload = gzip.compress(payload, compresslevel=1)
+                    headers["Content-Encoding"] = "gzip"
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(payload)
+            
+            def log_message(self, format, *args):
+                # Keep benchmark output clean
+                pass
+        
+        return Handler
@@ -0,0 +1,286 @@
+"""Offline benchmarks of the SDK and MCP server against a local mock API.
+
+Usage:
+    python -m benchmarks.run [--tokens 20] [--days 365] [--workers 8] [--latency 0.005]
+                             [--json results.json] [--baseline previous.json]
+
+Every case runs in a fresh interpreter so peak RSS is measured per case.
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+
+try:
+    import resource
+except ImportError:  # resource is not available on Windows
+    resource = None
+
+from benchmarks.mock_server import MockTokenMetricsAPI
+
+# Directory holding the tmai_api and benchmarks packages
+PACKAGE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Repository root holding config.py and the MCP servers in src/
+REPO_ROOT = os.path.dirname(PACKAGE_ROOT)
+
+# Benchmark cases in the order they run
+CASES = (
+    'daily-ohlcv',
+    'hourly-ohlcv',
+    'trading-signals',
+    'to-dataframe-pandas',
+    'to-dataframe-arrow',
+    'to-dataframe-polars',
+    'mcp-get-trading-signals',
+    'mcp-get-token-info'
+)
+
+# Calls made by each MCP tool case
+MCP_CALLS = 50
+
+def peak_rss_mb():
+    """Return the peak resident set size of this process in MiB, or None if unknown."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in KiB elsewhere
+    return peak / 2 ** 20 if sys.platform == 'darwin' else peak / 2 ** 10
+
+def make_client(config):
+    """Create a TokenMetricsClient pointed at the mock API.
+    
+    Args:
+        config (dict): Benchmark configuration including url and workers
+    
+    Returns:
+        tuple: (client, MetricsCollector)
+    """
+    from tmai_api import MetricsCollector, TokenMetricsClient
+    
+    client_class = type("BenchmarkClient", (TokenMetricsClient,), {"BASE_URL": config['url']})
+    metrics = MetricsCollector()
+    client = client_class(api_key="benchmark", max_workers=config['workers'],
+                          pool_maxsize=max(10, config['workers']), backoff_factor=0.01,
+                          instrumentation=metrics)
+    return client, metrics
+
+def fetch_params(config):
+    end = time.strftime("%Y-%m-%d")
+    start = time.strftime("%Y-%m-%d", time.localtime(time.time() - (config['days'] - 1) * 86400))
+    token_ids = ",".join(str(token_id) for token_id in range(1, config['tokens'] + 1))
+    return {'token_id': token_ids, 'startDate': start, 'endDate': end}
+
+def bench_paginated(config, attribute, days=None):
+    """Time a full paginated fetch through _paginated_request.
+    
+    Args:
+        config (dict): Benchmark configuration
+        attribute (str): Client endpoint attribute, e.g. daily_ohlcv
+        days (int, optional): Override of the date range length
+    
+    Returns:
+        dict: seconds, requests and rows
+    """
+    client, metrics = make_client(dict(config, days=days or config['days']))
+    params = fetch_params(dict(config, days=days or config['days']))
+    started = time.perf_counter()
+    result = getattr(client, attribute).get(**params)
+    seconds = time.perf_counter() - started
+    summary = metrics.summary()
+    return {"seconds": seconds, "requests": sum(s['requests'] for s in summary.values()),
+            "rows": len(result.get("data", []))}
+
+def bench_to_dataframe(config, backend):
+    """Time to_dataframe on an already fetched daily OHLCV response.
+    
+    Backends are imported lazily on first use, so an untimed warm-up
+    conversion runs first and only the conversion itself is measured.
+    
+    Args:
+        config (dict): Benchmark configuration
+        backend (str): 'pandas', 'arrow' or 'polars'
+    
+    Returns:
+        dict: seconds, requests (None, only conversion is timed) and rows
+    """
+    client, _ = make_client(config)
+    data = client.daily_ohlcv.get(**fetch_params(config))
+    client.daily_ohlcv.to_dataframe({"data": data["data"][:1]}, backend)
+    started = time.perf_counter()
+    frame = client.daily_ohlcv.to_dataframe(data, backend)
+    seconds = time.perf_counter() - started
+    return {"seconds": seconds, "requests": None, "rows": len(frame)}
+
+def bench_mcp(config, tool):
+    """Time repeated MCP tool calls against the mock API.
+    
+    Args:
+        config (dict): Benchmark configuration
+        tool (str): 'get_trading_signals' or 'get_token_info'
+    
+    Returns:
+        dict: seconds, requests and rows
+    """
+    os.environ['TOKEN_METRICS_API_BASE'] = config['url']
+    os.environ.setdefault('TOKEN_METRICS_API_KEY', "benchmark")
+    sys.path[:0] = [REPO_ROOT, os.path.join(REPO_ROOT, 'src')]
+    server = __import__('token_metrics_mcp_server')
+    
+    async def call_tools():
+        rows = 0
+        for _ in range(MCP_CALLS):
+            if tool == 'get_trading_signals':
+                response = await server.get_trading_signals(["BTC", "ETH", "SOL"], days=config['days'])
+                rows += response.length if response else 0
+            else:
+                # Drop the catalog index so every call measures download and indexing
+                server.token_index["fetched_at"] = 0.0
+                response = await server.get_token_info("T1", "Token 1")
+                rows += len(server.token_index["by_symbol"])
+        return rows
+    
+    requests_before = server.request_stats["requests"]
+    started = time.perf_counter()
+    rows = asyncio.run(call_tools())
+    seconds = time.perf_counter() - started
+    if tool == 'get_trading_signals':
+        requests = server.request_stats["requests"] - requests_before
+    else:
+        # fetch_token_metrics bypasses make_api_request: one catalog download per call
+        requests = MCP_CALLS
+    return {"seconds": seconds, "requests": requests, "rows": rows}
+
+def run_case(case, config):
+    """Run one benchmark case in this process.
+    
+    Args:
+        case (str): Name from CASES
+        config (dict): Benchmark configuration
+    
+    Returns:
+        dict: seconds, requests, rows and peak_rss_mb, or skipped with a reason
+    """
+    try:
+        if case == 'daily-ohlcv':
+            result = bench_paginated(config, 'daily_ohlcv')
+        elif case == 'hourly-ohlcv':
+            # Hourly bars are 24x denser, so a shorter range keeps the case comparable
+            result = bench_paginated(config, 'hourly_ohlcv', days=max(1, config['days'] // 12))
+        elif case == 'trading-signals':
+            result = bench_paginated(config, 'trading_signals')
+        elif case.startswith('to-dataframe-'):
+            result = bench_to_dataframe(config, case[len('to-dataframe-'):])
+        elif case == 'mcp-get-trading-signals':
+            result = bench_mcp(config, 'get_trading_signals')
+        elif case == 'mcp-get-token-info':
+            result = bench_mcp(config, 'get_token_info')
+        else:
+            raise ValueError(f"Unknown benchmark case: {case}")
+    except ImportError as e:
+        return {"skipped": str(e)}
+    result["peak_rss_mb"] = peak_rss_mb()
+    return result
+
+def run_isolated(case, config):
+    """Run a case in a fresh interpreter and return its result.
+    
+    Args:
+        case (str): Name from CASES
+        config (dict): Benchmark configuration
+    
+    Returns:
+        dict: Result of run_case, or skipped with the child's error output
+    """
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [PACKAGE_ROOT, os.environ.get('PYTHONPATH')])))
+    process = subprocess.run(
+        [sys.executable, "-m", "benchmarks.run", "--case", case, "--config", json.dumps(config)],
+        cwd=PACKAGE_ROOT, env=env, capture_output=True, text=True
+    )
+    if process.returncode != 0:
+        return {"skipped": process.stderr.strip().splitlines()[-1] if process.stderr.strip() else "failed"}
+    return json.loads(process.stdout.strip().splitlines()[-1])
+
+def format_results(results, baseline=None, threshold=0.2):
+    """Format results as a table, flagging cases slower than the baseline.
+    
+    Args:
+        results (dict): Results per case
+        baseline (dict, optional): Results of a previous run
+        threshold (float, optional): Relative rows/s drop reported as a regression
+    
+    Returns:
+        tuple: (table text, list of regressed case names)
+    """
+    lines = [f"{'case':<26}{'seconds':>9}{'req/s':>10}{'rows/s':>12}{'peak MiB':>10}"]
+    regressions = []
+    for case, result in results.items():
+        if "skipped" in result:
+            lines.append(f"{case:<26}skipped: {result['skipped']}")
+            continue
+        seconds = result['seconds']
+        requests_per_second = "-" if not result['requests'] else f"{result['requests'] / seconds:.0f}"
+        rows_per_second = result['rows'] / seconds if seconds else 0
+        rss = "-" if result['peak_rss_mb'] is None else f"{result['peak_rss_mb']:.0f}"
+        line = f"{case:<26}{seconds:>9.3f}{requests_per_second:>10}{rows_per_second:>12.0f}{rss:>10}"
+        
+        previous = (baseline or {}).get(case)
+        if previous and "skipped" not in previous and previous['seconds']:
+            previous_rate = previous['rows'] / previous['seconds']
+            if previous_rate and rows_per_second < previous_rate * (1 - threshold):
+                regressions.append(case)
+                line += f"  REGRESSION ({rows_per_second / previous_rate - 1:+.0%} rows/s)"
+        lines.append(line)
+    return "\n".join(lines), regressions
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run", description=__doc__.splitlines()[0])
+    parser.add_argument('--cases', default=",".join(CASES), help="Comma-separated cases to run")
+    parser.add_argument('--tokens', type=int, default=20, help="Tokens per request")
+    parser.add_argument('--days', type=int, default=365, help="Length of the date range")
+    parser.add_argument('--workers', type=int, default=8, help="Client max_workers")
+    parser.add_argument('--latency', type=float, default=0.005, help="Mock server latency in seconds")
+    parser.add_argument('--max-limit', type=int, default=None,
+                        help="Mock server page size cap (smaller than the client limit ends chunks early)")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Fraction of 429/500 responses")
+    parser.add_argument('--json', help="Write the results to this file")
+    parser.add_argument('--baseline', help="Results file of a previous run to compare against")
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help="Relative rows/s drop reported as a regression")
+    # Internal: run a single case in this process
+    parser.add_argument('--case', help=argparse.SUPPRESS)
+    parser.add_argument('--config', help=argparse.SUPPRESS)
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.case:
+        print(json.dumps(run_case(args.case, json.loads(args.config))))
+        return 0
+    
+    cases = [case.strip() for case in args.cases.split(',') if case.strip()]
+    with MockTokenMetricsAPI(latency=args.latency, max_limit=args.max_limit,
+                             error_rate=args.error_rate) as server:
+        config = {"url": server.url, "tokens": args.tokens, "days": args.days, "workers": args.workers}
+        results = {case: run_isolated(case, config) for case in cases}
+        served = server.stats()
+    
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+    table, regressions = format_results(results, baseline, args.threshold)
+    print(table)
+    print(f"Mock server: {served['requests']} requests, {served['errors']} injected errors, "
+          f"{served['rows']} rows")
+    
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    return 1 if regressions else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
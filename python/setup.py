@@ -12,7 +12,7 @@ setup(
     long_description=long_description,
     long_description_content_type="text/markdown",
     url="https://github.com/token-metrics/tmai-api",
-    packages=find_packages(),
+    packages=find_packages(exclude=["benchmarks*", "tests*"]),
     classifiers=[
         "Programming Language :: Python :: 3",
         "License :: OSI Approved :: MIT License",
@@ -25,4 +25,15 @@ setup(
         "matplotlib",
         "vectorbt",
     ],
+    extras_require={
+        "async": ["httpx"],
+        "store": ["pyarrow"],
+        "arrow": ["pyarrow"],
+        "polars": ["polars", "pyarrow"],
+    },
+    entry_points={
+        "console_scripts": [
+            "tmai-backfill=tmai_api.cli:main",
+        ],
+    },
 )
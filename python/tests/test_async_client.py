@@ -0,0 +1,186 @@
+import asyncio
+import json
+import unittest
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+from tmai_api import AsyncTokenMetricsClient
+
+@unittest.skipIf(httpx is None, "httpx is not installed")
+class TestAsyncTokenMetricsClient(unittest.TestCase):
+
+    def _client(self, handler, **kwargs):
+        client = AsyncTokenMetricsClient(api_key="test-api-key", **kwargs)
+        client.http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        return client
+    
+    def test_client_initialization(self):
+        client = AsyncTokenMetricsClient(api_key="test-api-key")
+        self.assertEqual(client.BASE_URL, "https://api.tokenmetrics.com/v2")
+        for name in ("tokens", "hourly_ohlcv", "daily_ohlcv", "investor_grades", "trader_grades",
+                     "trader_indices", "market_metrics", "ai_agent", "ai_reports", "trading_signals"):
+            self.assertIsNotNone(getattr(client, name))
+        asyncio.run(client.aclose())
+    
+    def test_tokens_endpoint(self):
+        requests_seen = []
+        
+        def handler(request):
+            requests_seen.append(request)
+            return httpx.Response(200, json={"data": [{"symbol": "BTC", "name": "Bitcoin"}]})
+        
+        async def run():
+            async with self._client(handler) as client:
+                return await client.tokens.get(symbol="BTC")
+        
+        result = asyncio.run(run())
+        self.assertEqual(result, {"data": [{"symbol": "BTC", "name": "Bitcoin"}]})
+        self.assertEqual(len(requests_seen), 1)
+        self.assertEqual(requests_seen[0].headers["api_key"], "test-api-key")
+        self.assertEqual(requests_seen[0].url.params["symbol"], "BTC")
+    
+    def test_ai_agent_answer_text(self):
+        def handler(request):
+            self.assertEqual(json.loads(request.content), {"messages": [{"user": "BTC?"}]})
+            return httpx.Response(200, json={"success": True, "answer": "Bullish."})
+        
+        async def run():
+            async with self._client(handler) as client:
+                return await client.ai_agent.get_answer_text("BTC?")
+        
+        self.assertEqual(asyncio.run(run()), "Bullish.")
+    
+    def test_paginated_chunks_and_pages(self):
+        def handler(request):
+            params = request.url.params
+            page = int(params["page"])
+            # Two full pages and a short one for every date chunk
+            size = 100 if page < 2 else 5
+            rows = [{"DATE": params["startDate"], "PAGE": page} for _ in range(size)]
+            return httpx.Response(200, json={"success": True, "data": rows})
+        
+        async def run():
+            async with self._client(handler, max_workers=4) as client:
+                return await client.daily_ohlcv.get_dataframe(
+                    token_id="3375", startDate="2023-01-01", endDate="2023-03-31", max_days=29)
+        
+        df = asyncio.run(run())
+        self.assertEqual(len(df), 3 * 205)
+        self.assertTrue(df["DATE"].is_monotonic_increasing)
+    
+    def test_iter_records_streams_chunks_in_order(self):
+        def handler(request):
+            return httpx.Response(200, json={"data": [{"DATE": request.url.params["startDate"]}]})
+        
+        async def run():
+            async with self._client(handler, max_workers=2) as client:
+                return [row["DATE"] async for row in client.market_metrics.iter_records(
+                    startDate="2023-01-01", endDate="2023-03-31")]
+        
+        self.assertEqual(asyncio.run(run()), ["2023-01-01", "2023-01-31", "2023-03-02"])
+
+    def test_identical_concurrent_requests_share_one_call(self):
+        calls = []
+        
+        async def handler(request):
+            calls.append(request.url.params["token_id"])
+            await asyncio.sleep(0.05)
+            return httpx.Response(200, json={"data": [{"TOKEN_ID": 3375}]})
+        
+        async def run():
+            async with self._client(handler) as client:
+                results = await asyncio.gather(*[client.trading_signals.get(token_id="3375")
+                                                 for _ in range(5)])
+                return results, client.single_flight.stats()
+        
+        results, stats = asyncio.run(run())
+        self.assertEqual(calls, ["3375"])
+        self.assertEqual(stats, {"calls": 1, "shared": 4})
+        self.assertTrue(all(result == {"data": [{"TOKEN_ID": 3375}]} for result in results))
+
+    
+    def test_leaders_deadline_does_not_fail_waiting_callers(self):
+        calls = []
+        
+        async def handler(request):
+            calls.append(request.url.params["token_id"])
+            await asyncio.sleep(0.2)
+            return httpx.Response(200, json={"data": [{"TOKEN_ID": 3375}]})
+        
+        async def patient_get(client):
+            await asyncio.sleep(0.03)
+            return await client.trading_signals.get(token_id="3375")
+        
+        async def run():
+            async with self._client(handler) as client:
+                return await asyncio.gather(client.trading_signals.get(token_id="3375", deadline=0.1),
+                                            patient_get(client))
+        
+        hurried, patient = asyncio.run(run())
+        self.assertTrue(hurried["partial"])
+        # The caller without a deadline took over when the leader was cancelled
+        self.assertEqual(patient, {"data": [{"TOKEN_ID": 3375}]})
+        self.assertEqual(calls, ["3375", "3375"])
+    
+    def test_concurrent_token_loads_are_batched_into_one_request(self):
+        calls = []
+        
+        async def handler(request):
+            calls.append(request.url.params["token_id"])
+            return httpx.Response(200, json={"data": [{"TOKEN_ID": int(token_id)}
+                                                      for token_id in calls[-1].split(",")]})
+        
+        async def run():
+            async with self._client(handler) as client:
+                results = await asyncio.gather(*[client.trading_signals.load(token_id)
+                                                 for token_id in ("3375", "3306", "3988")])
+                return results, client.loader.stats()
+        
+        results, stats = asyncio.run(run())
+        self.assertEqual(calls, ["3375,3306,3988"])
+        self.assertEqual(stats, {"loads": 3, "requests": 1})
+        self.assertEqual([result["data"] for result in results],
+                         [[{"TOKEN_ID": 3375}], [{"TOKEN_ID": 3306}], [{"TOKEN_ID": 3988}]])
+    
+    def test_deadline_cancels_outstanding_chunks_and_flags_partial_results(self):
+        calls = []
+        
+        async def handler(request):
+            calls.append(request.url.params["startDate"])
+            await asyncio.sleep(0.25)
+            return httpx.Response(200, json={"data": [{"DATE": calls[-1]}]})
+        
+        async def run():
+            async with self._client(handler) as client:
+                return await client.daily_ohlcv.get(token_id="3375", startDate="2023-01-01",
+                                                    endDate="2023-03-31", max_days=29, deadline=0.35)
+        
+        result = asyncio.run(run())
+        self.assertEqual(calls, ["2023-01-01", "2023-01-31"])
+        self.assertEqual(result["data"], [{"DATE": "2023-01-01"}])
+        self.assertTrue(result["partial"])
+        self.assertEqual([failure["error"] for failure in result["failed_chunks"]],
+                         ["DeadlineExceeded: deadline of 0.35s exceeded"] * 2)
+    
+    def test_call_deadline_applies_to_every_page_request(self):
+        async def handler(request):
+            await asyncio.sleep(0.15)
+            page = int(request.url.params["page"])
+            rows = [{"DATE": f"2023-01-01/{page}/{i}"} for i in range(100 if page < 2 else 10)]
+            return httpx.Response(200, json={"data": rows})
+        
+        async def run():
+            # The call's own budget replaces the client default for each of its pages
+            async with self._client(handler, deadline=0.1) as client:
+                return await client.daily_ohlcv.get(token_id="3375", startDate="2023-01-01",
+                                                    endDate="2023-01-05", deadline=5)
+        
+        result = asyncio.run(run())
+        self.assertNotIn("failed_chunks", result)
+        self.assertEqual(len(result["data"]), 210)
+
+if __name__ == '__main__':
+    unittest.main()
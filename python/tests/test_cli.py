@@ -0,0 +1,117 @@
+import datetime
+import io
+import os
+import pickle
+import tempfile
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+from unittest import mock
+
+import requests
+
+from tmai_api.cli import load_universe, main
+from tmai_api.store import LocalStore, pa
+
+class TestBackfillCLI(unittest.TestCase):
+    """Test cases for the tmai-backfill command-line tool"""
+    
+    def test_load_universe_formats(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            pkl_path = os.path.join(tmp, "universe.pkl")
+            with open(pkl_path, "wb") as f:
+                pickle.dump([3375, 3306, 3375], f)
+            csv_path = os.path.join(tmp, "universe.csv")
+            with open(csv_path, "w") as f:
+                f.write("name,TOKEN_ID\nBitcoin,3375\nEthereum,3306\n")
+            txt_path = os.path.join(tmp, "universe.txt")
+            with open(txt_path, "w") as f:
+                f.write("# majors\nBTC\nETH\n\n")
+            
+            self.assertEqual(load_universe(pkl_path), ["3375", "3306"])
+            self.assertEqual(load_universe(csv_path), ["3375", "3306"])
+            self.assertEqual(load_universe(txt_path), ["BTC", "ETH"])
+    
+    @unittest.skipIf(pa is None, "pyarrow is not installed")
+    def test_backfill_hydrates_store_and_resumes(self):
+        flaky = {"3306"}
+        
+        def fake_get(self, url, headers=None, params=None, timeout=None):
+            if params['token_id'] in flaky:
+                flaky.discard(params['token_id'])
+                raise requests.exceptions.ConnectionError("connection reset")
+            start = datetime.date.fromisoformat(params['startDate'])
+            days = (datetime.date.fromisoformat(params['endDate']) - start).days + 1
+            response = mock.Mock(status_code=200, content=b"")
+            response.json.return_value = {"data": [
+                {"TOKEN_ID": int(t), "DATE": f"{start + datetime.timedelta(days=d)}T00:00:00.000Z",
+                 "CLOSE": 1.0}
+                for t in params['token_id'].split(',') for d in range(days)
+            ]}
+            return response
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            universe = os.path.join(tmp, "universe.pkl")
+            with open(universe, "wb") as f:
+                pickle.dump([3375, 3306], f)
+            store = os.path.join(tmp, "store")
+            argv = ["--endpoints", "daily-ohlcv", "--universe", universe, "--start", "2023-01-01",
+                    "--end", "2023-03-31", "--store", store, "--api-key", "test-api-key",
+                    "--max-retries", "0", "--no-progress"]
+            
+            stdout, stderr = io.StringIO(), io.StringIO()
+            with mock.patch.object(requests.Session, 'get', fake_get), \
+                    redirect_stdout(stdout), redirect_stderr(stderr):
+                self.assertEqual(main(argv), 1)
+                self.assertIn("FAILED daily-ohlcv 2023-01-01..2023-03-31", stderr.getvalue())
+                self.assertEqual(main(argv + ["--resume"]), 0)
+            
+            self.assertIn("daily-ohlcv", stdout.getvalue())
+            for token_id in ("3375", "3306"):
+                self.assertEqual(LocalStore(store).query("daily-ohlcv", token_id).num_rows, 90)
+
+    @unittest.skipIf(pa is None, "pyarrow is not installed")
+    def test_backfill_reports_only_this_runs_failures(self):
+        def fake_get(self, url, headers=None, params=None, timeout=None):
+            if params['startDate'].startswith("2023-01"):
+                raise requests.exceptions.ConnectionError("connection reset")
+            response = mock.Mock(status_code=200, content=b"")
+            response.json.return_value = {"data": [
+                {"TOKEN_ID": 3375, "DATE": f"{params['startDate']}T00:00:00.000Z", "CLOSE": 1.0}
+            ]}
+            return response
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            universe = os.path.join(tmp, "universe.txt")
+            with open(universe, "w") as f:
+                f.write("3375\n")
+            argv = ["--endpoints", "daily-ohlcv", "--universe", universe, "--store",
+                    os.path.join(tmp, "store"), "--api-key", "test-api-key", "--max-retries", "0",
+                    "--no-progress"]
+            
+            stderr = io.StringIO()
+            with mock.patch.object(requests.Session, 'get', fake_get), \
+                    redirect_stdout(io.StringIO()), redirect_stderr(stderr):
+                self.assertEqual(main(argv + ["--start", "2023-01-01", "--end", "2023-01-31"]), 1)
+                # The January failure stays in the checkpoint but is not part of this run
+                stderr.seek(0)
+                stderr.truncate()
+                self.assertEqual(main(argv + ["--start", "2023-02-01", "--end", "2023-02-28"]), 0)
+            self.assertNotIn("FAILED", stderr.getvalue())
+    
+    def test_unresolvable_universe_exits_with_status_2(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            universe = os.path.join(tmp, "universe.txt")
+            with open(universe, "w") as f:
+                f.write("NOPE\n")
+            argv = ["--endpoints", "daily-ohlcv", "--universe", universe, "--start", "2023-01-01",
+                    "--end", "2023-01-31", "--store", os.path.join(tmp, "store"),
+                    "--api-key", "test-api-key", "--no-progress"]
+            
+            stderr = io.StringIO()
+            with mock.patch('tmai_api.resolver.TokenResolver.token_ids',
+                            side_effect=KeyError("Unknown token: NOPE")), redirect_stderr(stderr):
+                self.assertEqual(main(argv), 2)
+            self.assertIn("error: Unknown token: NOPE", stderr.getvalue())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,26 @@
+import datetime
+import gzip
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
 import unittest
+from concurrent.futures import ThreadPoolExecutor
 from unittest import mock
+import requests
+from benchmarks.mock_server import MockTokenMetricsAPI
 from tmai_api import TokenMetricsClient
+from tmai_api.cache import ResponseCache
+from tmai_api.checkpoint import Checkpoint
+from tmai_api.instrumentation import MetricsCollector, TqdmProgress
+from tmai_api.ratelimit import RateLimiter, parse_retry_after
+from tmai_api.resolver import TokenResolver
+from tmai_api.schemas import pl
+from tmai_api.store import LocalStore, pa
+from tmai_api.sync import SyncStore
+from tmai_api.transport import FixtureNotFound, RecordReplayAdapter, RecordReplayTransport, httpx
 
 class TestTokenMetricsClient(unittest.TestCase):
     
@@ -24,7 +44,47 @@ class TestTokenMetricsClient(unittest.TestCase):
         self.assertIsNotNone(self.client.ai_reports)
         self.assertIsNotNone(self.client.trading_signals)
 
-    @mock.patch('requests.get')
+    def test_endpoints_created_on_first_access(self):
+        client = TokenMetricsClient(api_key="test-api-key")
+        self.assertNotIn("daily_ohlcv", vars(client))
+        self.assertIs(client.daily_ohlcv, client.daily_ohlcv)
+        self.assertIn("daily_ohlcv", vars(client))
+        self.assertIn("trading_signals", dir(client))
+        with self.assertRaises(AttributeError):
+            client.no_such_endpoint
+    
+    def test_import_is_lazy(self):
+        # Fresh interpreter: tmai_api must not pull in pandas, tqdm, pyarrow, polars or httpx
+        # until they are used
+        loaded = subprocess.run(
+            [sys.executable, "-c",
+             "import sys, tmai_api; "
+             "tmai_api.TokenMetricsClient(api_key='x').daily_ohlcv; "
+             "print(sorted(m for m in ('pandas', 'tqdm', 'pyarrow', 'polars', 'httpx') if m in sys.modules))"],
+            capture_output=True, text=True, check=True, cwd=os.path.dirname(os.path.dirname(__file__))
+        ).stdout
+        self.assertEqual(loaded.strip(), "[]")
+    
+    def test_endpoints_share_pooled_session(self):
+        # Every endpoint should reuse the client's keep-alive session
+        self.assertIsNotNone(self.client.session)
+        adapter = self.client.session.get_adapter(self.client.BASE_URL)
+        self.assertEqual(adapter._pool_maxsize, 10)
+        
+        client = TokenMetricsClient(api_key="test-api-key", pool_maxsize=32,
+                                    timeout=(3.05, 30), compression=False)
+        self.assertEqual(client.session.get_adapter(client.BASE_URL)._pool_maxsize, 32)
+        self.assertEqual(client.session.headers["Accept-Encoding"], "identity")
+        
+        with mock.patch.object(client.session, 'get') as mock_get:
+            mock_get.return_value.json.return_value = {"data": []}
+            client.tokens.get(symbol="BTC")
+            client.ai_reports.get(symbol="BTC")
+            self.assertEqual(mock_get.call_count, 2)
+            self.assertEqual(mock_get.call_args[1]['timeout'], (3.05, 30))
+        client.close()
+
+    @mock.patch('requests.Session.get')
     def test_tokens_endpoint(self, mock_get):
         # Setup mock response
         mock_response = mock.Mock()
@@ -41,10 +101,10 @@ class TestTokenMetricsClient(unittest.TestCase):
         # Verify the request was made correctly
         mock_get.assert_called_once()
         args, kwargs = mock_get.call_args
-        self.assertEqual(kwargs['params'], {'symbol': 'BTC'})
+        self.assertEqual(kwargs['params'], {'symbol': 'BTC', 'limit': 1000, 'page': 0})
         self.assertEqual(kwargs['headers']['api_key'], 'test-api-key')
 
-    @mock.patch('requests.post')
+    @mock.patch('requests.Session.post')
     def test_ai_agent_endpoint(self, mock_post):
         # Setup mock response
         mock_response = mock.Mock()
@@ -78,7 +138,7 @@ class TestTokenMetricsClient(unittest.TestCase):
         answer_text = self.client.ai_agent.get_answer_text(question)
         self.assertEqual(answer_text, "This is a test answer from the AI chatbot.")
 
-    @mock.patch('requests.get')
+    @mock.patch('requests.Session.get')
     def test_ai_reports_endpoint(self, mock_get):
         # Setup mock response
         mock_response = mock.Mock()
@@ -95,10 +155,10 @@ class TestTokenMetricsClient(unittest.TestCase):
         # Verify the request was made correctly
         mock_get.assert_called_once()
         args, kwargs = mock_get.call_args
-        self.assertEqual(kwargs['params'], {'symbol': 'BTC'})
+        self.assertEqual(kwargs['params'], {'symbol': 'BTC', 'limit': 1000, 'page': 0})
         self.assertEqual(kwargs['headers']['api_key'], 'test-api-key')
 
-    @mock.patch('requests.get')
+    @mock.patch('requests.Session.get')
     def test_trading_signals_endpoint(self, mock_get):
         # Setup mock response
         mock_response = mock.Mock()
@@ -124,9 +184,757 @@ class TestTokenMetricsClient(unittest.TestCase):
             'symbol': 'BTC', 
             'startDate': '2023-10-01', 
             'endDate': '2023-10-10',
-            'signal': '1'
+            'signal': '1',
+            'limit': 1000,
+            'page': 0
         })
         self.assertEqual(kwargs['headers']['api_key'], 'test-api-key')
 
+    def test_concurrent_chunks_merge_in_order(self):
+        client = TokenMetricsClient(api_key="test-api-key", max_workers=4)
+        
+        def fake_get(url, headers=None, params=None, timeout=None):
+            # Later chunks answer first so completion order differs from chunk order
+            start = params['startDate']
+            time.sleep(0.05 if start < '2023-03-01' else 0)
+            response = mock.Mock()
+            response.json.return_value = {"success": True, "message": start,
+                                          "data": [{"DATE": start}]}
+            return response
+        
+        with mock.patch.object(client.session, 'get', side_effect=fake_get) as mock_get:
+            result = client.daily_ohlcv.get(token_id="3375", startDate="2023-01-01",
+                                            endDate="2023-06-30")
+        
+        dates = [row["DATE"] for row in result["data"]]
+        self.assertEqual(mock_get.call_count, len(dates))
+        self.assertEqual(dates, sorted(dates))
+        # Metadata comes from the last chunk regardless of completion order
+        self.assertEqual(result["message"], dates[-1])
+
+    def test_chunks_do_not_overlap_and_merged_rows_are_unique(self):
+        client = TokenMetricsClient(api_key="test-api-key")
+        chunks = client.daily_ohlcv._chunk_date_range("2023-01-01", "2023-03-31")
+        self.assertEqual(chunks, [("2023-01-01", "2023-01-30"), ("2023-01-31", "2023-03-01"),
+                                  ("2023-03-02", "2023-03-31")])
+        self.assertEqual(client.daily_ohlcv._chunk_date_range("2023-01-01", "2023-01-01"),
+                         [("2023-01-01", "2023-01-01")])
+        
+        merged = client.daily_ohlcv._merge_responses([
+            {"data": [{"TOKEN_ID": 1, "DATE": "2023-01-30", "CLOSE": 1.0}, {"NOTE": "kept"}]},
+            {"data": [{"TOKEN_ID": 1, "DATE": "2023-01-30", "CLOSE": 2.0},
+                      {"TOKEN_ID": 1, "DATE": "2023-01-31", "CLOSE": 3.0}, {"NOTE": "kept"}]}
+        ])
+        self.assertEqual(merged["data"], [{"TOKEN_ID": 1, "DATE": "2023-01-30", "CLOSE": 2.0},
+                                          {"NOTE": "kept"},
+                                          {"TOKEN_ID": 1, "DATE": "2023-01-31", "CLOSE": 3.0},
+                                          {"NOTE": "kept"}])
+
+    def test_large_token_lists_split_into_batches(self):
+        client = TokenMetricsClient(api_key="test-api-key", max_workers=4)
+        universe = [str(3000 + i) for i in range(10)]
+        
+        def fake_get(url, headers=None, params=None, timeout=None):
+            response = mock.Mock()
+            response.json.return_value = {"data": [{"TOKEN_ID": int(t), "DATE": params['startDate']}
+                                                   for t in params['token_id'].split(',')]}
+            return response
+        
+        with mock.patch.object(client.session, 'get', side_effect=fake_get) as mock_get:
+            result = client.daily_ohlcv.get(token_id=", ".join(universe), startDate="2023-01-01",
+                                            endDate="2023-01-20")
+        
+        # 20 days of daily rows per token must stay below the limit of 100 rows, so the
+        # 10 tokens are spread over three batches fetched with the whole range
+        batches = [c[1]['params']['token_id'] for c in mock_get.call_args_list]
+        self.assertEqual(sorted(batches), [",".join(universe[:3]), ",".join(universe[3:6]),
+                                           ",".join(universe[6:])])
+        self.assertEqual([row["TOKEN_ID"] for row in result["data"]], [int(t) for t in universe])
+
+    def test_chunk_windows_adapt_to_tokens_and_observed_rows(self):
+        client = TokenMetricsClient(api_key="test-api-key")
+        
+        def fake_get(url, headers=None, params=None, timeout=None):
+            start = datetime.date.fromisoformat(params['startDate'])
+            days = (datetime.date.fromisoformat(params['endDate']) - start).days + 1
+            token_ids = params['token_id'].split(',') if 'token_id' in params else range(50)
+            rows = [{"TOKEN_ID": int(t), "DATE": str(start + datetime.timedelta(days=d))}
+                    for d in range(days) for t in token_ids]
+            offset = params['page'] * params['limit']
+            response = mock.Mock()
+            response.json.return_value = {"data": rows[offset:offset + params['limit']]}
+            return response
+        
+        def windows(mock_get):
+            return [(c[1]['params']['startDate'], c[1]['params']['endDate'], c[1]['params']['page'])
+                    for c in mock_get.call_args_list]
+        
+        with mock.patch.object(client.session, 'get', side_effect=fake_get) as mock_get:
+            # One daily token: a short 100-row page holds 99 days, instead of 29-day chunks
+            result = client.daily_ohlcv.get(token_id="3375", startDate="2023-01-01", endDate="2023-12-31")
+            self.assertEqual(len(result["data"]), 365)
+            self.assertEqual(windows(mock_get), [("2023-01-01", "2023-04-09", 0), ("2023-04-10", "2023-07-17", 0),
+                                                 ("2023-07-18", "2023-10-24", 0), ("2023-10-25", "2023-12-31", 0)])
+            
+            # Unfiltered queries start from 30-day windows and learn the universe's row rate
+            mock_get.reset_mock()
+            result = client.trading_signals.get(startDate="2023-01-01", endDate="2023-03-31")
+            self.assertEqual(len(result["data"]), 50 * 90)
+            self.assertEqual([w[2] for w in windows(mock_get)], [0, 1, 0, 1, 0, 1])
+            self.assertEqual(client.row_rates.stats()["trading-signals:all"], 50)
+            
+            mock_get.reset_mock()
+            result = client.trading_signals.get(startDate="2023-01-01", endDate="2023-03-31")
+            self.assertEqual(len(result["data"]), 50 * 90)
+            self.assertEqual(windows(mock_get)[:2], [("2023-01-01", "2023-01-19", 0),
+                                                     ("2023-01-20", "2023-02-07", 0)])
+            self.assertEqual(mock_get.call_count, 5)
+        
+        with mock.patch.object(client.session, 'get') as mock_get:
+            # Dates in another format cannot be sized and are sent as one range
+            mock_get.return_value.json.return_value = {"data": []}
+            client.daily_ohlcv.get(token_id="3375", startDate="01/01/2023", endDate="12/31/2023")
+            self.assertEqual(windows(mock_get), [("01/01/2023", "12/31/2023", 0)])
+
+    def test_paginated_request_against_mock_server(self):
+        with MockTokenMetricsAPI(error_rate=0.1) as server:
+            client_class = type("LocalClient", (TokenMetricsClient,), {"BASE_URL": server.url})
+            client = client_class(api_key="test-api-key", max_workers=4, backoff_factor=0)
+            result = client.daily_ohlcv.get(token_id="1,2,3", startDate="2023-01-01", endDate="2023-03-31")
+            client.close()
+        
+        # Injected 429/500s are retried, so every row arrives exactly once
+        self.assertNotIn("failed_chunks", result)
+        self.assertEqual(len({(row["TOKEN_ID"], row["DATE"]) for row in result["data"]}), 3 * 90)
+    
+    def test_record_replay_transport_round_trip(self):
+        params = dict(token_id="1,2", startDate="2023-01-01", endDate="2023-02-15")
+        
+        def fetch(url, adapter):
+            client_class = type("LocalClient", (TokenMetricsClient,), {"BASE_URL": url})
+            with client_class(api_key="test-api-key", transport=adapter) as client:
+                return client.daily_ohlcv.get(**params)
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            with MockTokenMetricsAPI() as server:
+                recorded = fetch(server.url, RecordReplayAdapter(tmp, mode="record"))
+                snapshot = {name: open(os.path.join(tmp, name), "rb").read() for name in os.listdir(tmp)}
+                fetch(server.url, RecordReplayAdapter(tmp, mode="record"))
+            
+            # Fixtures are deterministic and never contain the API key
+            self.assertEqual(len(snapshot), 1)
+            for name, content in snapshot.items():
+                self.assertEqual(open(os.path.join(tmp, name), "rb").read(), content)
+                self.assertNotIn(b"test-api-key", gzip.decompress(content))
+            
+            # The server is gone: replay is served from fixtures only
+            self.assertEqual(fetch(server.url, RecordReplayAdapter(tmp)), recorded)
+            with self.assertRaises(FixtureNotFound):
+                RecordReplayAdapter(tmp).send(requests.Request("GET", server.url + "/tokens").prepare())
+            
+            if httpx is not None:
+                # httpx transports replay the same fixtures
+                with httpx.Client(transport=RecordReplayTransport(tmp)) as http:
+                    response = http.get(server.url + "/daily-ohlcv", params=dict(params, limit=100, page=0))
+                rows = response.json()["data"]
+                self.assertEqual(len(rows), 2 * 46)
+                self.assertTrue(all(row in recorded["data"] for row in rows))
+    
+    def test_iter_records_streams_chunks_in_order(self):
+        client = TokenMetricsClient(api_key="test-api-key", max_workers=2)
+        
+        def fake_get(url, headers=None, params=None, timeout=None):
+            response = mock.Mock()
+            response.json.return_value = {"data": [{"DATE": params['startDate']}]}
+            return response
+        
+        with mock.patch.object(client.session, 'get', side_effect=fake_get) as mock_get:
+            records = client.daily_ohlcv.iter_records(token_id="3375", startDate="2023-01-01",
+                                                      endDate="2023-12-31")
+            first = next(records)
+            # Only the chunks inside the worker window have been requested so far
+            self.assertLessEqual(mock_get.call_count, 3)
+            records.close()
+            
+            chunks = list(client.daily_ohlcv.iter_chunks(token_id="3375", startDate="2023-01-01",
+                                                         endDate="2023-03-31", max_days=29))
+        
+        self.assertEqual(first, {"DATE": "2023-01-01"})
+        self.assertEqual([len(chunk) for chunk in chunks], [1, 1, 1])
+        self.assertEqual([str(chunk["DATE"][0].date()) for chunk in chunks],
+                         ["2023-01-01", "2023-01-31", "2023-03-02"])
+    
+    def test_to_dataframe_applies_endpoint_schema(self):
+        data = {"data": [
+            {"TOKEN_ID": 3375, "TOKEN_SYMBOL": "BTC", "DATE": "2023-01-02T00:00:00.000Z",
+             "TRADING_SIGNAL": 1, "HOLDING_RETURNS": 0.5},
+            {"TOKEN_ID": 3306, "TOKEN_SYMBOL": "ETH", "DATE": "2023-01-01", "TRADING_SIGNAL": -1},
+            {"TOKEN_ID": 3375, "TOKEN_SYMBOL": "BTC", "DATE": "2023-01-01T00:00:00.000Z",
+             "TRADING_SIGNAL": 0, "HOLDING_RETURNS": 0.25, "EXTRA": "x"},
+        ]}
+        
+        df = self.client.trading_signals.to_dataframe(data)
+        
+        self.assertEqual(list(df.columns), ["TOKEN_ID", "TOKEN_SYMBOL", "DATE", "TRADING_SIGNAL",
+                                            "HOLDING_RETURNS", "EXTRA"])
+        self.assertEqual(str(df["TOKEN_ID"].dtype), "Int64")
+        self.assertEqual(str(df["TOKEN_SYMBOL"].dtype), "category")
+        self.assertTrue(str(df["DATE"].dtype).startswith("datetime64"))
+        self.assertEqual(str(df["TRADING_SIGNAL"].dtype), "Int8")
+        self.assertEqual(str(df["HOLDING_RETURNS"].dtype), "float32")
+        # Sorted by (TOKEN_ID, DATE)
+        self.assertEqual(list(df["TOKEN_ID"]), [3306, 3375, 3375])
+        self.assertEqual([str(d.date()) for d in df["DATE"]], ["2023-01-01", "2023-01-01", "2023-01-02"])
+        self.assertTrue(df["HOLDING_RETURNS"].isna()[0])
+    
+    @unittest.skipIf(pa is None, "pyarrow is not installed")
+    def test_to_dataframe_arrow_backend(self):
+        data = {"data": [
+            {"TOKEN_ID": 3375, "TOKEN_SYMBOL": "BTC", "DATE": "2023-01-02T00:00:00.000Z", "CLOSE": 2.0},
+            {"TOKEN_ID": 3375, "TOKEN_SYMBOL": "BTC", "DATE": "2023-01-01T00:00:00.000Z", "CLOSE": 1.0},
+        ]}
+        
+        table = self.client.daily_ohlcv.to_dataframe(data, backend="arrow")
+        
+        self.assertEqual(str(table.schema.field("TOKEN_ID").type), "int64")
+        self.assertEqual(str(table.schema.field("DATE").type), "timestamp[ns]")
+        self.assertTrue(pa.types.is_dictionary(table.schema.field("TOKEN_SYMBOL").type))
+        self.assertEqual(table.column("CLOSE").to_pylist(), [1.0, 2.0])
+        
+        if pl is not None:
+            df = self.client.daily_ohlcv.to_dataframe(data, backend="polars")
+            self.assertEqual(df["CLOSE"].to_list(), [1.0, 2.0])
+        
+        with self.assertRaises(ValueError):
+            self.client.daily_ohlcv.to_dataframe(data, backend="excel")
+    
+    def _paged_response(self, rows, page, limit, total=None):
+        response = mock.Mock()
+        payload = {"success": True, "data": rows[page * limit:(page + 1) * limit]}
+        if total is not None:
+            payload["total"] = total
+        response.json.return_value = payload
+        return response
+
+    def test_chunk_pages_until_short_page(self):
+        rows = [{"TOKEN_ID": i % 10, "DATE": i} for i in range(230)]
+        
+        with mock.patch.object(self.client.session, 'get') as mock_get:
+            mock_get.side_effect = lambda url, **kwargs: self._paged_response(
+                rows, kwargs['params']['page'], kwargs['params']['limit'])
+            result = self.client.daily_ohlcv.get(token_id="3375", startDate="2023-01-01",
+                                                 endDate="2023-01-20")
+        
+        self.assertEqual(result["data"], rows)
+        pages = [call[1]['params']['page'] for call in mock_get.call_args_list]
+        self.assertEqual(pages, [0, 1, 2])
+
+    def test_chunk_pages_prefetched_when_total_known(self):
+        rows = [{"TOKEN_ID": i % 10, "DATE": i} for i in range(450)]
+        client = TokenMetricsClient(api_key="test-api-key", max_workers=4)
+        
+        with mock.patch.object(client.session, 'get') as mock_get:
+            mock_get.side_effect = lambda url, **kwargs: self._paged_response(
+                rows, kwargs['params']['page'], kwargs['params']['limit'], total=len(rows))
+            result = client.daily_ohlcv.get(token_id="3375", startDate="2023-01-01",
+                                            endDate="2023-01-20")
+        
+        self.assertEqual(result["data"], rows)
+        pages = sorted(call[1]['params']['page'] for call in mock_get.call_args_list)
+        self.assertEqual(pages, [0, 1, 2, 3, 4])
+
+    def test_page_prefetch_shares_request_slots_and_caps_fanout(self):
+        client = TokenMetricsClient(api_key="test-api-key", max_workers=2)
+        lock = threading.Lock()
+        in_flight = [0, 0]
+        
+        def fake_get(url, headers=None, params=None, timeout=None):
+            with lock:
+                in_flight[0] += 1
+                in_flight[1] = max(in_flight[1], in_flight[0])
+            time.sleep(0.01)
+            with lock:
+                in_flight[0] -= 1
+            # Every page is full and the total is bogus, so only the cap stops the fan-out
+            response = mock.Mock(status_code=200)
+            response.json.return_value = {
+                "total": 10 ** 9,
+                "data": [{"TOKEN_ID": 3375, "DATE": f"{params['startDate']}/{params['page']}/{i}"}
+                         for i in range(params['limit'])]}
+            return response
+        
+        with mock.patch('tmai_api.base.MAX_PAGES_PER_CHUNK', 5):
+            with mock.patch.object(client.session, 'get', side_effect=fake_get) as mock_get:
+                client.daily_ohlcv.get(token_id="3375", startDate="2023-01-01",
+                                       endDate="2023-03-01", max_days=29)
+        
+        self.assertEqual(mock_get.call_count, 2 * 5)
+        self.assertLessEqual(in_flight[1], 2)
+    
+    def test_retries_429_with_retry_after(self):
+        throttled = mock.Mock(status_code=429, headers={"Retry-After": "0"})
+        unavailable = mock.Mock(status_code=503, headers={})
+        ok = mock.Mock(status_code=200, headers={})
+        ok.json.return_value = {"data": [{"symbol": "BTC"}]}
+        client = TokenMetricsClient(api_key="test-api-key", backoff_factor=0)
+        
+        with mock.patch.object(client.session, 'get', side_effect=[throttled, unavailable, ok]) as mock_get:
+            result = client.tokens.get(symbol="BTC")
+        
+        self.assertEqual(result, {"data": [{"symbol": "BTC"}]})
+        self.assertEqual(mock_get.call_count, 3)
+        stats = client.rate_limiter.stats()
+        self.assertEqual(stats["retried"], 2)
+        self.assertEqual(stats["rate_limited"], 1)
+
+    def test_identical_concurrent_requests_share_one_call(self):
+        client = TokenMetricsClient(api_key="test-api-key")
+        
+        def slow_get(url, headers=None, params=None, timeout=None):
+            time.sleep(0.1)
+            response = mock.Mock(status_code=200)
+            response.json.return_value = {"data": [{"TOKEN_ID": 3375, "TRADING_SIGNAL": 1}]}
+            return response
+        
+        with mock.patch.object(client.session, 'get', side_effect=slow_get) as mock_get:
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                results = list(executor.map(lambda _: client.trading_signals.get(token_id="3375"), range(4)))
+                other = client.trading_signals.get(token_id="3306")
+        
+        self.assertEqual(mock_get.call_count, 2)
+        self.assertEqual(client.single_flight.stats(), {"calls": 2, "shared": 3})
+        self.assertTrue(all(result == results[0] for result in results))
+        # Every caller gets its own copy
+        self.assertEqual(len({id(result) for result in results}), 4)
+        self.assertEqual(other, results[0])
+        
+        client = TokenMetricsClient(api_key="test-api-key", single_flight=False)
+        self.assertIsNone(client.single_flight)
+    
+    def test_leaders_deadline_does_not_fail_waiting_callers(self):
+        client = TokenMetricsClient(api_key="test-api-key", backoff_factor=0)
+        
+        def slow_get(url, headers=None, params=None, timeout=None):
+            # Honour the timeout like a real socket would
+            if timeout < 0.2:
+                time.sleep(timeout)
+                raise requests.exceptions.ReadTimeout("stalled")
+            time.sleep(0.2)
+            response = mock.Mock(status_code=200)
+            response.json.return_value = {"data": [{"TOKEN_ID": 3375}]}
+            return response
+        
+        with mock.patch.object(client.session, 'get', side_effect=slow_get) as mock_get:
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                hurried = executor.submit(client.trading_signals.get, token_id="3375", deadline=0.1)
+                time.sleep(0.03)
+                patient = executor.submit(client.trading_signals.get, token_id="3375")
+                hurried, patient = hurried.result(), patient.result()
+        
+        self.assertIn("DeadlineExceeded", hurried["failed_chunks"][0]["error"])
+        # The caller without a deadline joined the call, then made it again on its own
+        self.assertEqual(patient, {"data": [{"TOKEN_ID": 3375}]})
+        self.assertEqual(mock_get.call_count, 2)
+        self.assertEqual(client.single_flight.stats(), {"calls": 2, "shared": 0})
+    
+    def test_concurrent_token_loads_are_batched_into_one_request(self):
+        client = TokenMetricsClient(api_key="test-api-key", batch_window=0.05)
+        
+        def combined_get(url, headers=None, params=None, timeout=None):
+            response = mock.Mock(status_code=200)
+            response.json.return_value = {"data": [{"TOKEN_ID": int(token_id), "TM_TRADER_GRADE": 80}
+                                                   for token_id in params["token_id"].split(",")]}
+            return response
+        
+        tokens = ["3375", "3306", "3988", "3375"]
+        with mock.patch.object(client.session, 'get', side_effect=combined_get) as mock_get:
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                results = list(executor.map(lambda token_id: client.trader_grades.load(token_id), tokens))
+        
+        self.assertEqual(mock_get.call_count, 1)
+        self.assertEqual(sorted(mock_get.call_args[1]['params']['token_id'].split(",")),
+                         ["3306", "3375", "3988"])
+        self.assertEqual(client.loader.stats(), {"loads": 4, "requests": 1})
+        for token_id, result in zip(tokens, results):
+            self.assertEqual(result["data"], [{"TOKEN_ID": int(token_id), "TM_TRADER_GRADE": 80}])
+        self.assertIsNot(results[0]["data"][0], results[3]["data"][0])
+        
+        # Loads with different arguments are not merged
+        with mock.patch.object(client.session, 'get', side_effect=combined_get) as mock_get:
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                list(executor.map(lambda args: client.trading_signals.load(args[0], signal=args[1]),
+                                  [("3375", "1"), ("3306", "-1")]))
+        self.assertEqual(mock_get.call_count, 2)
+        self.assertEqual(client.loader.stats(), {"loads": 6, "requests": 3})
+    
+    def test_deadline_bounds_get_and_flags_partial_results(self):
+        client = TokenMetricsClient(api_key="test-api-key", deadline=0.35)
+        
+        def slow_get(url, headers=None, params=None, timeout=None):
+            # Honour the timeout like a real socket would
+            if timeout < 0.25:
+                time.sleep(timeout)
+                raise requests.exceptions.ReadTimeout("stalled")
+            time.sleep(0.25)
+            response = mock.Mock(status_code=200)
+            response.json.return_value = {"data": [{"DATE": params["startDate"]}]}
+            return response
+        
+        started = time.monotonic()
+        with mock.patch.object(client.session, 'get', side_effect=slow_get) as mock_get:
+            result = client.daily_ohlcv.get(token_id="3375", startDate="2023-01-01",
+                                            endDate="2023-03-31", max_days=29)
+        
+        self.assertLess(time.monotonic() - started, 0.6)
+        # The second request only got the time left, and the third chunk was never sent
+        self.assertEqual(mock_get.call_count, 2)
+        self.assertGreater(mock_get.call_args_list[0][1]['timeout'], 0.3)
+        self.assertLess(mock_get.call_args_list[1][1]['timeout'], 0.15)
+        self.assertEqual(result["data"], [{"DATE": "2023-01-01"}])
+        self.assertTrue(result["partial"])
+        self.assertEqual(len(result["failed_chunks"]), 2)
+        self.assertIn("DeadlineExceeded", result["failed_chunks"][1]["error"])
+    
+    def test_deadline_does_not_wait_out_the_rate_limiter(self):
+        ok = mock.Mock(status_code=200)
+        ok.json.return_value = {"data": [{"DATE": "2023-01-01"}]}
+        throttled = mock.Mock(status_code=429, headers={"Retry-After": "5"})
+        params = dict(token_id="3375", startDate="2023-01-01", endDate="2023-02-28", max_days=29,
+                      max_workers=1)
+        
+        # A slow bucket: the second chunk would have to wait 5s for its token
+        client = TokenMetricsClient(api_key="test-api-key", rate_limit=0.2, deadline=0.5)
+        started = time.monotonic()
+        with mock.patch.object(client.session, 'get', return_value=ok) as mock_get:
+            result = client.daily_ohlcv.get(**params)
+        self.assertLess(time.monotonic() - started, 0.5)
+        self.assertEqual(mock_get.call_count, 1)
+        self.assertTrue(result["partial"])
+        self.assertIn("rate limiter", result["failed_chunks"][0]["error"])
+        # The chunk that gave up did not keep its place in the bucket
+        self.assertEqual(client.rate_limiter.stats()["requests"], 1)
+        
+        # A Retry-After pause longer than the time left is not waited out either
+        client = TokenMetricsClient(api_key="test-api-key", max_retries=1, deadline=0.5)
+        started = time.monotonic()
+        with mock.patch.object(client.session, 'get', return_value=throttled) as mock_get:
+            result = client.daily_ohlcv.get(**params)
+        self.assertLess(time.monotonic() - started, 0.5)
+        self.assertEqual(mock_get.call_count, 1)
+        self.assertEqual(len(result["failed_chunks"]), 2)
+        self.assertIn("rate limiter", result["failed_chunks"][1]["error"])
+    
+    def test_rate_limiter_throttles_bursts(self):
+        limiter = RateLimiter(rate=100, burst=1)
+        start = time.monotonic()
+        for _ in range(4):
+            limiter.acquire()
+        self.assertGreaterEqual(time.monotonic() - start, 0.025)
+        self.assertEqual(limiter.stats()["throttled"], 3)
+        self.assertEqual(parse_retry_after("2"), 2.0)
+        self.assertIsNone(parse_retry_after("soon"))
+
+    def test_response_cache_serves_historical_chunks(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = ResponseCache(os.path.join(tmp, "cache.sqlite"))
+            client = TokenMetricsClient(api_key="test-api-key", cache=cache)
+            
+            with mock.patch.object(client.session, 'get') as mock_get:
+                mock_get.return_value.status_code = 200
+                mock_get.return_value.json.return_value = {"data": [{"DATE": "2023-01-01"}]}
+                first = client.trader_grades.get(token_id="3375", startDate="2023-01-01", endDate="2023-01-10")
+                second = client.trader_grades.get(token_id="3375", startDate="2023-01-01", endDate="2023-01-10")
+            
+            self.assertEqual(first, second)
+            self.assertEqual(mock_get.call_count, 1)
+            self.assertEqual(cache.stats()["hits"], 1)
+            self.assertIsNone(cache.ttl_for("trader-grades", {"endDate": "2023-01-10"}))
+            self.assertEqual(cache.ttl_for("hourly-ohlcv", {"endDate": "2999-01-01"}), 300)
+            cache.close()
+
+    def test_aligned_chunks_reuse_cache_across_offset_ranges(self):
+        def fake_get(url, headers=None, params=None, timeout=None):
+            start = datetime.date.fromisoformat(params['startDate'])
+            days = (datetime.date.fromisoformat(params['endDate']) - start).days + 1
+            response = mock.Mock(status_code=200)
+            response.json.return_value = {"data": [
+                {"TOKEN_ID": 3375, "DATE": f"{start + datetime.timedelta(days=d)}T00:00:00.000Z"}
+                for d in range(days)]}
+            return response
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = ResponseCache(os.path.join(tmp, "cache.sqlite"))
+            client = TokenMetricsClient(api_key="test-api-key", cache=cache, chunk_alignment='month')
+            with mock.patch.object(client.session, 'get', side_effect=fake_get) as mock_get:
+                first = client.trader_grades.get(token_id="3375", startDate="2023-01-05", endDate="2023-02-10")
+                self.assertEqual([(c[1]['params']['startDate'], c[1]['params']['endDate'])
+                                  for c in mock_get.call_args_list],
+                                 [("2023-01-01", "2023-01-31"), ("2023-02-01", "2023-02-28")])
+                
+                # A range offset by a few days requests the same month buckets, all cached
+                second = client.trader_grades.get(token_id="3375", startDate="2023-01-10", endDate="2023-02-20")
+                self.assertEqual(mock_get.call_count, 2)
+                
+                weekly = client.trader_grades.get(token_id="3375", startDate="2023-01-10",
+                                                  endDate="2023-01-12", align=28)
+            cache.close()
+        
+        self.assertEqual([row["DATE"][:10] for row in first["data"]][::36], ["2023-01-05", "2023-02-10"])
+        self.assertEqual(len(first["data"]), 37)
+        self.assertEqual(len(second["data"]), 42)
+        self.assertEqual([row["DATE"][:10] for row in weekly["data"]], ["2023-01-10", "2023-01-11", "2023-01-12"])
+        # 28-day buckets are counted from a fixed Monday, whatever the requested start
+        self.assertEqual(mock_get.call_args[1]['params']['startDate'], "2022-12-26")
+        with self.assertRaises(ValueError):
+            client.trader_grades.get(token_id="3375", startDate="2023-01-10", endDate="2023-01-12",
+                                     align='week')
+
+    def test_response_cache_evicts_least_recently_used(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = ResponseCache(os.path.join(tmp, "cache.sqlite"), max_bytes=800)
+            payload = {"data": [os.urandom(300).hex()]}
+            cache.set("tokens", {"page": 0}, payload)
+            cache.set("tokens", {"page": 1}, payload)
+            cache.get("tokens", {"page": 0})
+            cache.set("tokens", {"page": 2}, payload)
+            
+            self.assertIsNotNone(cache.get("tokens", {"page": 0}))
+            self.assertIsNone(cache.get("tokens", {"page": 1}))
+            self.assertEqual(cache.stats()["evictions"], 1)
+            cache.close()
+
+    def test_incremental_sync_fetches_only_gaps(self):
+        def fake_get(url, headers=None, params=None, timeout=None):
+            start = datetime.date.fromisoformat(params['startDate'])
+            end = datetime.date.fromisoformat(params['endDate'])
+            rows = []
+            for token_id in params['token_id'].split(','):
+                day = start
+                while day <= end:
+                    rows.append({"TOKEN_ID": int(token_id), "DATE": f"{day}T00:00:00.000Z"})
+                    day += datetime.timedelta(days=1)
+            response = mock.Mock(status_code=200)
+            response.json.return_value = {"data": rows}
+            return response
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            client = TokenMetricsClient(api_key="test-api-key", sync_store=tmp)
+            with mock.patch.object(client.session, 'get', side_effect=fake_get) as mock_get:
+                first = client.daily_ohlcv.sync(token_id="3375", startDate="2023-01-01", endDate="2023-01-20")
+                self.assertEqual(len(first["data"]), 20)
+                
+                # Only the new token's range and the extra days are requested
+                mock_get.reset_mock()
+                second = client.daily_ohlcv.sync(token_id="3375,3306", startDate="2023-01-10",
+                                                 endDate="2023-01-25")
+            
+            requested = [(c[1]['params']['token_id'], c[1]['params']['startDate'], c[1]['params']['endDate'])
+                         for c in mock_get.call_args_list]
+            self.assertEqual(sorted(requested), [("3306", "2023-01-10", "2023-01-25"),
+                                                 ("3375", "2023-01-21", "2023-01-25")])
+            self.assertEqual(len(second["data"]), 32)
+            
+            coverage = SyncStore(tmp).missing("daily-ohlcv", "3375", "2023-01-01", "2023-01-31")
+            self.assertEqual(coverage, [("2023-01-26", "2023-01-31")])
+            
+            # An outage is reported, not mistaken for "no new data"
+            client = TokenMetricsClient(api_key="test-api-key", sync_store=tmp, max_retries=0)
+            unavailable = mock.Mock(status_code=500, headers={})
+            unavailable.raise_for_status.side_effect = requests.exceptions.HTTPError("500 Server Error")
+            with mock.patch.object(client.session, 'get', return_value=unavailable):
+                third = client.daily_ohlcv.sync(token_id="3375", startDate="2023-01-20", endDate="2023-01-31")
+            self.assertTrue(third["partial"])
+            self.assertEqual([(f["params"]["startDate"], f["params"]["endDate"], f["error"])
+                              for f in third["failed_chunks"]],
+                             [("2023-01-26", "2023-01-31", "HTTPError: 500 Server Error")])
+            self.assertEqual(len(third["data"]), 6)
+            self.assertEqual(SyncStore(tmp).missing("daily-ohlcv", "3375", "2023-01-01", "2023-01-31"),
+                             [("2023-01-26", "2023-01-31")])
+    
+    @unittest.skipIf(pa is None, "pyarrow is not installed")
+    def test_local_store_partitions_paginated_results(self):
+        rows = [{"TOKEN_ID": token_id, "DATE": f"2023-{month:02d}-{day:02d}T00:00:00.000Z",
+                 "CLOSE": float(day), "VOLUME": 1.0}
+                for token_id in (3375, 3306) for month in (1, 2, 3) for day in (1, 15)]
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            client = TokenMetricsClient(api_key="test-api-key", store=tmp)
+            response = mock.Mock(status_code=200)
+            response.json.return_value = {"data": rows}
+            with mock.patch.object(client.session, 'get', return_value=response):
+                client.daily_ohlcv.get(token_id="3375,3306", startDate="2023-01-01", endDate="2023-01-20")
+            
+            # Re-writing the same rows replaces them instead of duplicating
+            client.store.write("daily-ohlcv", rows)
+            
+            store = LocalStore(tmp)
+            paths = store.partitions("daily-ohlcv", ["3375"], "2023-02-10", "2023-03-31")
+            self.assertEqual([os.path.basename(os.path.dirname(p)) for p in paths],
+                             ["month=2023-02", "month=2023-03"])
+            
+            table = store.query("daily-ohlcv", "3375", startDate="2023-02-10", endDate="2023-03-31",
+                                columns=["CLOSE"])
+            self.assertEqual(table.column_names, ["CLOSE"])
+            self.assertEqual(table.column("CLOSE").to_pylist(), [15.0, 1.0, 15.0])
+            self.assertEqual(store.query("daily-ohlcv").num_rows, 12)
+            
+            # Partitions disagreeing on a column's type are scanned as one dataset
+            store.write("daily-ohlcv", [{"TOKEN_ID": 3375, "DATE": "2023-04-01T00:00:00.000Z", "CLOSE": None}])
+            table = store.query("daily-ohlcv", ["3375"], startDate="2023-03-15", endDate="2023-04-01")
+            self.assertEqual(table.column("CLOSE").to_pylist(), [15.0, None])
+    
+    def test_checkpoint_resumes_only_failed_chunks(self):
+        attempts = []
+        flaky = {'2023-01-31'}
+        
+        def fake_get(url, headers=None, params=None, timeout=None):
+            start = params['startDate']
+            attempts.append(start)
+            if start in flaky:
+                flaky.discard(start)
+                raise requests.exceptions.ConnectionError("connection reset")
+            response = mock.Mock(status_code=200)
+            response.json.return_value = {"data": [{"DATE": start}]}
+            return response
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            client = TokenMetricsClient(api_key="test-api-key", max_retries=0)
+            with mock.patch.object(client.session, 'get', side_effect=fake_get):
+                first = client.daily_ohlcv.get(token_id="3375", startDate="2023-01-01",
+                                               endDate="2023-03-31", max_days=29, checkpoint=tmp)
+                
+                self.assertEqual(len(first["data"]), 2)
+                self.assertEqual([f["params"]["startDate"] for f in first["failed_chunks"]],
+                                 ["2023-01-31"])
+                self.assertIn("ConnectionError", first["failed_chunks"][0]["error"])
+                self.assertEqual(Checkpoint(tmp).summary(), {"done": 2, "failed": 1})
+                
+                attempts.clear()
+                second = client.daily_ohlcv.get(token_id="3375", startDate="2023-01-01",
+                                                endDate="2023-03-31", max_days=29, checkpoint=tmp,
+                                                resume=True)
+            
+            self.assertEqual(attempts, ["2023-01-31"])
+            self.assertNotIn("failed_chunks", second)
+            self.assertEqual(len(second["data"]), 3)
+            self.assertEqual(Checkpoint(tmp).failed(), [])
+    
+    def test_resumed_run_replays_the_checkpointed_chunk_plan(self):
+        attempts = []
+        flaky = {'2023-01-01', '2023-07-18'}
+        
+        def sparse_get(url, headers=None, params=None, timeout=None):
+            # One row per request, so the learned row rate keeps shrinking
+            start = params['startDate']
+            attempts.append((start, params['endDate']))
+            if start in flaky:
+                flaky.discard(start)
+                raise requests.exceptions.ConnectionError("connection reset")
+            response = mock.Mock(status_code=200)
+            response.json.return_value = {"data": [{"TOKEN_ID": 3375, "DATE": start}]}
+            return response
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            client = TokenMetricsClient(api_key="test-api-key", max_retries=0)
+            params = dict(token_id="3375", startDate="2023-01-01", endDate="2023-12-31", checkpoint=tmp)
+            with mock.patch.object(client.session, 'get', side_effect=sparse_get):
+                first = client.daily_ohlcv.get(**params)
+                self.assertEqual(attempts, [("2023-01-01", "2023-04-09"), ("2023-04-10", "2023-07-17"),
+                                            ("2023-07-18", "2023-10-24"), ("2023-10-25", "2023-12-31")])
+                self.assertEqual(len(first["failed_chunks"]), 2)
+                
+                # The same client now expects fewer rows per day, but the rerun keeps the plan
+                attempts.clear()
+                second = client.daily_ohlcv.get(resume=True, **params)
+            
+            self.assertEqual(attempts, [("2023-01-01", "2023-04-09"), ("2023-07-18", "2023-10-24")])
+            self.assertNotIn("failed_chunks", second)
+            self.assertEqual(len(second["data"]), 4)
+            self.assertEqual(Checkpoint(tmp).summary(), {"done": 4, "failed": 0})
+    
+    def test_token_resolver_indexes_catalog(self):
+        catalog = [
+            {"TOKEN_ID": 3375, "TOKEN_SYMBOL": "BTC", "TOKEN_NAME": "Bitcoin"},
+            {"TOKEN_ID": 3306, "TOKEN_SYMBOL": "ETH", "TOKEN_NAME": "Ethereum"},
+            {"TOKEN_ID": 3432, "TOKEN_SYMBOL": "SOL", "TOKEN_NAME": "Solana"},
+            {"TOKEN_ID": 9999, "TOKEN_SYMBOL": "SOL", "TOKEN_NAME": "Solana Name Service"},
+        ]
+        
+        def fake_get(url, headers=None, params=None, timeout=None):
+            return self._paged_response(catalog, params['page'], params['limit'])
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "tokens.json.gz")
+            with mock.patch.object(self.client.session, 'get', side_effect=fake_get) as mock_get, \
+                    mock.patch('tmai_api.resolver.CATALOG_PAGE_SIZE', 3):
+                resolver = TokenResolver(self.client, path)
+                self.assertEqual(resolver.token_ids("btc, Ethereum,3432"), "3375,3306,3432")
+                self.assertEqual(resolver.resolve("SOL", name="solana name service")["TOKEN_ID"], 9999)
+                with self.assertRaises(ValueError):
+                    resolver.resolve("SOL")
+                with self.assertRaises(KeyError):
+                    resolver.resolve("DOGE")
+                self.assertEqual(mock_get.call_count, 2)
+                
+                # A fresh resolver loads the persisted snapshot instead of calling the API
+                self.assertEqual(TokenResolver(self.client, path).resolve("eth")["TOKEN_ID"], 3306)
+                self.assertEqual(mock_get.call_count, 2)
+                
+                # An expired snapshot is downloaded again
+                TokenResolver(self.client, path, ttl=-1).resolve("eth")
+                self.assertEqual(mock_get.call_count, 4)
+    
+    def test_metrics_collector_records_requests(self):
+        metrics = MetricsCollector()
+        client = TokenMetricsClient(api_key="test-api-key", max_retries=1, instrumentation=[metrics])
+        
+        throttled = mock.Mock(status_code=429, headers={"Retry-After": "0"})
+        ok = mock.Mock(status_code=200, content=b'{"data": [1, 2, 3]}')
+        ok.json.return_value = {"data": [{"DATE": "2023-01-01"}] * 3}
+        failed = mock.Mock(status_code=500, headers={})
+        failed.raise_for_status.side_effect = Exception("500 Server Error")
+        
+        with mock.patch.object(client.session, 'get', side_effect=[throttled, ok, failed, failed]):
+            client.market_metrics.get(startDate="2023-01-01", endDate="2023-02-15")
+        
+        summary = metrics.summary()["market-metrics"]
+        self.assertEqual(summary["requests"], 2)
+        self.assertEqual(summary["errors"], 1)
+        self.assertEqual(summary["retries"], 2)
+        self.assertEqual(summary["chunks"], 2)
+        self.assertEqual(summary["failed_chunks"], 1)
+        self.assertEqual(summary["rows"], 3)
+        self.assertEqual(summary["bytes"], len(ok.content))
+        self.assertIsNotNone(summary["p99"])
+        self.assertLessEqual(summary["p50"], summary["p99"])
+    
+    def test_concurrent_fetches_of_one_endpoint_get_their_own_progress_bar(self):
+        client = TokenMetricsClient(api_key="test-api-key", instrumentation=[TqdmProgress()])
+        
+        def slow_get(url, headers=None, params=None, timeout=None):
+            time.sleep(0.02)
+            response = mock.Mock(status_code=200)
+            response.json.return_value = {"data": [{"DATE": params["startDate"]}]}
+            return response
+        
+        bars = []
+        
+        def new_bar(**kwargs):
+            bars.append(mock.Mock(total=kwargs["total"]))
+            return bars[-1]
+        
+        with mock.patch('tmai_api.instrumentation.tqdm') as fake_tqdm, \
+                mock.patch.object(client.session, 'get', side_effect=slow_get):
+            fake_tqdm.tqdm.side_effect = new_bar
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                list(executor.map(lambda end: client.market_metrics.get(startDate="2023-01-01", endDate=end,
+                                                                         max_days=9),
+                                  ["2023-01-30", "2023-02-19"]))
+        
+        self.assertEqual(sorted(bar.total for bar in bars), [3, 5])
+        for bar in bars:
+            self.assertEqual(bar.update.call_count, bar.total)
+            bar.close.assert_called_once_with()
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
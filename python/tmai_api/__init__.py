@@ -1,4 +1,31 @@
-from tmai_api.client import TokenMetricsClient
+import importlib
 
-__all__ = ["TokenMetricsClient"]
+# Public names and the modules defining them. They are imported on first
+# access, so "import tmai_api" does not load requests, httpx or pandas.
+_EXPORTS = {
+    "TokenMetricsClient": "tmai_api.client",
+    "AsyncTokenMetricsClient": "tmai_api.async_client",
+    "ResponseCache": "tmai_api.cache",
+    "Checkpoint": "tmai_api.checkpoint",
+    "LocalStore": "tmai_api.store",
+    "TokenResolver": "tmai_api.resolver",
+    "Instrumentation": "tmai_api.instrumentation",
+    "MetricsCollector": "tmai_api.instrumentation",
+    "TqdmProgress": "tmai_api.instrumentation",
+    "RecordReplayAdapter": "tmai_api.transport",
+    "DeadlineExceeded": "tmai_api.deadline"
+}
+
+__all__ = list(_EXPORTS)
 __version__ = "0.3.0"
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module 'tmai_api' has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,464 @@
+import asyncio
+import time
+from collections import deque
+from itertools import islice
+
+from tmai_api.base import BaseEndpoint, PaginatedEndpoint, BatchedEndpoint, MAX_PAGES_PER_CHUNK
+from tmai_api.checkpoint import Checkpoint
+from tmai_api.deadline import Deadline
+from tmai_api.instrumentation import next_fetch_id
+from tmai_api.lazy import lazy_import
+
+# httpx is only needed for the asyncio client; imported on first use, None if missing
+httpx = lazy_import("httpx")
+
+class AsyncBaseEndpoint(BaseEndpoint):
+    """Base class for all asyncio API endpoints.
+    
+    Async endpoints reuse the parameter handling of their synchronous
+    counterparts and only replace the I/O layer, so every ``get`` method
+    returns an awaitable.
+    """
+    
+    async def _request(self, method, endpoint, params=None, json=None, deadline=None):
+        """Make a request to the API.
+        
+        GET responses are served from and stored in the client's response
+        cache when one is configured. Identical GETs in flight at the same
+        time share one upstream call through the client's single_flight.
+        
+        Args:
+            method (str): HTTP method (get, post, etc.)
+            endpoint (str): API endpoint path
+            params (dict, optional): Query parameters for GET requests
+            json (dict, optional): JSON payload for POST requests
+            deadline (Deadline or float, optional): Time budget of the call; the request
+                is cancelled when it runs out. If None, uses the client's deadline setting.
+            
+        Returns:
+            dict: API response data
+        """
+        if method.lower() not in ("get", "post"):
+            raise ValueError(f"Unsupported HTTP method: {method}")
+        
+        single_flight = self.client.single_flight
+        if method.lower() == "get" and single_flight is not None:
+            request = single_flight.do_async(self._flight_key(endpoint, params),
+                                             lambda: self._perform_request(method, endpoint, params, json))
+        else:
+            request = self._perform_request(method, endpoint, params, json)
+        
+        deadline = Deadline.coerce(self.client.deadline if deadline is None else deadline)
+        if deadline is not None:
+            return await deadline.wait(request)
+        return await request
+    
+    async def _perform_request(self, method, endpoint, params=None, json=None):
+        """Make a request to the API through the response cache, without coalescing.
+        
+        Args:
+            method (str): HTTP method (get, post, etc.)
+            endpoint (str): API endpoint path
+            params (dict, optional): Query parameters for GET requests
+            json (dict, optional): JSON payload for POST requests
+            
+        Returns:
+            dict: API response data
+        """
+        instrumentation = self.client.instrumentation
+        cache = self.client.cache if method.lower() == "get" else None
+        if cache is not None:
+            cached = cache.get(endpoint, params)
+            if cached is not None:
+                instrumentation.cache_hit(endpoint, params)
+                return cached
+        
+        instrumentation.request_start(endpoint, params)
+        started = time.perf_counter()
+        response = None
+        try:
+            response = await self._send(method, endpoint, params, json)
+            
+            # Raise an exception if the request failed
+            response.raise_for_status()
+            
+            data = response.json()
+        except Exception as e:
+            instrumentation.request_end(endpoint, params, getattr(response, "status_code", None),
+                                        time.perf_counter() - started, error=e)
+            raise
+        
+        instrumentation.request_end(endpoint, params, response.status_code, time.perf_counter() - started,
+                                    self._response_size(response), len(self._response_items(data)))
+        if cache is not None:
+            cache.set(endpoint, params, data)
+        return data
+    
+    async def _send(self, method, endpoint, params=None, json=None):
+        """Send a single API call, retrying 429/5xx responses and connection errors.
+        
+        Args:
+            method (str): HTTP method (get or post)
+            endpoint (str): API endpoint path
+            params (dict, optional): Query parameters for GET requests
+            json (dict, optional): JSON payload for POST requests
+            
+        Returns:
+            httpx.Response: Final HTTP response
+        """
+        url = f"{self.base_url}/{endpoint}"
+        headers = {
+            "accept": "application/json",
+            "api_key": self.client.api_key
+        }
+        if method.lower() == "post":
+            headers["content-type"] = "application/json"
+        
+        # All endpoints share the client's pooled httpx connection pool and rate limiter
+        http = self.client.http
+        limiter = self.client.rate_limiter
+        
+        attempt = 0
+        while True:
+            await limiter.acquire_async()
+            try:
+                if method.lower() == "get":
+                    response = await http.get(url, headers=headers, params=params)
+                else:
+                    response = await http.post(url, headers=headers, json=json)
+            except httpx.TransportError:
+                # Transient network failures are retried with backoff
+                if not limiter.should_retry(None, attempt):
+                    raise
+                delay = limiter.retry_delay(attempt)
+                self.client.instrumentation.retry(endpoint, attempt, None, delay)
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+            
+            # Back off on 429/5xx, honouring Retry-After when the API sends it
+            if limiter.should_retry(response.status_code, attempt):
+                delay = limiter.retry_delay(attempt, response.status_code, response.headers)
+                self.client.instrumentation.retry(endpoint, attempt, response.status_code, delay)
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+            return response
+    
+    async def _paginated_request(self, method, endpoint, params=None, max_days=None, custom_limit=None,
+                                 max_workers=None, stream=False, checkpoint=None, resume=False,
+                                 align=None, deadline=None, failures=None):
+        """Make paginated requests to handle date ranges and custom pagination logic.
+        
+        All chunk and page requests run on the event loop, with at most
+        max_workers requests in flight at once. Results are merged in
+        chronological chunk order. Failed chunks are reported in the result's
+        "failed_chunks" list, and a checkpoint allows resuming a backfill.
+        With a deadline, chunks still running when it expires are cancelled
+        and the combined response is flagged with "partial": True.
+        
+        Args:
+            method (str): HTTP method (get, post, etc.)
+            endpoint (str): API endpoint path
+            params (dict): Query parameters including startDate and endDate
+            max_days (int, optional): Maximum number of days allowed between startDate and endDate
+            custom_limit (int, optional): Custom limit value. If None, uses endpoint-specific defaults.
+            max_workers (int, optional): Maximum number of requests in flight at once.
+                If None, uses the client's max_workers setting.
+            stream (bool, optional): Return an async generator of chunk responses instead
+                of one combined response
+            checkpoint (Checkpoint or str, optional): Checkpoint (or directory) recording
+                completed and failed chunks
+            resume (bool, optional): Skip chunks the checkpoint marks as completed
+            align (str or int, optional): Align chunks to canonical buckets ('month', or a
+                number of days counted from ALIGNMENT_EPOCH) and trim the rows outside
+                the requested range locally. Defaults to the client's chunk_alignment.
+            deadline (float, optional): Total time budget in seconds for the whole call.
+                If None, uses the client's deadline setting.
+            failures (list, optional): Receives a dict with params and error per chunk of
+                this call that failed, also when streaming
+        
+        Returns:
+            dict: Combined API response data, or an async generator of chunk responses
+            if stream is True
+        """
+        if isinstance(checkpoint, str):
+            checkpoint = Checkpoint(checkpoint)
+        deadline = Deadline.coerce(self.client.deadline if deadline is None else deadline)
+        
+        if failures is None:
+            failures = []
+        chunks = self._iter_paginated(method, endpoint, params, max_days, custom_limit, max_workers,
+                                      checkpoint, resume, failures, align, deadline)
+        if stream:
+            return chunks
+        
+        result = self._merge_responses([response async for response in chunks])
+        if failures and isinstance(result, dict):
+            result["failed_chunks"] = failures
+            result["partial"] = True
+        return result
+    
+    async def _iter_paginated(self, method, endpoint, params=None, max_days=None, custom_limit=None,
+                              max_workers=None, checkpoint=None, resume=False, failures=None,
+                              align=None, deadline=None):
+        """Yield the response of each date chunk in chronological order as it arrives.
+        
+        At most max_workers chunks are scheduled ahead of the caller, so a slow
+        consumer keeps memory bounded to a few chunks. Failed chunks are skipped
+        and reported through failures and the checkpoint.
+        
+        Args:
+            method (str): HTTP method (get, post, etc.)
+            endpoint (str): API endpoint path
+            params (dict): Query parameters including startDate and endDate
+            max_days (int, optional): Maximum number of days allowed between startDate and endDate
+            custom_limit (int, optional): Custom limit value. If None, uses endpoint-specific defaults.
+            max_workers (int, optional): Maximum number of requests in flight at once.
+                If None, uses the client's max_workers setting.
+            checkpoint (Checkpoint, optional): Checkpoint recording chunk outcomes
+            resume (bool, optional): Serve chunks completed in the checkpoint from disk
+            failures (list, optional): Receives a dict with params and error per failed chunk
+            align (str or int, optional): Canonical chunk buckets ('month' or a number of days)
+            deadline (Deadline, optional): Time budget shared by every chunk
+        
+        Yields:
+            dict or list: API response data of one date chunk
+        """
+        if align is None:
+            align = self.client.chunk_alignment
+        chunk_params_list = self._plan_chunks(endpoint, params, max_days, custom_limit, align, checkpoint)
+        trim = None
+        if align and params and params.get('startDate') and params.get('endDate'):
+            # Aligned chunks may extend past the requested range, which is trimmed locally
+            trim = (params['startDate'], params['endDate'])
+        
+        if max_workers is None:
+            max_workers = self.client.max_workers
+        max_workers = max(1, max_workers)
+        semaphore = asyncio.Semaphore(max_workers)
+        
+        instrumentation = self.client.instrumentation
+        fetch_id = next_fetch_id()
+        instrumentation.fetch_start(endpoint, len(chunk_params_list), fetch_id=fetch_id)
+        remaining = iter(chunk_params_list)
+        pending = deque(
+            (chunk_params, asyncio.ensure_future(
+                self._run_chunk(method, endpoint, chunk_params, semaphore, checkpoint, resume, deadline)))
+            for chunk_params in islice(remaining, max_workers)
+        )
+        try:
+            while pending:
+                # Tasks are awaited in chunk order regardless of completion order
+                chunk_params, task = pending.popleft()
+                response, error = await task
+                for next_params in islice(remaining, 1):
+                    pending.append((next_params, asyncio.ensure_future(
+                        self._run_chunk(method, endpoint, next_params, semaphore, checkpoint, resume,
+                                        deadline))))
+                self._chunk_done(endpoint, chunk_params, response, error, failures, fetch_id)
+                if response is not None:
+                    yield self._trim_response(response, trim)
+        finally:
+            # Stop scheduled chunks if the caller abandons the generator early
+            for _, task in pending:
+                task.cancel()
+            instrumentation.fetch_end(endpoint, fetch_id=fetch_id)
+    
+    async def _run_chunk(self, method, endpoint, chunk_params, semaphore, checkpoint=None, resume=False,
+                         deadline=None):
+        """Fetch a chunk (or load it from the checkpoint) and record its outcome.
+        
+        Args:
+            method (str): HTTP method (get, post, etc.)
+            endpoint (str): API endpoint path
+            chunk_params (dict): Query parameters for this chunk, including limit and page
+            semaphore (asyncio.Semaphore): Bounds the number of requests in flight
+            checkpoint (Checkpoint, optional): Checkpoint recording chunk outcomes
+            resume (bool, optional): Serve the chunk from the checkpoint if it was completed
+            deadline (Deadline, optional): Time budget; the chunk's requests are cancelled
+                when it runs out
+        
+        Returns:
+            tuple: (response, error), with response None if the chunk failed
+        """
+        if checkpoint is not None and resume and checkpoint.status(endpoint, chunk_params) == "done":
+            return checkpoint.load(endpoint, chunk_params), None
+        
+        try:
+            fetch = self._fetch_chunk(method, endpoint, chunk_params, semaphore, deadline)
+            response = await (fetch if deadline is None else deadline.wait(fetch))
+        except Exception as e:
+            if checkpoint is not None:
+                checkpoint.mark_failed(endpoint, chunk_params, e)
+            return None, e
+        
+        if checkpoint is not None:
+            checkpoint.mark_done(endpoint, chunk_params, response)
+        return response, None
+    
+    async def _fetch_chunk(self, method, endpoint, chunk_params, semaphore, deadline=None):
+        """Fetch every page of a single date chunk.
+        
+        A page that still fails after retries fails the whole chunk.
+        
+        Args:
+            method (str): HTTP method (get, post, etc.)
+            endpoint (str): API endpoint path
+            chunk_params (dict): Query parameters for this chunk, including limit and page
+            semaphore (asyncio.Semaphore): Bounds the number of requests in flight
+            deadline (Deadline, optional): Time budget shared by every page request
+        
+        Returns:
+            dict or list: Combined API response data for the chunk
+        """
+        limit = chunk_params['limit']
+        
+        first_page = await self._fetch_page(method, endpoint, chunk_params, semaphore, deadline)
+        
+        first_items = self._response_items(first_page)
+        if len(first_items) < limit:
+            return first_page
+        
+        pages = [first_page]
+        total = self._response_total(first_page)
+        
+        if total is not None:
+            # The total is known, so all remaining pages can be requested at once
+            # A bogus total must not fan out into an unbounded number of requests
+            page_count = min(-(-total // limit), MAX_PAGES_PER_CHUNK)
+            page_params_list = []
+            for page in range(chunk_params['page'] + 1, chunk_params['page'] + page_count):
+                page_params = chunk_params.copy()
+                page_params['page'] = page
+                page_params_list.append(page_params)
+            
+            pages.extend(await asyncio.gather(*(
+                self._fetch_page(method, endpoint, page_params, semaphore, deadline)
+                for page_params in page_params_list
+            )))
+            return self._merge_responses(pages)
+        
+        # Otherwise walk the pages until a short (or repeated) page is returned
+        previous_items = first_items
+        for page in range(chunk_params['page'] + 1, chunk_params['page'] + MAX_PAGES_PER_CHUNK):
+            page_params = chunk_params.copy()
+            page_params['page'] = page
+            response = await self._fetch_page(method, endpoint, page_params, semaphore, deadline)
+            
+            items = self._response_items(response)
+            # Guard against the API ignoring the page parameter and repeating itself
+            if items == previous_items:
+                break
+            
+            pages.append(response)
+            if len(items) < limit:
+                break
+            previous_items = items
+        
+        return self._merge_responses(pages)
+    
+    async def _fetch_page(self, method, endpoint, page_params, semaphore, deadline=None):
+        """Fetch a single page once a request slot is free.
+        
+        Args:
+            method (str): HTTP method (get, post, etc.)
+            endpoint (str): API endpoint path
+            page_params (dict): Query parameters for this page
+            semaphore (asyncio.Semaphore): Bounds the number of requests in flight
+            deadline (Deadline, optional): Time budget of the whole call. If None,
+                the request uses the client's deadline setting.
+        
+        Returns:
+            dict or list: API response data
+        """
+        async with semaphore:
+            return await self._request(method, endpoint, page_params, deadline=deadline)
+    
+    async def _sync_request(self, method, endpoint, params, max_days=None, max_workers=None):
+        """Fetch only the date ranges missing from the client's sync store.
+        
+        Args:
+            method (str): HTTP method (get, post, etc.)
+            endpoint (str): API endpoint path
+            params (dict): Query parameters including token_id, startDate and endDate
+            max_days (int, optional): Maximum number of days allowed between startDate and endDate
+            max_workers (int, optional): Maximum number of requests in flight at once.
+                If None, uses the client's max_workers setting.
+            
+        Returns:
+            dict: Stored rows for every requested token within the date range, with
+            "failed_chunks" and "partial": True if some ranges could not be fetched
+        """
+        units = self._plan_sync(endpoint, params, max_days)
+        
+        if max_workers is None:
+            max_workers = self.client.max_workers
+        semaphore = asyncio.Semaphore(max(1, max_workers))
+        
+        results = await asyncio.gather(*(
+            self._run_chunk(method, endpoint, chunk_params, semaphore) for _, chunk_params in units
+        ))
+        return self._apply_sync(endpoint, params, units, results)
+    
+    async def get_dataframe(self, backend=None, **kwargs):
+        """Get endpoint data as a DataFrame.
+        
+        Args:
+            backend (str, optional): 'pandas', 'arrow' or 'polars'. If None, uses the
+                client's dataframe_backend setting.
+            **kwargs: Arguments to pass to the get method
+        
+        Returns:
+            pandas.DataFrame, pyarrow.Table or polars.DataFrame: Frame containing the response data
+        """
+        data = await self.get(**kwargs)
+        return self.to_dataframe(data, backend)
+
+class AsyncPaginatedEndpoint(AsyncBaseEndpoint, PaginatedEndpoint):
+    """Base class for asyncio endpoints whose results are fetched in date chunks."""
+    
+    async def iter_chunks(self, backend=None, **kwargs):
+        """Yield the data of each date chunk as a DataFrame as soon as it arrives.
+        
+        Args:
+            backend (str, optional): 'pandas', 'arrow' or 'polars'. If None, uses the
+                client's dataframe_backend setting.
+            **kwargs: Arguments to pass to the get method
+        
+        Yields:
+            pandas.DataFrame, pyarrow.Table or polars.DataFrame: Data of one date chunk,
+            in chronological order
+        """
+        async for response in await self.get(stream=True, **kwargs):
+            yield self.to_dataframe(response, backend)
+    
+    async def iter_records(self, **kwargs):
+        """Yield data rows one by one as their date chunk arrives.
+        
+        Args:
+            **kwargs: Arguments to pass to the get method
+        
+        Yields:
+            dict: A single data row, in chronological chunk order
+        """
+        async for response in await self.get(stream=True, **kwargs):
+            for row in self._response_items(response):
+                yield row
+
+class AsyncBatchedEndpoint(AsyncPaginatedEndpoint, BatchedEndpoint):
+    """Base class for asyncio endpoints whose per-token loads are batched."""
+    
+    async def load(self, token_id, **kwargs):
+        """Get the data of a single token, batched with concurrent load calls.
+        
+        Args:
+            token_id (str or int): Token ID
+            **kwargs: Other arguments to pass to the get method (not symbol or token_name)
+        
+        Returns:
+            dict: Response of the combined request, holding only this token's rows
+        """
+        return await self.client.loader.load_async(
+            self._load_key(kwargs), str(token_id),
+            lambda token_ids: self.get(token_id=",".join(token_ids), **kwargs))
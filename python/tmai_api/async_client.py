@@ -0,0 +1,230 @@
+from tmai_api.async_base import AsyncBaseEndpoint, AsyncPaginatedEndpoint, AsyncBatchedEndpoint
+from tmai_api.base import MAX_BATCH_SIZE
+from tmai_api.cache import ResponseCache
+from tmai_api.instrumentation import Instrumentation, CompositeInstrumentation
+from tmai_api.lazy import lazy_import
+from tmai_api.loader import BatchLoader, BATCH_WINDOW
+from tmai_api.ratelimit import RateLimiter
+from tmai_api.schemas import BACKENDS
+from tmai_api.singleflight import SingleFlight
+from tmai_api.sizing import RowRateEstimator
+from tmai_api.store import LocalStore
+from tmai_api.sync import SyncStore
+from tmai_api.endpoints.tokens import TokensEndpoint
+from tmai_api.endpoints.hourly_ohlcv import HourlyOHLCVEndpoint
+from tmai_api.endpoints.daily_ohlcv import DailyOHLCVEndpoint
+from tmai_api.endpoints.investor_grades import InvestorGradesEndpoint
+from tmai_api.endpoints.trader_grades import TraderGradesEndpoint
+from tmai_api.endpoints.trader_indices import TraderIndicesEndpoint
+from tmai_api.endpoints.market_metrics import MarketMetricsEndpoint
+from tmai_api.endpoints.ai_agent import AIAgentEndpoint
+from tmai_api.endpoints.ai_reports import AIReportsEndpoint
+from tmai_api.endpoints.trading_signals import TradingSignalsEndpoint
+
+# httpx is only needed for the asyncio client; imported on first use, None if missing
+httpx = lazy_import("httpx")
+
+class AsyncTokensEndpoint(AsyncBaseEndpoint, TokensEndpoint):
+    """Asyncio endpoint for accessing token information"""
+
+class AsyncHourlyOHLCVEndpoint(AsyncPaginatedEndpoint, HourlyOHLCVEndpoint):
+    """Asyncio endpoint for accessing hourly OHLCV data"""
+
+class AsyncDailyOHLCVEndpoint(AsyncPaginatedEndpoint, DailyOHLCVEndpoint):
+    """Asyncio endpoint for accessing daily OHLCV data"""
+
+class AsyncInvestorGradesEndpoint(AsyncBatchedEndpoint, InvestorGradesEndpoint):
+    """Asyncio endpoint for accessing long-term investment grades"""
+
+class AsyncTraderGradesEndpoint(AsyncBatchedEndpoint, TraderGradesEndpoint):
+    """Asyncio endpoint for accessing short-term trading grades"""
+
+class AsyncTraderIndicesEndpoint(AsyncPaginatedEndpoint, TraderIndicesEndpoint):
+    """Asyncio endpoint for accessing AI-generated trading portfolios"""
+
+class AsyncMarketMetricsEndpoint(AsyncPaginatedEndpoint, MarketMetricsEndpoint):
+    """Asyncio endpoint for accessing market sentiment metrics"""
+
+class AsyncAIAgentEndpoint(AsyncBaseEndpoint, AIAgentEndpoint):
+    """Asyncio endpoint for accessing the AI Agent (chatbot) for token insights"""
+    
+    async def get_answer_text(self, question):
+        """Get just the answer text from the AI chatbot response.
+        
+        Args:
+            question (str): The question to ask
+        
+        Returns:
+            str: The answer text from the AI chatbot
+        """
+        response = await self.ask(question)
+        return response.get("answer", "")
+
+class AsyncAIReportsEndpoint(AsyncBaseEndpoint, AIReportsEndpoint):
+    """Asyncio endpoint for accessing AI-generated trading and investment reports"""
+
+class AsyncTradingSignalsEndpoint(AsyncBatchedEndpoint, TradingSignalsEndpoint):
+    """Asyncio endpoint for accessing AI-generated trading signals"""
+
+class AsyncTokenMetricsClient:
+    """Asyncio client for interacting with the Token Metrics AI API.
+    
+    Exposes the same endpoints as TokenMetricsClient, but every ``get``,
+    ``get_dataframe`` and ``chat`` call must be awaited. All requests share
+    one httpx connection pool.
+    """
+    
+    BASE_URL = "https://api.tokenmetrics.com/v2"
+    
+    # Endpoint attributes and their classes, instantiated on first access
+    ENDPOINTS = {
+        'tokens': AsyncTokensEndpoint,
+        'hourly_ohlcv': AsyncHourlyOHLCVEndpoint,
+        'daily_ohlcv': AsyncDailyOHLCVEndpoint,
+        'investor_grades': AsyncInvestorGradesEndpoint,
+        'trader_grades': AsyncTraderGradesEndpoint,
+        'trader_indices': AsyncTraderIndicesEndpoint,
+        'market_metrics': AsyncMarketMetricsEndpoint,
+        'ai_agent': AsyncAIAgentEndpoint,
+        'ai_reports': AsyncAIReportsEndpoint,
+        'trading_signals': AsyncTradingSignalsEndpoint
+    }
+    
+    def __init__(self, api_key=None, max_connections=10, max_keepalive_connections=10,
+                 timeout=60, compression=True, max_workers=1,
+                 rate_limit=None, max_retries=3, backoff_factor=0.5, cache=None,
+                 sync_store=None, store=None, dataframe_backend='pandas',
+                 instrumentation=None, transport=None,
+                 chunk_alignment=None, single_flight=True, batch_window=BATCH_WINDOW,
+                 deadline=None):
+        """Initialize the asyncio Token Metrics client.
+        
+        Args:
+            api_key (str): Your Token Metrics API key
+            max_connections (int, optional): Maximum number of concurrent connections
+            max_keepalive_connections (int, optional): Maximum number of idle keep-alive connections
+            timeout (float or tuple, optional): Request timeout in seconds, either a single
+                value or a (connect, read) tuple. None waits indefinitely, which lets a
+                stalled connection hang a call, so prefer a finite value.
+            compression (bool, optional): Negotiate compressed (gzip/deflate) responses.
+                Set to False to request uncompressed payloads.
+            max_workers (int, optional): Number of chunk and page requests kept in flight
+                by paginated endpoints. Keep this at or below max_connections.
+            rate_limit (float, optional): Maximum sustained requests per second shared by
+                all endpoints. None disables client-side throttling.
+            max_retries (int, optional): Retries for 429/5xx responses and connection errors
+            backoff_factor (float, optional): Base delay in seconds for jittered exponential
+                backoff. Retry-After headers take precedence.
+            cache (ResponseCache, str or bool, optional): Opt-in on-disk response cache.
+                Pass a ResponseCache, a path to a cache file, or True for the default location.
+            sync_store (SyncStore or str, optional): Local store used by the OHLCV sync()
+                methods to download only missing date ranges. Pass a SyncStore or a directory.
+            store (LocalStore or str, optional): Partitioned Parquet store that every
+                paginated endpoint writes its results into. Pass a LocalStore or a directory.
+            dataframe_backend (str, optional): Default output of get_dataframe: 'pandas',
+                'arrow' (pyarrow.Table) or 'polars'
+            instrumentation (Instrumentation or list, optional): Hooks notified of requests,
+                retries, cache hits and finished chunks, e.g. TqdmProgress() or
+                MetricsCollector(). Pass a list to combine several. Defaults to no-op hooks.
+            transport (httpx.AsyncBaseTransport, optional): Transport used instead of the
+                pooled default, e.g. AsyncRecordReplayTransport to record or replay fixtures
+            chunk_alignment (str or int, optional): Default alignment of paginated date
+                chunks: 'month' for calendar months or a number of days (e.g. 28) per
+                fixed bucket. Overlapping queries then request identical chunks, which
+                lets the response cache serve them. None anchors chunks at startDate.
+            single_flight (bool, optional): Share one upstream call between identical GET
+                requests in flight at the same time, e.g. parallel tool calls asking for
+                the same signals. Set to False to send every request.
+            batch_window (float, optional): Seconds that load() calls on trading signals
+                and trader/investor grades wait for other tokens, so concurrent per-token
+                loads are sent as one comma-separated query
+            deadline (float, optional): Default total time budget in seconds of each call.
+                A paginated get() shares it across all of its chunk requests and returns
+                what it fetched in time, flagged "partial", instead of blocking. Calls can
+                override it with deadline=. None lets calls run until they finish.
+        """
+        if httpx is None:
+            raise ImportError(
+                "AsyncTokenMetricsClient requires httpx. Install it with: pip install tmai-api[async]"
+            )
+        
+        self.api_key = api_key
+        self.timeout = timeout
+        self.deadline = deadline
+        self.max_workers = max_workers
+        self.rate_limiter = RateLimiter(rate=rate_limit, max_retries=max_retries,
+                                        backoff_factor=backoff_factor)
+        # Rows per day observed by paginated endpoints, used to size their date windows
+        self.row_rates = RowRateEstimator()
+        self.chunk_alignment = chunk_alignment
+        self.single_flight = SingleFlight() if single_flight else None
+        self.loader = BatchLoader(window=batch_window, max_batch_size=MAX_BATCH_SIZE)
+        if cache is True:
+            cache = ResponseCache()
+        elif isinstance(cache, str):
+            cache = ResponseCache(cache)
+        self.cache = cache or None
+        if isinstance(sync_store, str):
+            sync_store = SyncStore(sync_store)
+        self.sync_store = sync_store
+        if isinstance(store, str):
+            store = LocalStore(store)
+        self.store = store
+        if dataframe_backend not in BACKENDS:
+            raise ValueError(f"Unsupported dataframe backend: {dataframe_backend}")
+        self.dataframe_backend = dataframe_backend
+        if instrumentation is None:
+            instrumentation = Instrumentation()
+        elif isinstance(instrumentation, (list, tuple)):
+            instrumentation = CompositeInstrumentation(instrumentation)
+        self.instrumentation = instrumentation
+        self.http = self._create_http_client(max_connections, max_keepalive_connections,
+                                             timeout, compression, transport)
+    
+    def __getattr__(self, name):
+        # Endpoints are created on first access and then cached as regular attributes
+        endpoint_class = self.ENDPOINTS.get(name)
+        if endpoint_class is None:
+            raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+        return self.__dict__.setdefault(name, endpoint_class(self))
+    
+    def __dir__(self):
+        return sorted(set(super().__dir__()) | set(self.ENDPOINTS))
+    
+    def _create_http_client(self, max_connections, max_keepalive_connections, timeout, compression,
+                            transport=None):
+        """Create the pooled httpx client shared by all endpoints.
+        
+        Args:
+            max_connections (int): Maximum number of concurrent connections
+            max_keepalive_connections (int): Maximum number of idle keep-alive connections
+            timeout (float or tuple): Request timeout in seconds
+            compression (bool): Whether to negotiate compressed responses
+            transport (httpx.AsyncBaseTransport, optional): Transport to use instead of the
+                pooled default; connection limits then belong to that transport
+        
+        Returns:
+            httpx.AsyncClient: Configured HTTP client
+        """
+        limits = httpx.Limits(max_connections=max_connections,
+                              max_keepalive_connections=max_keepalive_connections)
+        if isinstance(timeout, tuple):
+            connect, read = timeout
+            timeout = httpx.Timeout(read, connect=connect)
+        else:
+            timeout = httpx.Timeout(timeout)
+        
+        # httpx already advertises gzip/deflate by default
+        headers = {} if compression else {"Accept-Encoding": "identity"}
+        
+        return httpx.AsyncClient(limits=limits, timeout=timeout, headers=headers, transport=transport)
+    
+    async def aclose(self):
+        """Close the underlying HTTP client and release pooled connections."""
+        await self.http.aclose()
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.aclose()
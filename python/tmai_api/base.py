@@ -1,11 +1,67 @@
-import requests
-import pandas as pd
 import datetime
-from tqdm import tqdm
+import threading
+import time
+import requests
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from tmai_api.checkpoint import Checkpoint
+from tmai_api.deadline import Deadline
+from tmai_api.instrumentation import next_fetch_id
+from tmai_api.lazy import lazy_import
+from tmai_api.schemas import build_output
+
+# pandas is imported on first use, so clients that never build a DataFrame do not pay for it
+pd = lazy_import("pandas")
+
+# Safety cap on the number of pages requested for a single date chunk
+MAX_PAGES_PER_CHUNK = 1000
+
+# Response keys that may report the total number of items across all pages
+TOTAL_COUNT_KEYS = ('total', 'totalCount', 'total_count', 'totalItems')
+
+# Default limits for different endpoints
+ENDPOINT_LIMITS = {
+    'daily-ohlcv': 100,
+    'hourly-ohlcv': 1000,
+    'trader-grades': 1000,
+    'investor-grades': 1000,
+    'market-metrics': 1000,
+    'trader-indices': 1000,
+    'trading-signals': 1000,
+    # Default for any other endpoint
+    'default': 1000
+}
+
+# Expected rows per token per day, for endpoints that return more than one
+ROWS_PER_DAY = {
+    'hourly-ohlcv': 24
+}
+
+# Date window used for unfiltered queries until their row rate has been observed
+DEFAULT_CHUNK_DAYS = 30
+
+# Upper bound on the length of an adaptive date window
+MAX_CHUNK_DAYS = 365
+
+# First day of fixed-length aligned chunks (a Monday, so 7-day multiples start on Mondays)
+ALIGNMENT_EPOCH = datetime.date(1970, 1, 5)
+
+# Comma-separated list parameters that are split into batches (first match wins)
+BATCH_KEYS = ('token_id', 'symbol', 'token_name')
+
+# Upper bound on the number of tokens in one query string
+MAX_BATCH_SIZE = 100
+
+# Columns identifying a row; merged rows sharing them are duplicates
+DEDUP_KEYS = ('TOKEN_ID', 'DATE')
 
 class BaseEndpoint:
     """Base class for all API endpoints"""
     
+    # Column dtypes used by to_dataframe (see tmai_api.schemas)
+    schema = None
+    
     def __init__(self, client):
         """Initialize the endpoint with a client instance.
         
@@ -15,39 +71,178 @@ class BaseEndpoint:
         self.client = client
         self.base_url = client.BASE_URL
     
-    def _request(self, method, endpoint, params=None, json=None):
+    def _request(self, method, endpoint, params=None, json=None, deadline=None):
         """Make a request to the API.
         
+        GET responses are served from and stored in the client's response
+        cache when one is configured. Identical GETs in flight at the same
+        time share one upstream call through the client's single_flight.
+        Each caller only waits for the shared call within its own deadline,
+        and when the call fails because the deadline of the caller making it
+        ran out, a waiting caller makes the request again with its own.
+        
         Args:
             method (str): HTTP method (get, post, etc.)
             endpoint (str): API endpoint path
             params (dict, optional): Query parameters for GET requests
             json (dict, optional): JSON payload for POST requests
+            deadline (Deadline or float, optional): Time budget of the call. If None,
+                uses the client's deadline setting.
             
         Returns:
             dict: API response data
         """
+        if method.lower() not in ("get", "post"):
+            raise ValueError(f"Unsupported HTTP method: {method}")
+        
+        deadline = Deadline.coerce(self.client.deadline if deadline is None else deadline)
+        single_flight = self.client.single_flight
+        if method.lower() == "get" and single_flight is not None:
+            return single_flight.do(self._flight_key(endpoint, params),
+                                      lambda: self._perform_request(method, endpoint, params, json, deadline),
+                                      timeout=None if deadline is None else deadline.remaining())
+        return self._perform_request(method, endpoint, params, json, deadline)
+    
+    def _perform_request(self, method, endpoint, params=None, json=None, deadline=None):
+        """Make a request to the API through the response cache, without coalescing.
+        
+        Args:
+            method (str): HTTP method (get, post, etc.)
+            endpoint (str): API endpoint path
+            params (dict, optional): Query parameters for GET requests
+            json (dict, optional): JSON payload for POST requests
+            deadline (Deadline, optional): Time budget of the call
+            
+        Returns:
+            dict: API response data
+        """
+        instrumentation = self.client.instrumentation
+        cache = self.client.cache if method.lower() == "get" else None
+        if cache is not None:
+            cached = cache.get(endpoint, params)
+            if cached is not None:
+                instrumentation.cache_hit(endpoint, params)
+                return cached
+        
+        instrumentation.request_start(endpoint, params)
+        started = time.perf_counter()
+        response = None
+        try:
+            response = self._send(method, endpoint, params, json, deadline)
+            
+            # Raise an exception if the request failed
+            response.raise_for_status()
+            
+            data = response.json()
+        except Exception as e:
+            instrumentation.request_end(endpoint, params, getattr(response, "status_code", None),
+                                        time.perf_counter() - started, error=e)
+            raise
+        
+        instrumentation.request_end(endpoint, params, response.status_code, time.perf_counter() - started,
+                                    self._response_size(response), len(self._response_items(data)))
+        if cache is not None:
+            cache.set(endpoint, params, data)
+        return data
+    
+    @staticmethod
+    def _flight_key(endpoint, params):
+        """Build the key under which identical requests are coalesced.
+        
+        Args:
+            endpoint (str): API endpoint path
+            params (dict): Query parameters
+            
+        Returns:
+            tuple: Endpoint and the sorted query parameters
+        """
+        return endpoint, tuple(sorted((k, str(v)) for k, v in (params or {}).items()))
+    
+    @staticmethod
+    def _response_size(response):
+        """Return the size of a response body in bytes (0 if unknown).
+        
+        Args:
+            response: HTTP response
+            
+        Returns:
+            int: Body size in bytes
+        """
+        content = getattr(response, "content", None)
+        return len(content) if isinstance(content, (bytes, bytearray)) else 0
+    
+    def _send(self, method, endpoint, params=None, json=None, deadline=None):
+        """Send a single API call, retrying 429/5xx responses and connection errors.
+        
+        With a deadline, every attempt's timeout is clamped to the time left,
+        and neither a rate limiter wait nor a retry is started that would
+        outlast it. The call then fails with DeadlineExceeded, so callers
+        sharing it through single_flight know the failure came from this
+        call's budget.
+        
+        Args:
+            method (str): HTTP method (get or post)
+            endpoint (str): API endpoint path
+            params (dict, optional): Query parameters for GET requests
+            json (dict, optional): JSON payload for POST requests
+            deadline (Deadline, optional): Time budget of the call
+            
+        Returns:
+            requests.Response: Final HTTP response
+        """
         url = f"{self.base_url}/{endpoint}"
         headers = {
             "accept": "application/json",
             "api_key": self.client.api_key
         }
-        
-        if method.lower() == "get":
-            response = requests.get(url, headers=headers, params=params)
-        elif method.lower() == "post":
+        if method.lower() == "post":
             headers["content-type"] = "application/json"
-            response = requests.post(url, headers=headers, json=json)
-        else:
-            raise ValueError(f"Unsupported HTTP method: {method}")
         
-        # Raise an exception if the request failed
-        response.raise_for_status()
+        # All endpoints share the client's pooled keep-alive session and rate limiter
+        session = self.client.session
+        timeout = self.client.timeout
+        limiter = self.client.rate_limiter
         
-        return response.json()
+        attempt = 0
+        while True:
+            if limiter.acquire(None if deadline is None else deadline.remaining()) is None:
+                raise deadline.exceeded("rate limiter wait exceeds the time left")
+            request_timeout = timeout if deadline is None else deadline.timeout(timeout)
+            try:
+                if method.lower() == "get":
+                    response = session.get(url, headers=headers, params=params, timeout=request_timeout)
+                else:
+                    response = session.post(url, headers=headers, json=json, timeout=request_timeout)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if deadline is not None and deadline.expired():
+                    raise deadline.exceeded() from e
+                # Transient network failures are retried with backoff
+                if not limiter.should_retry(None, attempt):
+                    raise
+                delay = limiter.retry_delay(attempt)
+                if deadline is not None and not deadline.allows(delay):
+                    raise deadline.exceeded(f"no time left to retry {type(e).__name__}") from e
+                self.client.instrumentation.retry(endpoint, attempt, None, delay)
+                time.sleep(delay)
+                attempt += 1
+                continue
+            
+            # Back off on 429/5xx, honouring Retry-After when the API sends it
+            if limiter.should_retry(response.status_code, attempt):
+                delay = limiter.retry_delay(attempt, response.status_code, response.headers)
+                if deadline is not None and not deadline.allows(delay):
+                    raise deadline.exceeded(f"no time left to retry HTTP {response.status_code}")
+                self.client.instrumentation.retry(endpoint, attempt, response.status_code, delay)
+                time.sleep(delay)
+                attempt += 1
+                continue
+            return response
     
     def _chunk_date_range(self, startDate, endDate, max_days=29):
-        """Split a date range into chunks of max_days.
+        """Split a date range into non-overlapping chunks of max_days.
+        
+        Both ends of a chunk are inclusive, so each chunk starts the day after
+        the previous one ends and no boundary day is requested twice.
         
         Args:
             startDate (str): Start date in YYYY-MM-DD format
@@ -75,7 +270,7 @@ class BaseEndpoint:
         result = []
         chunk_start = start
         
-        while chunk_start < end:
+        while chunk_start <= end:
             # Calculate chunk end date (chunk_start + max_days or end date, whichever is earlier)
             chunk_end = min(chunk_start + datetime.timedelta(days=max_days), end)
             
@@ -85,40 +280,70 @@ class BaseEndpoint:
                 chunk_end.strftime("%Y-%m-%d")
             ))
             
-            # Move to next chunk
-            chunk_start = chunk_end
+            # Move to next chunk, starting after the inclusive end of this one
+            chunk_start = chunk_end + datetime.timedelta(days=1)
             
         return result
     
-    def _paginated_request(self, method, endpoint, params=None, max_days=29, custom_limit=None):
-        """Make paginated requests to handle date ranges and custom pagination logic.
+    @staticmethod
+    def _aligned_date_range(startDate, endDate, align):
+        """Split a date range into the canonical buckets covering it.
         
-        This method handles two forms of pagination:
-        1. Date chunking: Splitting long date ranges into <= max_days chunks
-        2. Offset-based pagination: Since the API's page parameter doesn't work as expected
+        Buckets depend only on the calendar, not on the requested range, so
+        queries offset by a few days still request identical chunks. The first
+        and last buckets may extend past the range.
+        
+        Args:
+            startDate (str): Start date in YYYY-MM-DD format
+            endDate (str): End date in YYYY-MM-DD format
+            align (str or int): 'month' for calendar months, or a number of days per
+                bucket counted from ALIGNMENT_EPOCH
+            
+        Returns:
+            list: List of (bucket_start_date, bucket_end_date) tuples
+        """
+        if align != 'month' and (isinstance(align, bool) or not isinstance(align, int) or align < 1):
+            raise ValueError(f"Unsupported chunk alignment: {align}")
+        try:
+            start = datetime.datetime.strptime(startDate, "%Y-%m-%d").date()
+            end = datetime.datetime.strptime(endDate, "%Y-%m-%d").date()
+        except ValueError:
+            return [(startDate, endDate)]
+        
+        if align == 'month':
+            bucket_start = start.replace(day=1)
+        else:
+            bucket_start = ALIGNMENT_EPOCH + datetime.timedelta(
+                days=(start - ALIGNMENT_EPOCH).days // align * align)
+        
+        result = []
+        while bucket_start <= end:
+            if align == 'month':
+                next_start = (bucket_start + datetime.timedelta(days=32)).replace(day=1)
+            else:
+                next_start = bucket_start + datetime.timedelta(days=align)
+            result.append((bucket_start.isoformat(), (next_start - datetime.timedelta(days=1)).isoformat()))
+            bucket_start = next_start
+        return result
+    
+    def _prepare_chunk_params(self, endpoint, params, max_days=None, custom_limit=None, align=None):
+        """Build the query parameters for every date chunk of a paginated request.
+        
+        The date window is sized so each chunk fits in about one page (see
+        _window_days); max_days only caps it. With align, the chunks are the
+        canonical buckets covering the range instead (see _aligned_date_range).
         
         Args:
-            method (str): HTTP method (get, post, etc.)
             endpoint (str): API endpoint path
             params (dict): Query parameters including startDate and endDate
-            max_days (int): Maximum number of days allowed between startDate and endDate
+            max_days (int, optional): Maximum number of days allowed between startDate and endDate
             custom_limit (int, optional): Custom limit value. If None, uses endpoint-specific defaults.
+            align (str or int, optional): 'month' or a number of days per aligned bucket
             
         Returns:
-            dict: Combined API response data
+            list: Query parameters for each date chunk (and token batch within it),
+            in chronological order
         """
-        # Default limits for different endpoints
-        endpoint_limits = {
-            'daily-ohlcv': 100,
-            'hourly-ohlcv': 1000,
-            'trader-grades': 1000,
-            'investor-grades': 1000,
-            'market-metrics': 1000,
-            'trader-indices': 1000,
-            'trading-signals': 1000,
-            # Default for any other endpoint
-            'default': 1000
-        }
         if params is None:
             params = {}
             
@@ -131,7 +356,7 @@ class BaseEndpoint:
             limit = custom_limit
         else:
             # Use endpoint-specific limit
-            limit = endpoint_limits.get(endpoint, endpoint_limits['default'])
+            limit = ENDPOINT_LIMITS.get(endpoint, ENDPOINT_LIMITS['default'])
         
         # Override user-provided limit with our internal limit
         params['limit'] = limit
@@ -143,64 +368,590 @@ class BaseEndpoint:
         # If no date range or already within limits, we still need to handle pagination
         if not startDate or not endDate:
             date_chunks = [(startDate, endDate)]
+        elif align:
+            # Identical buckets for overlapping ranges, so cached chunks are reused
+            date_chunks = self._aligned_date_range(startDate, endDate, align)
         else:
-            # Split date range into chunks
-            date_chunks = self._chunk_date_range(startDate, endDate, max_days)
+            try:
+                span = (datetime.datetime.strptime(endDate, "%Y-%m-%d")
+                        - datetime.datetime.strptime(startDate, "%Y-%m-%d")).days + 1
+            except (TypeError, ValueError):
+                # Dates in another format cannot be sized, so the range is sent as is
+                date_chunks = [(startDate, endDate)]
+            else:
+                # Split date range into windows of about one page each
+                window_days = self._window_days(endpoint, params, limit, span, max_days)
+                date_chunks = self._chunk_date_range(startDate, endDate, window_days - 1)
+        
+        chunk_params_list = []
+        for chunk_start, chunk_end in date_chunks:
+            # Update date parameters
+            chunk_params = params.copy()
+            if chunk_start:
+                chunk_params['startDate'] = chunk_start
+            if chunk_end:
+                chunk_params['endDate'] = chunk_end
+            
+            # Set a high limit to get as much data as possible in one request
+            chunk_params['limit'] = limit
+            
+            # Always start with page 0 for each chunk
+            chunk_params['page'] = 0
+            
+            # Large token lists are split so each batch fits the endpoint's row limit
+            chunk_params_list.extend(self._batch_tokens(endpoint, chunk_params))
+        
+        return chunk_params_list
+    
+    def _plan_chunks(self, endpoint, params, max_days=None, custom_limit=None, align=None, checkpoint=None):
+        """Build the chunk parameters of a paginated fetch, replaying a checkpointed plan.
+        
+        Adaptive windows follow the row rates every fetch updates, so a rerun
+        of the same range may be split differently and none of its chunks
+        would match the checkpoint. With a checkpoint, the first plan for a
+        fetch is stored and reused by every rerun.
+        
+        Args:
+            endpoint (str): API endpoint path
+            params (dict): Query parameters including startDate and endDate
+            max_days (int, optional): Maximum number of days allowed between startDate and endDate
+            custom_limit (int, optional): Custom limit value. If None, uses endpoint-specific defaults.
+            align (str or int, optional): 'month' or a number of days per aligned bucket
+            checkpoint (Checkpoint, optional): Checkpoint holding the plans of earlier runs
+            
+        Returns:
+            list: Query parameters for each chunk, in chronological order
+        """
+        if checkpoint is None:
+            return self._prepare_chunk_params(endpoint, params, max_days, custom_limit, align)
+        
+        plan_params = dict(params or {}, max_days=max_days, custom_limit=custom_limit, align=align)
+        chunk_params_list = checkpoint.plan(endpoint, plan_params)
+        if chunk_params_list is None:
+            chunk_params_list = self._prepare_chunk_params(endpoint, params, max_days, custom_limit, align)
+            checkpoint.save_plan(endpoint, plan_params, chunk_params_list)
+        return chunk_params_list
+    
+    def _batch_tokens(self, endpoint, chunk_params):
+        """Split a chunk's token list into batches sized to the endpoint's row limit.
+        
+        The batch size is the number of tokens whose rows for the chunk's date
+        range fit in one short page (fewer rows than the limit, so no extra page
+        is requested to find the end), capped at MAX_BATCH_SIZE to keep query
+        strings short. Tokens are spread evenly over the batches.
+        
+        Args:
+            endpoint (str): API endpoint path
+            chunk_params (dict): Query parameters for one date chunk, including limit
+            
+        Returns:
+            list: Query parameters for each token batch (the chunk itself if no split is needed)
+        """
+        key, values = self._batch_values(chunk_params)
+        if key is None:
+            return [chunk_params]
+        
+        batch_size = MAX_BATCH_SIZE
+        try:
+            start = datetime.datetime.strptime(chunk_params['startDate'], "%Y-%m-%d")
+            end = datetime.datetime.strptime(chunk_params['endDate'], "%Y-%m-%d")
+        except (KeyError, TypeError, ValueError):
+            pass
+        else:
+            rows_per_token = ((end - start).days + 1) * self._row_rate(endpoint)
+            # A page holding exactly limit rows needs another request to find the end
+            batch_size = max(1, min(MAX_BATCH_SIZE, int((chunk_params['limit'] - 1) // rows_per_token)))
+        
+        if len(values) <= batch_size:
+            return [chunk_params]
+        # Spread the tokens evenly instead of leaving a small last batch
+        batches = -(-len(values) // batch_size)
+        bounds = [len(values) * i // batches for i in range(batches + 1)]
+        return [dict(chunk_params, **{key: ','.join(values[bounds[i]:bounds[i + 1]])})
+                for i in range(batches)]
+    
+    @staticmethod
+    def _batch_values(params):
+        """Return the token list parameter of a query and its values.
+        
+        Args:
+            params (dict): Query parameters
+            
+        Returns:
+            tuple: (key, list of values), or (None, None) if the query has no token list
+        """
+        key = next((k for k in BATCH_KEYS if params.get(k)), None)
+        if key is None:
+            return None, None
+        return key, [v.strip() for v in str(params[key]).split(',') if v.strip()]
+    
+    def _row_rate(self, endpoint):
+        """Return the expected rows per token per day of an endpoint.
+        
+        Args:
+            endpoint (str): API endpoint path
+            
+        Returns:
+            float: Rate learned from earlier chunks, or the endpoint's cadence (ROWS_PER_DAY)
+        """
+        rate = self.client.row_rates.rate(endpoint)
+        return rate if rate else ROWS_PER_DAY.get(endpoint, 1)
+    
+    def _window_days(self, endpoint, params, limit, span, max_days=None):
+        """Pick the date window that needs the fewest requests with one page each.
+        
+        Token-filtered queries weigh every split of the token list into even
+        batches against the longest window whose rows still fit one short page
+        (batch size x days x rows per token per day < limit), and keep the plan
+        with the fewest requests, preferring longer windows on ties. Unfiltered
+        queries use the rows per day observed on earlier calls, or
+        DEFAULT_CHUNK_DAYS until there is one. Underestimates cost extra
+        pages, never rows, because every chunk is still paged until a short page.
+        
+        Args:
+            endpoint (str): API endpoint path
+            params (dict): Query parameters including startDate and endDate
+            limit (int): Page size
+            span (int): Number of days from startDate to endDate, both included
+            max_days (int, optional): Maximum number of days allowed between startDate and endDate
+            
+        Returns:
+            int: Number of days per window, between 1 and MAX_CHUNK_DAYS
+        """
+        cap = MAX_CHUNK_DAYS if max_days is None else max(1, min(MAX_CHUNK_DAYS, max_days + 1))
+        # A page holding exactly limit rows needs another request to find the end
+        capacity = limit - 1
+        
+        _, values = self._batch_values(params)
+        if values is None:
+            rate = self.client.row_rates.rate(endpoint, per_token=False)
+            return max(1, min(cap, DEFAULT_CHUNK_DAYS if not rate else int(capacity // rate)))
+        
+        rate = self._row_rate(endpoint)
+        
+        best = None
+        for batches in range(-(-len(values) // MAX_BATCH_SIZE), len(values) + 1):
+            batch_size = -(-len(values) // batches)
+            days = min(cap, span, int(capacity // (batch_size * rate)))
+            if days < 1:
+                continue
+            plan = (batches * -(-span // days), -days)
+            if best is None or plan < best:
+                best = plan
+        return -best[1] if best else 1
+    
+    def _observe_chunk(self, endpoint, chunk_params, rows):
+        """Feed the size of a fetched chunk into the client's row rate estimates.
+        
+        Args:
+            endpoint (str): API endpoint path
+            chunk_params (dict): Query parameters of the chunk
+            rows (int): Number of rows the chunk returned
+        """
+        try:
+            start = datetime.datetime.strptime(chunk_params['startDate'], "%Y-%m-%d").date()
+            end = datetime.datetime.strptime(chunk_params['endDate'], "%Y-%m-%d").date()
+        except (KeyError, TypeError, ValueError):
+            return
+        # Days after today have no rows yet and would dilute the rate
+        end = min(end, datetime.date.today())
+        _, values = self._batch_values(chunk_params)
+        self.client.row_rates.observe(endpoint, rows, (end - start).days + 1,
+                                      None if values is None else len(values))
+    
+    def _paginated_request(self, method, endpoint, params=None, max_days=None, custom_limit=None,
+                           max_workers=None, stream=False, checkpoint=None, resume=False,
+                           align=None, deadline=None, failures=None):
+        """Make paginated requests to handle date ranges and custom pagination logic.
+        
+        This method handles two forms of pagination:
+        1. Date chunking: Splitting long date ranges into windows sized to fit about
+           one page, learned from earlier responses and capped by max_days
+        2. Offset-based pagination: Every page of a chunk is requested until a short page
+           is returned, with the remaining pages prefetched in parallel when the first
+           page reports the total item count
+        3. Token batching: Long token_id/symbol lists are split into batches whose rows
+           fit the endpoint's row limit, fetched alongside the date chunks
+        
+        Date chunks are fetched concurrently when more than one worker is allowed, but
+        the results are always merged in chronological chunk order. Progress is
+        reported to the client's instrumentation hooks.
+        
+        Chunks that fail after all retries are reported in the result's
+        "failed_chunks" list rather than silently dropped. With a checkpoint,
+        every chunk outcome is recorded on disk, and resume=True serves the
+        chunks completed by an earlier run from the checkpoint and only fetches
+        the failed or missing ones.
+        
+        A deadline bounds the whole call: requests only get the time left,
+        chunks still queued when it expires are failed without being sent,
+        and the combined response is then flagged with "partial": True.
+        
+        Args:
+            method (str): HTTP method (get, post, etc.)
+            endpoint (str): API endpoint path
+            params (dict): Query parameters including startDate and endDate
+            max_days (int, optional): Maximum number of days allowed between startDate and endDate.
+                If None, windows are only capped by MAX_CHUNK_DAYS.
+            custom_limit (int, optional): Custom limit value. If None, uses endpoint-specific defaults.
+            max_workers (int, optional): Maximum number of chunks (and pages per chunk)
+                fetched in parallel. If None, uses the client's max_workers setting.
+            stream (bool, optional): Return a generator of chunk responses instead of
+                one combined response
+            checkpoint (Checkpoint or str, optional): Checkpoint (or directory) recording
+                completed and failed chunks
+            resume (bool, optional): Skip chunks the checkpoint marks as completed
+            align (str or int, optional): Align chunks to canonical buckets ('month', or a
+                number of days counted from ALIGNMENT_EPOCH) and trim the rows outside
+                the requested range locally. Defaults to the client's chunk_alignment.
+            deadline (float, optional): Total time budget in seconds for the whole call.
+                If None, uses the client's deadline setting.
+            failures (list, optional): Receives a dict with params and error per chunk of
+                this call that failed, also when streaming
+            
+        Returns:
+            dict: Combined API response data, or a generator of chunk responses if stream is True
+        """
+        if isinstance(checkpoint, str):
+            checkpoint = Checkpoint(checkpoint)
+        deadline = Deadline.coerce(self.client.deadline if deadline is None else deadline)
+        
+        if failures is None:
+            failures = []
+        chunks = self._iter_paginated(method, endpoint, params, max_days, custom_limit, max_workers,
+                                      checkpoint, resume, failures, align, deadline)
+        if stream:
+            return chunks
+        
+        result = self._merge_responses(chunks)
+        if failures and isinstance(result, dict):
+            result["failed_chunks"] = failures
+            result["partial"] = True
+        return result
+    
+    def _iter_paginated(self, method, endpoint, params=None, max_days=None, custom_limit=None,
+                        max_workers=None, checkpoint=None, resume=False, failures=None,
+                        align=None, deadline=None):
+        """Yield the response of each date chunk in chronological order as it arrives.
+        
+        At most max_workers chunks are in flight at once, so a slow consumer
+        keeps memory bounded to a few chunks instead of the whole date range.
+        Failed chunks are skipped and reported through failures and the checkpoint.
         
+        Args:
+            method (str): HTTP method (get, post, etc.)
+            endpoint (str): API endpoint path
+            params (dict): Query parameters including startDate and endDate
+            max_days (int, optional): Maximum number of days allowed between startDate and endDate
+            custom_limit (int, optional): Custom limit value. If None, uses endpoint-specific defaults.
+            max_workers (int, optional): Maximum number of chunks (and pages per chunk)
+                fetched in parallel. If None, uses the client's max_workers setting.
+            checkpoint (Checkpoint, optional): Checkpoint recording chunk outcomes
+            resume (bool, optional): Serve chunks completed in the checkpoint from disk
+            failures (list, optional): Receives a dict with params and error per failed chunk
+            align (str or int, optional): Canonical chunk buckets ('month' or a number of days)
+            deadline (Deadline, optional): Time budget shared by every chunk
+            
+        Yields:
+            dict or list: API response data of one date chunk
+        """
+        if align is None:
+            align = self.client.chunk_alignment
+        chunk_params_list = self._plan_chunks(endpoint, params, max_days, custom_limit, align, checkpoint)
+        trim = None
+        if align and params and params.get('startDate') and params.get('endDate'):
+            # Aligned chunks may extend past the requested range, which is trimmed locally
+            trim = (params['startDate'], params['endDate'])
+        
+        if max_workers is None:
+            max_workers = self.client.max_workers
+        max_workers = max(1, max_workers)
+        chunk_workers = min(max_workers, len(chunk_params_list))
+        # Chunk and page requests share max_workers request slots
+        slots = threading.BoundedSemaphore(max_workers)
+        
+        instrumentation = self.client.instrumentation
+        fetch_id = next_fetch_id()
+        instrumentation.fetch_start(endpoint, len(chunk_params_list), fetch_id=fetch_id)
+        try:
+            if chunk_workers == 1:
+                for chunk_params in chunk_params_list:
+                    response, error = self._run_chunk(method, endpoint, chunk_params, max_workers,
+                                                      checkpoint, resume, deadline, slots)
+                    self._chunk_done(endpoint, chunk_params, response, error, failures, fetch_id)
+                    if response is not None:
+                        yield self._trim_response(response, trim)
+                return
+            
+            with ThreadPoolExecutor(max_workers=chunk_workers) as executor:
+                # Futures are consumed in chunk order, and a new chunk is only submitted
+                # once one has been handed to the caller
+                remaining = iter(chunk_params_list)
+                pending = deque(
+                    (chunk_params, executor.submit(self._run_chunk, method, endpoint, chunk_params,
+                                                   max_workers, checkpoint, resume, deadline, slots))
+                    for chunk_params in islice(remaining, chunk_workers)
+                )
+                try:
+                    while pending:
+                        chunk_params, future = pending.popleft()
+                        response, error = future.result()
+                        for next_params in islice(remaining, 1):
+                            pending.append((next_params, executor.submit(
+                                self._run_chunk, method, endpoint, next_params, max_workers,
+                                checkpoint, resume, deadline, slots)))
+                        self._chunk_done(endpoint, chunk_params, response, error, failures, fetch_id)
+                        if response is not None:
+                            yield self._trim_response(response, trim)
+                finally:
+                    # Stop queued chunks if the caller abandons the generator early
+                    for _, future in pending:
+                        future.cancel()
+        finally:
+            instrumentation.fetch_end(endpoint, fetch_id=fetch_id)
+    
+    def _run_chunk(self, method, endpoint, chunk_params, max_workers=1, checkpoint=None, resume=False,
+                   deadline=None, slots=None):
+        """Fetch a chunk (or load it from the checkpoint) and record its outcome.
+        
+        Args:
+            method (str): HTTP method (get, post, etc.)
+            endpoint (str): API endpoint path
+            chunk_params (dict): Query parameters for this chunk, including limit and page
+            max_workers (int, optional): Maximum number of pages fetched in parallel
+            checkpoint (Checkpoint, optional): Checkpoint recording chunk outcomes
+            resume (bool, optional): Serve the chunk from the checkpoint if it was completed
+            deadline (Deadline, optional): Time budget; the chunk fails without a request
+                once it has expired
+            slots (threading.Semaphore, optional): Request slots shared with the other chunks
+            
+        Returns:
+            tuple: (response, error), with response None if the chunk failed
+        """
+        if checkpoint is not None and resume and checkpoint.status(endpoint, chunk_params) == "done":
+            return checkpoint.load(endpoint, chunk_params), None
+        
+        try:
+            if deadline is not None:
+                deadline.check()
+            response = self._fetch_chunk(method, endpoint, chunk_params, max_workers, deadline, slots)
+        except Exception as e:
+            if checkpoint is not None:
+                checkpoint.mark_failed(endpoint, chunk_params, e)
+            return None, e
+        
+        if checkpoint is not None:
+            checkpoint.mark_done(endpoint, chunk_params, response)
+        return response, None
+    
+    def _chunk_done(self, endpoint, chunk_params, response, error=None, failures=None, fetch_id=None):
+        """Report a finished chunk, learn its row rate and persist it to the local store.
+        
+        Args:
+            endpoint (str): API endpoint path
+            chunk_params (dict): Query parameters of the chunk
+            response (dict or list): Chunk response, or None if the chunk failed
+            error (Exception, optional): Error that made the chunk fail
+            failures (list, optional): Receives a dict with params and error if the chunk failed
+            fetch_id (int, optional): Identifier of the fetch, passed to the instrumentation
+        """
+        rows = None if response is None else len(self._response_items(response))
+        self.client.instrumentation.chunk_done(endpoint, chunk_params, rows, fetch_id=fetch_id)
+        if response is not None:
+            self._observe_chunk(endpoint, chunk_params, rows)
+            self._persist(endpoint, response)
+        elif failures is not None:
+            failures.append({"params": chunk_params, "error": f"{type(error).__name__}: {error}"})
+    
+    def _fetch_chunk(self, method, endpoint, chunk_params, max_workers=1, deadline=None, slots=None):
+        """Fetch every page of a single date chunk.
+        
+        Pages are requested until a short page (fewer items than the limit) is
+        returned. If the first page reports the total number of items, the
+        remaining pages (at most MAX_PAGES_PER_CHUNK) are prefetched in
+        parallel instead, holding one of the shared request slots each. A
+        page that still fails after retries fails the whole chunk, so no
+        chunk is ever returned with holes.
+        
+        Args:
+            method (str): HTTP method (get, post, etc.)
+            endpoint (str): API endpoint path
+            chunk_params (dict): Query parameters for this chunk, including limit and page
+            max_workers (int, optional): Maximum number of pages fetched in parallel
+            deadline (Deadline, optional): Time budget shared by every page request
+            slots (threading.Semaphore, optional): Request slots bounding the requests in
+                flight across all chunks of the call
+            
+        Returns:
+            dict or list: Combined API response data for the chunk
+        """
+        limit = chunk_params['limit']
+        
+        first_page = self._fetch_page(method, endpoint, chunk_params, deadline, slots)
+        
+        first_items = self._response_items(first_page)
+        if len(first_items) < limit:
+            return first_page
+        
+        pages = [first_page]
+        total = self._response_total(first_page)
+        
+        if total is not None and max_workers > 1:
+            # The total is known, so all remaining pages can be requested at once
+            # A bogus total must not fan out into an unbounded number of requests
+            page_count = min(-(-total // limit), MAX_PAGES_PER_CHUNK)
+            page_params_list = []
+            for page in range(chunk_params['page'] + 1, chunk_params['page'] + page_count):
+                page_params = chunk_params.copy()
+                page_params['page'] = page
+                page_params_list.append(page_params)
+            
+            with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(page_params_list)))) as executor:
+                pages.extend(executor.map(
+                    lambda page_params: self._fetch_page(method, endpoint, page_params, deadline, slots),
+                    page_params_list
+                ))
+            return self._merge_responses(pages)
+        
+        # Otherwise walk the pages until a short (or repeated) page is returned
+        previous_items = first_items
+        for page in range(chunk_params['page'] + 1, chunk_params['page'] + MAX_PAGES_PER_CHUNK):
+            page_params = chunk_params.copy()
+            page_params['page'] = page
+            response = self._fetch_page(method, endpoint, page_params, deadline, slots)
+            
+            items = self._response_items(response)
+            # Guard against the API ignoring the page parameter and repeating itself
+            if items == previous_items:
+                break
+            
+            pages.append(response)
+            if len(items) < limit:
+                break
+            previous_items = items
+        
+        return self._merge_responses(pages)
+    
+    def _fetch_page(self, method, endpoint, page_params, deadline=None, slots=None):
+        """Fetch a single page once a request slot is free.
+        
+        Args:
+            method (str): HTTP method (get, post, etc.)
+            endpoint (str): API endpoint path
+            page_params (dict): Query parameters for this page
+            deadline (Deadline, optional): Time budget of the call
+            slots (threading.Semaphore, optional): Bounds the number of requests in flight
+            
+        Returns:
+            dict or list: API response data
+        """
+        if slots is None:
+            return self._request(method, endpoint, page_params, deadline=deadline)
+        with slots:
+            return self._request(method, endpoint, page_params, deadline=deadline)
+    
+    @staticmethod
+    def _trim_response(response, date_range):
+        """Drop the rows of an aligned chunk that fall outside the requested dates.
+        
+        Args:
+            response (dict or list): API response data of one chunk
+            date_range (tuple): (startDate, endDate) to keep, or None to keep every row
+            
+        Returns:
+            dict or list: Response data without the rows outside the range
+        """
+        if date_range is None:
+            return response
+        startDate, endDate = date_range
+        
+        def in_range(row):
+            date = row.get('DATE') if isinstance(row, dict) else None
+            return not isinstance(date, str) or startDate <= date[:10] <= endDate
+        
+        if isinstance(response, dict) and isinstance(response.get("data"), list):
+            return dict(response, data=[row for row in response["data"] if in_range(row)])
+        if isinstance(response, list):
+            return [row for row in response if in_range(row)]
+        return response
+    
+    @staticmethod
+    def _response_items(response):
+        """Return the list of data items contained in a response.
+        
+        Args:
+            response (dict or list): API response data
+            
+        Returns:
+            list: Data items in the response
+        """
+        if isinstance(response, dict):
+            data_items = response.get("data", [])
+            return data_items if isinstance(data_items, list) else [data_items]
+        if isinstance(response, list):
+            return response
+        return [response]
+    
+    @staticmethod
+    def _response_total(response):
+        """Return the total item count reported by a response, if any.
+        
+        Args:
+            response (dict or list): API response data
+            
+        Returns:
+            int: Total number of items across all pages, or None if not reported
+        """
+        if not isinstance(response, dict):
+            return None
+        for key in TOTAL_COUNT_KEYS:
+            value = response.get(key)
+            if isinstance(value, int) and not isinstance(value, bool):
+                return value
+        return None
+    
+    def _merge_responses(self, responses):
+        """Combine chunk responses into a single response.
+        
+        Responses are merged in the order given, so later chunks take precedence
+        for metadata keys and data items keep their chronological order. Rows
+        repeated across chunks or pages are dropped (see _dedup_rows).
+        
+        Args:
+            responses (list): Chunk responses in chunk order (None for failed chunks)
+            
+        Returns:
+            dict: Combined API response data
+        """
         # Initialize combined results
         all_data = []
         combined_meta = {}
         
-        # Calculate total iterations for progress bar
-        total_iterations = len(date_chunks)
-        
-        # Setup progress bar
-        with tqdm(total=total_iterations, desc=f"Fetching {endpoint} data", unit="chunk") as pbar:
-            # Process each date chunk
-            for chunk_start, chunk_end in date_chunks:
-                # Update date parameters
-                chunk_params = params.copy()
-                if chunk_start:
-                    chunk_params['startDate'] = chunk_start
-                if chunk_end:
-                    chunk_params['endDate'] = chunk_end
-                
-                # Set a high limit to get as much data as possible in one request
-                chunk_params['limit'] = limit
-                
-                # Always start with page 0 for each chunk
-                chunk_params['page'] = 0
-                
-                # Try to get data for this date chunk, but handle errors gracefully
-                try:
-                    response = self._request(method, endpoint, chunk_params)
-                    
-                    # Extract and store the data
-                    if isinstance(response, dict):
-                        if "data" in response:
-                            data_items = response["data"]
-                            if isinstance(data_items, list):
-                                all_data.extend(data_items)
-                            else:
-                                all_data.append(data_items)
-                        
-                        # Store metadata for later if it exists
-                        for key, value in response.items():
-                            if key != "data":
-                                combined_meta[key] = value
+        for response in responses:
+            if response is None:
+                continue
+            
+            # Extract and store the data
+            if isinstance(response, dict):
+                if "data" in response:
+                    data_items = response["data"]
+                    if isinstance(data_items, list):
+                        all_data.extend(data_items)
                     else:
-                        # If the response is not a dict with a data field, append it directly
-                        if isinstance(response, list):
-                            all_data.extend(response)
-                        else:
-                            all_data.append(response)
-                except Exception as e:
-                    # Silently skip this chunk and continue with the next one
-                    # No need to print warnings as they would clutter the user's output
-                    pass
+                        all_data.append(data_items)
                 
-                # Update progress bar
-                pbar.update(1)
+                # Store metadata for later if it exists
+                for key, value in response.items():
+                    if key != "data":
+                        combined_meta[key] = value
+            else:
+                # If the response is not a dict with a data field, append it directly
+                if isinstance(response, list):
+                    all_data.extend(response)
+                else:
+                    all_data.append(response)
+        
+        all_data = self._dedup_rows(all_data)
         
         # Check if we got any data at all
         if not all_data:
@@ -220,24 +971,255 @@ class BaseEndpoint:
             # Otherwise, return just the data array
             return all_data
     
-    def to_dataframe(self, data):
-        """Convert API response data to a pandas DataFrame.
+    @staticmethod
+    def _dedup_rows(rows):
+        """Drop rows sharing TOKEN_ID and DATE with an earlier row.
+        
+        The first occurrence keeps its position and takes the values of the
+        last one. Rows without both keys are kept as they are.
+        
+        Args:
+            rows (list): Data items in merge order
+            
+        Returns:
+            list: Data items without duplicates
+        """
+        result = []
+        positions = {}
+        for row in rows:
+            try:
+                key = (row[DEDUP_KEYS[0]], row[DEDUP_KEYS[1]])
+            except (KeyError, TypeError):
+                result.append(row)
+                continue
+            if key in positions:
+                result[positions[key]] = row
+            else:
+                positions[key] = len(result)
+                result.append(row)
+        return result
+    
+    def _persist(self, endpoint, result):
+        """Write paginated results into the client's local store, if one is configured.
+        
+        Args:
+            endpoint (str): API endpoint path
+            result (dict or list): API response data of a date chunk
+        """
+        store = self.client.store
+        if store is not None:
+            store.write(endpoint, self._response_items(result))
+    
+    def _plan_sync(self, endpoint, params, max_days=None):
+        """Work out which chunk requests an incremental sync still has to make.
+        
+        The requested range is split per token into the gaps missing from the
+        client's sync store. Tokens with identical gaps are fetched together in
+        one comma-separated query.
+        
+        Args:
+            endpoint (str): API endpoint path
+            params (dict): Query parameters including token_id, startDate and endDate
+            max_days (int, optional): Maximum number of days allowed between startDate and endDate
+            
+        Returns:
+            list: (token_ids, chunk_params) tuples to fetch
+        """
+        store = self.client.sync_store
+        if store is None:
+            raise ValueError("Incremental sync requires a client created with sync_store=...")
+        if not params.get('token_id') or not params.get('startDate') or not params.get('endDate'):
+            raise ValueError("Incremental sync requires token_id, startDate and endDate")
+        
+        token_ids = [t.strip() for t in str(params['token_id']).split(',') if t.strip()]
+        
+        groups = {}
+        for token_id in token_ids:
+            for gap in store.missing(endpoint, token_id, params['startDate'], params['endDate']):
+                groups.setdefault(gap, []).append(token_id)
+        
+        units = []
+        for (gap_start, gap_end), group_ids in sorted(groups.items()):
+            gap_params = dict(params, token_id=','.join(group_ids), startDate=gap_start, endDate=gap_end)
+            for chunk_params in self._prepare_chunk_params(endpoint, gap_params, max_days):
+                # Token batches only cover the IDs they were asked for
+                units.append((chunk_params['token_id'].split(','), chunk_params))
+        return units
+    
+    def _apply_sync(self, endpoint, params, units, results):
+        """Merge fetched sync chunks into the sync store and return the requested range.
+        
+        Failed chunks are left uncovered so the next sync retries them, and
+        are reported in the result's "failed_chunks" list with "partial": True,
+        like a paginated get. Today's rows are stored but never marked as
+        covered, because more bars may still arrive for the current day.
+        
+        Args:
+            endpoint (str): API endpoint path
+            params (dict): Query parameters including token_id, startDate and endDate
+            units (list): (token_ids, chunk_params) tuples returned by _plan_sync
+            results (list): (response, error) tuples of the chunks in the same order,
+                with response None for failed chunks
+            
+        Returns:
+            dict: Stored rows for every requested token within the date range
+        """
+        store = self.client.sync_store
+        last_complete = (datetime.date.today() - datetime.timedelta(days=1)).isoformat()
+        
+        failures = []
+        for (group_ids, chunk_params), (response, error) in zip(units, results):
+            if response is None:
+                failures.append({"params": chunk_params, "error": f"{type(error).__name__}: {error}"})
+                continue
+            
+            rows_by_token = {token_id: [] for token_id in group_ids}
+            for row in self._response_items(response):
+                rows_by_token.setdefault(str(row.get('TOKEN_ID')), []).append(row)
+            
+            covered_end = min(chunk_params['endDate'], last_complete)
+            if covered_end < chunk_params['startDate']:
+                covered_end = None
+            for token_id in group_ids:
+                store.merge(endpoint, token_id, rows_by_token[token_id],
+                            chunk_params['startDate'], covered_end)
+        
+        data = []
+        for token_id in [t.strip() for t in str(params['token_id']).split(',') if t.strip()]:
+            data.extend(store.records(endpoint, token_id, params['startDate'], params['endDate']))
+        result = {"data": data}
+        if failures:
+            result["failed_chunks"] = failures
+            result["partial"] = True
+        return result
+    
+    def _sync_request(self, method, endpoint, params, max_days=None, max_workers=None):
+        """Fetch only the date ranges missing from the client's sync store.
+        
+        Args:
+            method (str): HTTP method (get, post, etc.)
+            endpoint (str): API endpoint path
+            params (dict): Query parameters including token_id, startDate and endDate
+            max_days (int, optional): Maximum number of days allowed between startDate and endDate
+            max_workers (int, optional): Maximum number of chunks fetched in parallel.
+                If None, uses the client's max_workers setting.
+            
+        Returns:
+            dict: Stored rows for every requested token within the date range, with
+            "failed_chunks" and "partial": True if some ranges could not be fetched
+        """
+        units = self._plan_sync(endpoint, params, max_days)
+        
+        if max_workers is None:
+            max_workers = self.client.max_workers
+        max_workers = max(1, max_workers)
+        slots = threading.BoundedSemaphore(max_workers)
+        
+        if not units:
+            results = []
+        elif max_workers == 1 or len(units) == 1:
+            results = [self._run_chunk(method, endpoint, chunk_params, max_workers, slots=slots)
+                       for _, chunk_params in units]
+        else:
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(units))) as executor:
+                results = list(executor.map(
+                    lambda unit: self._run_chunk(method, endpoint, unit[1], max_workers, slots=slots),
+                    units
+                ))
+        
+        return self._apply_sync(endpoint, params, units, results)
+    
+    def to_dataframe(self, data, backend=None):
+        """Convert API response data to a DataFrame.
+        
+        Rows are built column by column using the endpoint's schema, so DATE
+        becomes datetime64, token symbols and names become categoricals and
+        numeric columns get explicit dtypes. Results are sorted by TOKEN_ID
+        and DATE when those columns are present. The arrow and polars backends
+        build Arrow buffers directly from the decoded JSON.
         
         Args:
             data (dict): API response data
+            backend (str, optional): 'pandas', 'arrow' (pyarrow.Table) or 'polars'.
+                If None, uses the client's dataframe_backend setting.
             
         Returns:
-            pandas.DataFrame: DataFrame containing the response data
+            pandas.DataFrame, pyarrow.Table or polars.DataFrame: Frame containing the response data
         """
-        # Implementation depends on the specific structure of each endpoint's response
-        # This is a placeholder to be overridden by subclasses
+        if backend is None:
+            backend = self.client.dataframe_backend
+        
         if isinstance(data, list):
-            if not data:  # Handle empty list
-                return pd.DataFrame()
-            return pd.DataFrame(data)
+            rows = data
         elif isinstance(data, dict) and "data" in data and isinstance(data["data"], list):
-            if not data["data"]:  # Handle empty data array
-                return pd.DataFrame()
-            return pd.DataFrame(data["data"])
+            rows = data["data"]
         else:
-            return pd.DataFrame([data])
+            rows = [data]
+        
+        if not all(isinstance(row, dict) for row in rows):
+            if backend == 'pandas':
+                return pd.DataFrame(rows)
+            rows = [row if isinstance(row, dict) else {"value": row} for row in rows]
+        return build_output(rows, self.schema, backend)
+
+class PaginatedEndpoint(BaseEndpoint):
+    """Base class for endpoints whose results are fetched in date chunks.
+    
+    Besides ``get``, which combines every chunk into one response, these
+    endpoints can stream their results chunk by chunk, so memory stays
+    bounded by a few chunks and processing can start before the download
+    finishes.
+    """
+    
+    def iter_chunks(self, backend=None, **kwargs):
+        """Yield the data of each date chunk as a DataFrame as soon as it arrives.
+        
+        Args:
+            backend (str, optional): 'pandas', 'arrow' or 'polars'. If None, uses the
+                client's dataframe_backend setting.
+            **kwargs: Arguments to pass to the get method
+            
+        Yields:
+            pandas.DataFrame, pyarrow.Table or polars.DataFrame: Data of one date chunk,
+            in chronological order
+        """
+        for response in self.get(stream=True, **kwargs):
+            yield self.to_dataframe(response, backend)
+    
+    def iter_records(self, **kwargs):
+        """Yield data rows one by one as their date chunk arrives.
+        
+        Args:
+            **kwargs: Arguments to pass to the get method
+            
+        Yields:
+            dict: A single data row, in chronological chunk order
+        """
+        for response in self.get(stream=True, **kwargs):
+            yield from self._response_items(response)
+
+class BatchedEndpoint(PaginatedEndpoint):
+    """Base class for paginated endpoints that accept a comma-separated token_id list.
+    
+    ``load`` fetches one token, but load calls made at about the same time
+    with the same other arguments are merged by the client's BatchLoader
+    into a single request, so N tokens cost one request instead of N.
+    """
+    
+    def _load_key(self, kwargs):
+        # Only loads of the same endpoint with equal other arguments share a batch
+        return type(self).__name__, tuple(sorted((k, str(v)) for k, v in kwargs.items()))
+    
+    def load(self, token_id, **kwargs):
+        """Get the data of a single token, batched with concurrent load calls.
+        
+        Args:
+            token_id (str or int): Token ID
+            **kwargs: Other arguments to pass to the get method (not symbol or token_name)
+            
+        Returns:
+            dict: Response of the combined request, holding only this token's rows
+        """
+        return self.client.loader.load(
+            self._load_key(kwargs), str(token_id),
+            lambda token_ids: self.get(token_id=",".join(token_ids), **kwargs))
@@ -0,0 +1,194 @@
+import datetime
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+# Default location of the on-disk response cache
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "tmai_api", "responses.sqlite")
+
+# TTL in seconds for responses that may still change, per endpoint
+DEFAULT_TTLS = {
+    'tokens': 24 * 3600,
+    'ai-reports': 3600,
+    'hourly-ohlcv': 300,
+    'default': 900
+}
+
+class ResponseCache:
+    """Persistent, size-bounded LRU cache for API responses.
+    
+    Responses are keyed by endpoint plus normalised query parameters and
+    stored compressed in a SQLite file. Chunks whose endDate is older than
+    ``historical_days`` can no longer change and are kept until evicted;
+    everything else expires after the endpoint's TTL.
+    """
+    
+    def __init__(self, path=None, max_bytes=512 * 1024 * 1024, historical_days=2, ttls=None):
+        """Initialize the response cache.
+        
+        Args:
+            path (str, optional): SQLite file to store responses in. Defaults to
+                ~/.cache/tmai_api/responses.sqlite
+            max_bytes (int, optional): Maximum total size of stored (compressed) responses
+            historical_days (int, optional): Chunks ending more than this many days ago are
+                cached indefinitely
+            ttls (dict, optional): Per-endpoint TTLs in seconds for recent data, merged over
+                DEFAULT_TTLS
+        """
+        self.path = path or DEFAULT_CACHE_PATH
+        self.max_bytes = max_bytes
+        self.historical_days = historical_days
+        self.ttls = dict(DEFAULT_TTLS, **(ttls or {}))
+        
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, endpoint TEXT, value BLOB, size INTEGER, "
+            "expires REAL, accessed REAL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)")
+        self._db.commit()
+    
+    @staticmethod
+    def make_key(endpoint, params):
+        """Build the cache key for a request.
+        
+        Args:
+            endpoint (str): API endpoint path
+            params (dict): Query parameters
+        
+        Returns:
+            str: Stable hash of the endpoint and normalised parameters
+        """
+        normalised = sorted((str(k), str(v)) for k, v in (params or {}).items() if v is not None)
+        raw = json.dumps([endpoint, normalised], separators=(",", ":"))
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+    
+    def ttl_for(self, endpoint, params):
+        """Return how long a response may be cached.
+        
+        Args:
+            endpoint (str): API endpoint path
+            params (dict): Query parameters
+        
+        Returns:
+            float: TTL in seconds, or None if the response never expires
+        """
+        end_date = (params or {}).get('endDate')
+        if end_date:
+            try:
+                end = datetime.datetime.strptime(str(end_date)[:10], "%Y-%m-%d").date()
+            except ValueError:
+                end = None
+            cutoff = datetime.date.today() - datetime.timedelta(days=self.historical_days)
+            if end is not None and end < cutoff:
+                return None
+        return self.ttls.get(endpoint, self.ttls['default'])
+    
+    def get(self, endpoint, params):
+        """Look up a cached response.
+        
+        Args:
+            endpoint (str): API endpoint path
+            params (dict): Query parameters
+        
+        Returns:
+            dict or list: Cached response data, or None on a miss
+        """
+        key = self.make_key(endpoint, params)
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT value, expires FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or (row[1] is not None and row[1] < now):
+                self.misses += 1
+                return None
+            self._db.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+            self._db.commit()
+            self.hits += 1
+        return json.loads(zlib.decompress(row[0]))
+    
+    def set(self, endpoint, params, value):
+        """Store a response and evict least recently used entries if needed.
+        
+        Args:
+            endpoint (str): API endpoint path
+            params (dict): Query parameters
+            value (dict or list): Response data
+        """
+        key = self.make_key(endpoint, params)
+        blob = zlib.compress(json.dumps(value, separators=(",", ":")).encode("utf-8"))
+        if len(blob) > self.max_bytes:
+            return
+        
+        ttl = self.ttl_for(endpoint, params)
+        now = time.time()
+        expires = None if ttl is None else now + ttl
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses (key, endpoint, value, size, expires, accessed) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, endpoint, blob, len(blob), expires, now)
+            )
+            self._evict()
+            self._db.commit()
+    
+    def _evict(self):
+        """Drop expired entries, then least recently used ones until under max_bytes."""
+        self._db.execute("DELETE FROM responses WHERE expires IS NOT NULL AND expires < ?", (time.time(),))
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        
+        for key, size in self._db.execute(
+                "SELECT key, size FROM responses ORDER BY accessed").fetchall():
+            self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self.evictions += 1
+            total -= size
+            if total <= self.max_bytes:
+                break
+    
+    def clear(self):
+        """Remove every cached response."""
+        with self._lock:
+            self._db.execute("DELETE FROM responses")
+            self._db.commit()
+    
+    def stats(self):
+        """Return hit/miss statistics and the current cache size.
+        
+        Returns:
+            dict: Counter values and storage usage
+        """
+        with self._lock:
+            entries, size = self._db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "entries": entries,
+                "bytes": size,
+            }
+    
+    def close(self):
+        """Close the underlying SQLite connection."""
+        with self._lock:
+            self._db.close()
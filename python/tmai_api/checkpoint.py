@@ -0,0 +1,184 @@
+import gzip
+import json
+import os
+import threading
+import time
+
+from tmai_api.cache import ResponseCache
+
+class Checkpoint:
+    """Record of completed and failed chunks for resumable bulk backfills.
+    
+    Chunk outcomes are appended to ``<path>/checkpoint.jsonl`` (the last entry
+    for a chunk wins) and the data of completed chunks is kept in
+    ``<path>/chunks/<key>.json.gz``. Re-running a fetch with ``resume=True``
+    serves completed chunks from disk and only requests the rest.
+    
+    The chunk plan of every fetch is kept in ``<path>/plans/<key>.json``, so
+    a rerun splits the range into the same chunks even after the client has
+    learned different row rates.
+    """
+    
+    def __init__(self, path):
+        """Initialize the checkpoint.
+        
+        Args:
+            path (str): Directory holding the checkpoint log and chunk data
+        """
+        self.path = path
+        os.makedirs(os.path.join(path, "chunks"), exist_ok=True)
+        os.makedirs(os.path.join(path, "plans"), exist_ok=True)
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._replay()
+    
+    @property
+    def _log_path(self):
+        return os.path.join(self.path, "checkpoint.jsonl")
+    
+    def _chunk_path(self, key):
+        return os.path.join(self.path, "chunks", f"{key}.json.gz")
+    
+    def _plan_path(self, key):
+        return os.path.join(self.path, "plans", f"{key}.json")
+    
+    def _replay(self):
+        if not os.path.exists(self._log_path):
+            return
+        with open(self._log_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # A partially written last line from an interrupted run
+                    continue
+                self._entries[entry["key"]] = entry
+    
+    def _append(self, entry):
+        with self._lock:
+            self._entries[entry["key"]] = entry
+            with open(self._log_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, separators=(",", ":")) + "\n")
+    
+    @staticmethod
+    def key(endpoint, params):
+        """Build the checkpoint key of a chunk.
+        
+        Args:
+            endpoint (str): API endpoint path
+            params (dict): Query parameters of the chunk
+        
+        Returns:
+            str: Stable hash of the endpoint and parameters
+        """
+        return ResponseCache.make_key(endpoint, params)
+    
+    def status(self, endpoint, params):
+        """Return the recorded outcome of a chunk.
+        
+        Args:
+            endpoint (str): API endpoint path
+            params (dict): Query parameters of the chunk
+        
+        Returns:
+            str: "done", "failed", or None if the chunk has not been attempted
+        """
+        entry = self._entries.get(self.key(endpoint, params))
+        return entry["status"] if entry else None
+    
+    def load(self, endpoint, params):
+        """Load the stored data of a completed chunk.
+        
+        Args:
+            endpoint (str): API endpoint path
+            params (dict): Query parameters of the chunk
+        
+        Returns:
+            dict or list: Chunk response data
+        """
+        with gzip.open(self._chunk_path(self.key(endpoint, params)), "rt", encoding="utf-8") as f:
+            return json.load(f)
+    
+    def plan(self, endpoint, params):
+        """Return the chunk plan stored for a fetch.
+        
+        Args:
+            endpoint (str): API endpoint path
+            params (dict): Parameters of the whole fetch
+        
+        Returns:
+            list: Query parameters of every chunk, or None if no plan was stored
+        """
+        try:
+            with open(self._plan_path(self.key(endpoint, params)), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+    
+    def save_plan(self, endpoint, params, chunk_params_list):
+        """Store the chunk plan of a fetch so reruns request the same chunks.
+        
+        Args:
+            endpoint (str): API endpoint path
+            params (dict): Parameters of the whole fetch
+            chunk_params_list (list): Query parameters of every chunk
+        """
+        path = self._plan_path(self.key(endpoint, params))
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(chunk_params_list, f, separators=(",", ":"))
+        os.replace(tmp_path, path)
+    
+    def mark_done(self, endpoint, params, response):
+        """Store a completed chunk.
+        
+        Args:
+            endpoint (str): API endpoint path
+            params (dict): Query parameters of the chunk
+            response (dict or list): Chunk response data
+        """
+        key = self.key(endpoint, params)
+        path = self._chunk_path(key)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+            json.dump(response, f, separators=(",", ":"))
+        os.replace(tmp_path, path)
+        self._append({"key": key, "endpoint": endpoint, "params": params, "status": "done",
+                      "time": time.time()})
+    
+    def mark_failed(self, endpoint, params, error):
+        """Record a failed chunk together with its error.
+        
+        Args:
+            endpoint (str): API endpoint path
+            params (dict): Query parameters of the chunk
+            error (Exception or str): Error that made the chunk fail
+        """
+        if isinstance(error, Exception):
+            error = f"{type(error).__name__}: {error}"
+        self._append({"key": self.key(endpoint, params), "endpoint": endpoint, "params": params,
+                      "status": "failed", "error": error, "time": time.time()})
+    
+    def failed(self, endpoint=None):
+        """Return the chunks whose last attempt failed.
+        
+        Args:
+            endpoint (str, optional): Only report chunks of this endpoint
+        
+        Returns:
+            list: Dicts with endpoint, params and error
+        """
+        with self._lock:
+            return [{"endpoint": e["endpoint"], "params": e["params"], "error": e.get("error")}
+                    for e in self._entries.values()
+                    if e["status"] == "failed" and endpoint in (None, e["endpoint"])]
+    
+    def summary(self):
+        """Count chunks per outcome.
+        
+        Returns:
+            dict: Number of "done" and "failed" chunks
+        """
+        with self._lock:
+            statuses = [e["status"] for e in self._entries.values()]
+        return {"done": statuses.count("done"), "failed": statuses.count("failed")}
@@ -0,0 +1,222 @@
+import argparse
+import csv
+import os
+import pickle
+import sys
+import time
+
+import requests
+
+from tmai_api.checkpoint import Checkpoint
+from tmai_api.client import TokenMetricsClient
+from tmai_api.instrumentation import MetricsCollector, TqdmProgress
+
+# Endpoints the backfill can hydrate, mapped to (client attribute, takes a token universe)
+BACKFILL_ENDPOINTS = {
+    'hourly-ohlcv': ('hourly_ohlcv', True),
+    'daily-ohlcv': ('daily_ohlcv', True),
+    'trader-grades': ('trader_grades', True),
+    'investor-grades': ('investor_grades', True),
+    'trading-signals': ('trading_signals', True),
+    'market-metrics': ('market_metrics', False),
+    'trader-indices': ('trader_indices', False)
+}
+
+# Column names recognised as the token column of a CSV universe file
+UNIVERSE_COLUMNS = ('TOKEN_ID', 'token_id', 'id', 'SYMBOL', 'symbol', 'TOKEN_SYMBOL')
+
+def load_universe(path):
+    """Load a token universe from a pickle, CSV or plain text file.
+    
+    Pickles may hold a list, a pandas Series or a DataFrame with a TOKEN_ID
+    column. CSV files use their TOKEN_ID/token_id/symbol column, or the first
+    column if none is found. Text files hold one token per line.
+    
+    Args:
+        path (str): Universe file
+    
+    Returns:
+        list: Token IDs or symbols as strings, in file order and without duplicates
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension in ('.pkl', '.pickle'):
+        with open(path, 'rb') as f:
+            universe = pickle.load(f)
+        if hasattr(universe, 'columns'):
+            universe = universe['TOKEN_ID'] if 'TOKEN_ID' in universe.columns else universe.iloc[:, 0]
+        values = list(universe)
+    elif extension == '.csv':
+        with open(path, newline='', encoding='utf-8') as f:
+            rows = list(csv.reader(f))
+        header = rows[0] if rows else []
+        column = next((header.index(name) for name in UNIVERSE_COLUMNS if name in header), None)
+        if column is None:
+            # No known header: the first column holds the tokens, header or not
+            column = 0
+        else:
+            rows = rows[1:]
+        values = [row[column] for row in rows if len(row) > column]
+    else:
+        with open(path, encoding='utf-8') as f:
+            values = f.read().replace(',', '\n').splitlines()
+    
+    tokens = (str(value).strip() for value in values)
+    return list(dict.fromkeys(token for token in tokens if token and not token.startswith('#')))
+
+def build_parser():
+    """Build the tmai-backfill argument parser.
+    
+    Returns:
+        argparse.ArgumentParser: Configured parser
+    """
+    parser = argparse.ArgumentParser(
+        prog='tmai-backfill',
+        description="Hydrate a local Parquet store with Token Metrics data for a token universe."
+    )
+    parser.add_argument('--endpoints', required=True,
+                        help="Comma-separated endpoints: " + ", ".join(BACKFILL_ENDPOINTS))
+    parser.add_argument('--universe',
+                        help="Token universe file (.pkl, .csv or one token ID/symbol per line)")
+    parser.add_argument('--start', required=True, help="Start date in YYYY-MM-DD format")
+    parser.add_argument('--end', required=True, help="End date in YYYY-MM-DD format")
+    parser.add_argument('--store', required=True, help="Directory of the local Parquet store")
+    parser.add_argument('--api-key', default=os.environ.get('TMAI_API_KEY'),
+                        help="API key (defaults to the TMAI_API_KEY environment variable)")
+    parser.add_argument('--workers', type=int, default=4, help="Date chunks fetched in parallel")
+    parser.add_argument('--rate-limit', type=float, default=None,
+                        help="Maximum sustained requests per second")
+    parser.add_argument('--max-retries', type=int, default=3,
+                        help="Retries for 429/5xx responses and connection errors")
+    parser.add_argument('--timeout', type=float, default=60, help="Request timeout in seconds")
+    parser.add_argument('--checkpoint', default=None,
+                        help="Checkpoint directory (defaults to <store>/_checkpoint)")
+    parser.add_argument('--resume', action='store_true',
+                        help="Skip chunks completed by a previous run and retry only failed ones")
+    # A store_true/store_false pair sharing one dest, since BooleanOptionalAction needs Python 3.9
+    parser.add_argument('--progress', dest='progress', action='store_true', default=None,
+                        help="Show progress bars (default: only when stderr is a terminal)")
+    parser.add_argument('--no-progress', dest='progress', action='store_false',
+                        help="Never show progress bars")
+    return parser
+
+def format_summary(metrics, elapsed):
+    """Format the per-endpoint throughput summary printed at the end of a run.
+    
+    Args:
+        metrics (dict): MetricsCollector.summary() output
+        elapsed (float): Wall time of the whole run in seconds
+    
+    Returns:
+        str: Human-readable summary table
+    """
+    header = f"{'endpoint':<18}{'rows':>10}{'chunks':>8}{'failed':>8}{'requests':>10}" \
+             f"{'retries':>9}{'p95 (s)':>9}{'rows/s':>10}"
+    lines = [header]
+    for endpoint, stats in metrics.items():
+        p95 = "-" if stats['p95'] is None else f"{stats['p95']:.2f}"
+        throughput = "-" if stats['rows_per_second'] is None else f"{stats['rows_per_second']:.0f}"
+        lines.append(f"{endpoint:<18}{stats['rows']:>10}{stats['chunks']:>8}{stats['failed_chunks']:>8}"
+                     f"{stats['requests']:>10}{stats['retries']:>9}{p95:>9}{throughput:>10}")
+    lines.append(f"Finished in {elapsed:.1f}s")
+    return "\n".join(lines)
+
+def backfill(client, endpoints, token_ids, start, end, checkpoint, resume=False):
+    """Fetch every endpoint for the universe into the client's store.
+    
+    Chunks are consumed as they stream in, so memory stays bounded regardless
+    of the size of the universe or date range.
+    
+    Args:
+        client (TokenMetricsClient): Client created with a store
+        endpoints (list): Endpoint paths from BACKFILL_ENDPOINTS
+        token_ids (str): Comma-separated Token IDs
+        start (str): Start date in YYYY-MM-DD format
+        end (str): End date in YYYY-MM-DD format
+        checkpoint (Checkpoint): Checkpoint recording chunk outcomes
+        resume (bool, optional): Skip chunks completed by a previous run
+    
+    Returns:
+        dict: Chunks that failed in this run, per endpoint
+    """
+    failures = {}
+    for endpoint in endpoints:
+        attribute, takes_tokens = BACKFILL_ENDPOINTS[endpoint]
+        failed = []
+        params = {'startDate': start, 'endDate': end, 'checkpoint': checkpoint, 'resume': resume,
+                  'failures': failed}
+        if takes_tokens:
+            params['token_id'] = token_ids
+        
+        for _ in getattr(client, attribute).get(stream=True, **params):
+            pass
+        
+        if failed:
+            failures[endpoint] = failed
+    return failures
+
+def main(argv=None):
+    """Entry point of the tmai-backfill console script.
+    
+    Args:
+        argv (list, optional): Command-line arguments. Defaults to sys.argv[1:].
+    
+    Returns:
+        int: Exit status: 0 on success, 1 if chunks failed, 2 on invalid arguments
+            or a universe that cannot be resolved
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    
+    endpoints = [e.strip() for e in args.endpoints.split(',') if e.strip()]
+    unknown = [e for e in endpoints if e not in BACKFILL_ENDPOINTS]
+    if unknown:
+        parser.error(f"Unknown endpoints: {', '.join(unknown)}")
+    if not args.api_key:
+        parser.error("An API key is required (--api-key or TMAI_API_KEY)")
+    if any(BACKFILL_ENDPOINTS[e][1] for e in endpoints) and not args.universe:
+        parser.error("--universe is required for token-level endpoints")
+    
+    show_progress = sys.stderr.isatty() if args.progress is None else args.progress
+    metrics = MetricsCollector()
+    instrumentation = [metrics, TqdmProgress(leave=False)] if show_progress else [metrics]
+    
+    client = TokenMetricsClient(api_key=args.api_key, timeout=args.timeout,
+                                max_workers=args.workers, pool_maxsize=max(10, args.workers),
+                                rate_limit=args.rate_limit, max_retries=args.max_retries,
+                                store=args.store, instrumentation=instrumentation)
+    checkpoint = Checkpoint(args.checkpoint or os.path.join(args.store, '_checkpoint'))
+    
+    started = time.monotonic()
+    with client:
+        token_ids = None
+        if args.universe:
+            universe = load_universe(args.universe)
+            if not universe:
+                parser.error(f"No tokens found in {args.universe}")
+            # Symbols and names are resolved through the tokens catalog, IDs pass through
+            if all(token.isdigit() for token in universe):
+                token_ids = ",".join(universe)
+            else:
+                try:
+                    token_ids = client.resolver.token_ids(universe)
+                except (KeyError, ValueError, requests.exceptions.RequestException) as e:
+                    # KeyError quotes its message, so print the message itself
+                    message = e.args[0] if isinstance(e, KeyError) and e.args else e
+                    print(f"{parser.prog}: error: {message}", file=sys.stderr)
+                    return 2
+        
+        failures = backfill(client, endpoints, token_ids, args.start, args.end, checkpoint, args.resume)
+    
+    print(format_summary(metrics.summary(), time.monotonic() - started))
+    if failures:
+        for endpoint, failed in failures.items():
+            for failure in failed:
+                params = failure['params']
+                print(f"FAILED {endpoint} {params.get('startDate')}..{params.get('endDate')}: "
+                      f"{failure['error']}", file=sys.stderr)
+        print("Re-run with --resume to retry the failed chunks.", file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
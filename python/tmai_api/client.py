@@ -1,3 +1,17 @@
+import requests
+from requests.adapters import HTTPAdapter
+
+from tmai_api.base import MAX_BATCH_SIZE
+from tmai_api.cache import ResponseCache
+from tmai_api.instrumentation import Instrumentation, CompositeInstrumentation
+from tmai_api.loader import BatchLoader, BATCH_WINDOW
+from tmai_api.ratelimit import RateLimiter
+from tmai_api.resolver import TokenResolver
+from tmai_api.schemas import BACKENDS
+from tmai_api.singleflight import SingleFlight
+from tmai_api.sizing import RowRateEstimator
+from tmai_api.store import LocalStore
+from tmai_api.sync import SyncStore
 from tmai_api.endpoints.tokens import TokensEndpoint
 from tmai_api.endpoints.hourly_ohlcv import HourlyOHLCVEndpoint
 from tmai_api.endpoints.daily_ohlcv import DailyOHLCVEndpoint
@@ -14,20 +28,158 @@ class TokenMetricsClient:
     
     BASE_URL = "https://api.tokenmetrics.com/v2"
     
-    def __init__(self, api_key=None):
+    # Endpoint attributes and their classes, instantiated on first access
+    ENDPOINTS = {
+        'tokens': TokensEndpoint,
+        'hourly_ohlcv': HourlyOHLCVEndpoint,
+        'daily_ohlcv': DailyOHLCVEndpoint,
+        'investor_grades': InvestorGradesEndpoint,
+        'trader_grades': TraderGradesEndpoint,
+        'trader_indices': TraderIndicesEndpoint,
+        'market_metrics': MarketMetricsEndpoint,
+        'ai_agent': AIAgentEndpoint,
+        'ai_reports': AIReportsEndpoint,
+        'trading_signals': TradingSignalsEndpoint
+    }
+    
+    def __init__(self, api_key=None, pool_connections=10, pool_maxsize=10,
+                 timeout=60, compression=True, max_workers=1,
+                 rate_limit=None, max_retries=3, backoff_factor=0.5, cache=None,
+                 sync_store=None, store=None, dataframe_backend='pandas', resolver=None,
+                 instrumentation=None, transport=None,
+                 chunk_alignment=None, single_flight=True, batch_window=BATCH_WINDOW,
+                 deadline=None):
         """Initialize the Token Metrics client.
         
         Args:
             api_key (str): Your Token Metrics API key
+            pool_connections (int, optional): Number of host connection pools to cache
+            pool_maxsize (int, optional): Maximum number of keep-alive connections per pool
+            timeout (float or tuple, optional): Request timeout in seconds, either a single
+                value or a (connect, read) tuple. None waits indefinitely, which lets a
+                stalled connection hang a call, so prefer a finite value.
+            compression (bool, optional): Negotiate compressed (gzip/deflate) responses.
+                Set to False to request uncompressed payloads.
+            max_workers (int, optional): Number of date chunks fetched in parallel by
+                paginated endpoints. Keep this at or below pool_maxsize.
+            rate_limit (float, optional): Maximum sustained requests per second shared by
+                all endpoints. None disables client-side throttling.
+            max_retries (int, optional): Retries for 429/5xx responses and connection errors
+            backoff_factor (float, optional): Base delay in seconds for jittered exponential
+                backoff. Retry-After headers take precedence.
+            cache (ResponseCache, str or bool, optional): Opt-in on-disk response cache.
+                Pass a ResponseCache, a path to a cache file, or True for the default location.
+            sync_store (SyncStore or str, optional): Local store used by the OHLCV sync()
+                methods to download only missing date ranges. Pass a SyncStore or a directory.
+            store (LocalStore or str, optional): Partitioned Parquet store that every
+                paginated endpoint writes its results into. Pass a LocalStore or a directory.
+            dataframe_backend (str, optional): Default output of get_dataframe: 'pandas',
+                'arrow' (pyarrow.Table) or 'polars'
+            resolver (TokenResolver or str, optional): Symbol/name to token_id resolver.
+                Pass a TokenResolver or a catalog file path. By default one is created on
+                first use of client.resolver.
+            instrumentation (Instrumentation or list, optional): Hooks notified of requests,
+                retries, cache hits and finished chunks, e.g. TqdmProgress() or
+                MetricsCollector(). Pass a list to combine several. Defaults to no-op hooks.
+            transport (requests.adapters.BaseAdapter, optional): Adapter mounted instead of
+                the pooled HTTPAdapter, e.g. RecordReplayAdapter to record or replay fixtures
+            chunk_alignment (str or int, optional): Default alignment of paginated date
+                chunks: 'month' for calendar months or a number of days (e.g. 28) per
+                fixed bucket. Overlapping queries then request identical chunks, which
+                lets the response cache serve them. None anchors chunks at startDate.
+            single_flight (bool, optional): Share one upstream call between identical GET
+                requests in flight at the same time, e.g. parallel tool calls asking for
+                the same signals. Set to False to send every request.
+            batch_window (float, optional): Seconds that load() calls on trading signals
+                and trader/investor grades wait for other tokens, so concurrent per-token
+                loads are sent as one comma-separated query
+            deadline (float, optional): Default total time budget in seconds of each call.
+                A paginated get() shares it across all of its chunk requests and returns
+                what it fetched in time, flagged "partial", instead of blocking. Calls can
+                override it with deadline=. None lets calls run until they finish.
         """
         self.api_key = api_key
-        self.tokens = TokensEndpoint(self)
-        self.hourly_ohlcv = HourlyOHLCVEndpoint(self)
-        self.daily_ohlcv = DailyOHLCVEndpoint(self)
-        self.investor_grades = InvestorGradesEndpoint(self)
-        self.trader_grades = TraderGradesEndpoint(self)
-        self.trader_indices = TraderIndicesEndpoint(self)
-        self.market_metrics = MarketMetricsEndpoint(self)
-        self.ai_agent = AIAgentEndpoint(self)
-        self.ai_reports = AIReportsEndpoint(self)
-        self.trading_signals = TradingSignalsEndpoint(self)
+        self.timeout = timeout
+        self.deadline = deadline
+        self.max_workers = max_workers
+        self.rate_limiter = RateLimiter(rate=rate_limit, max_retries=max_retries,
+                                        backoff_factor=backoff_factor)
+        # Rows per day observed by paginated endpoints, used to size their date windows
+        self.row_rates = RowRateEstimator()
+        self.chunk_alignment = chunk_alignment
+        self.single_flight = SingleFlight() if single_flight else None
+        self.loader = BatchLoader(window=batch_window, max_batch_size=MAX_BATCH_SIZE)
+        if cache is True:
+            cache = ResponseCache()
+        elif isinstance(cache, str):
+            cache = ResponseCache(cache)
+        self.cache = cache or None
+        if isinstance(sync_store, str):
+            sync_store = SyncStore(sync_store)
+        self.sync_store = sync_store
+        if isinstance(store, str):
+            store = LocalStore(store)
+        self.store = store
+        if dataframe_backend not in BACKENDS:
+            raise ValueError(f"Unsupported dataframe backend: {dataframe_backend}")
+        self.dataframe_backend = dataframe_backend
+        if instrumentation is None:
+            instrumentation = Instrumentation()
+        elif isinstance(instrumentation, (list, tuple)):
+            instrumentation = CompositeInstrumentation(instrumentation)
+        self.instrumentation = instrumentation
+        if isinstance(resolver, str):
+            resolver = TokenResolver(self, resolver)
+        self._resolver = resolver
+        self.session = self._create_session(pool_connections, pool_maxsize, compression, transport)
+    
+    def __getattr__(self, name):
+        # Endpoints are created on first access and then cached as regular attributes
+        endpoint_class = self.ENDPOINTS.get(name)
+        if endpoint_class is None:
+            raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+        return self.__dict__.setdefault(name, endpoint_class(self))
+    
+    def __dir__(self):
+        return sorted(set(super().__dir__()) | set(self.ENDPOINTS))
+    
+    def _create_session(self, pool_connections, pool_maxsize, compression, transport=None):
+        """Create the pooled keep-alive session shared by all endpoints.
+        
+        Args:
+            pool_connections (int): Number of host connection pools to cache
+            pool_maxsize (int): Maximum number of keep-alive connections per pool
+            compression (bool): Whether to negotiate compressed responses
+            transport (requests.adapters.BaseAdapter, optional): Adapter to mount instead
+                of a pooled HTTPAdapter
+            
+        Returns:
+            requests.Session: Configured HTTP session
+        """
+        session = requests.Session()
+        adapter = transport or HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        
+        # requests already advertises gzip/deflate by default
+        if not compression:
+            session.headers["Accept-Encoding"] = "identity"
+        
+        return session
+    
+    @property
+    def resolver(self):
+        """TokenResolver backed by the tokens catalog, created on first use."""
+        if self._resolver is None:
+            self._resolver = TokenResolver(self)
+        return self._resolver
+    
+    def close(self):
+        """Close the underlying HTTP session and release pooled connections."""
+        self.session.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,95 @@
+import asyncio
+import time
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when a call runs out of its time budget."""
+
+class Deadline:
+    """Total time budget of one call, shared by every request the call makes.
+    
+    A paginated ``get`` creates one Deadline and hands it to all of its chunk
+    and page requests. Each request only gets the time that is left: socket
+    timeouts are clamped to it, retries are not attempted when their backoff
+    would outlast it, and chunks still queued when it expires are reported
+    as failed without being requested.
+    """
+    
+    def __init__(self, seconds):
+        """Start the budget.
+        
+        Args:
+            seconds (float): Time budget in seconds, counted from now
+        """
+        self.seconds = seconds
+        self.expires = time.monotonic() + seconds
+    
+    @classmethod
+    def coerce(cls, value):
+        """Return a Deadline for a number of seconds, an existing Deadline or None."""
+        if value is None or isinstance(value, cls):
+            return value
+        return cls(value)
+    
+    def remaining(self):
+        """Return the seconds left in the budget (0 once it has expired)."""
+        return max(0.0, self.expires - time.monotonic())
+    
+    def expired(self):
+        """Return True once the budget has been used up."""
+        return self.remaining() <= 0
+    
+    def exceeded(self, reason=None):
+        """Build the exception reported when the budget has run out.
+        
+        Args:
+            reason (str, optional): What could not be done in the time left
+        """
+        message = f"deadline of {self.seconds:g}s exceeded"
+        return DeadlineExceeded(f"{message} ({reason})" if reason else message)
+    
+    def check(self):
+        """Raise DeadlineExceeded if the budget has been used up."""
+        if self.expired():
+            raise self.exceeded()
+    
+    def timeout(self, timeout=None):
+        """Clamp a request timeout to the time left.
+        
+        Args:
+            timeout (float or tuple, optional): Configured timeout, either a single value
+                or a (connect, read) tuple. None means no timeout.
+        
+        Returns:
+            float or tuple: Timeout of the same shape, no longer than the remaining budget
+        """
+        remaining = self.remaining()
+        if remaining <= 0:
+            raise self.exceeded()
+        if isinstance(timeout, tuple):
+            return tuple(remaining if value is None else min(value, remaining) for value in timeout)
+        return remaining if timeout is None else min(timeout, remaining)
+    
+    def allows(self, delay):
+        """Return True if waiting delay seconds still leaves time for another attempt."""
+        return delay < self.remaining()
+    
+    async def wait(self, awaitable):
+        """Await an awaitable, cancelling it when the budget runs out.
+        
+        Args:
+            awaitable: Coroutine or future to await
+        
+        Returns:
+            Result of the awaitable
+        """
+        remaining = self.remaining()
+        if remaining <= 0:
+            if asyncio.iscoroutine(awaitable):
+                awaitable.close()
+            raise self.exceeded()
+        try:
+            return await asyncio.wait_for(awaitable, remaining)
+        except asyncio.TimeoutError:
+            if not self.expired():
+                raise
+            raise self.exceeded() from None
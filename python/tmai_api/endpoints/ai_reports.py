@@ -1,8 +1,11 @@
 from tmai_api.base import BaseEndpoint
+from tmai_api.schemas import SCHEMAS
 
 class AIReportsEndpoint(BaseEndpoint):
     """Endpoint for accessing AI-generated trading and investment reports"""
     
+    schema = SCHEMAS['ai-reports']
+    
     def get(self, token_id=None, symbol=None, limit=1000, page=0):
         """Get the latest AI-generated trading and investment reports.
         
@@ -27,14 +30,16 @@ class AIReportsEndpoint(BaseEndpoint):
         
         return self._request('get', 'ai-reports', params)
     
-    def get_dataframe(self, **kwargs):
-        """Get AI reports data as a pandas DataFrame.
+    def get_dataframe(self, backend=None, **kwargs):
+        """Get AI reports data as a DataFrame.
         
         Args:
+            backend (str, optional): 'pandas', 'arrow' (pyarrow.Table) or 'polars'.
+                If None, uses the client's dataframe_backend setting.
             **kwargs: Arguments to pass to the get method
             
         Returns:
-            pandas.DataFrame: DataFrame containing AI reports data
+            pandas.DataFrame, pyarrow.Table or polars.DataFrame: Frame containing AI reports data
         """
         data = self.get(**kwargs)
-        return self.to_dataframe(data)
\ No newline at end of file
+        return self.to_dataframe(data, backend)
\ No newline at end of file
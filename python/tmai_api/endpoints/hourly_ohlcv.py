@@ -1,10 +1,13 @@
-from tmai_api.base import BaseEndpoint
+from tmai_api.base import PaginatedEndpoint
+from tmai_api.schemas import SCHEMAS
 
-class HourlyOHLCVEndpoint(BaseEndpoint):
+class HourlyOHLCVEndpoint(PaginatedEndpoint):
     """Endpoint for accessing hourly OHLCV (Open, High, Low, Close, Volume) data"""
     
+    schema = SCHEMAS['hourly-ohlcv']
+    
     def get(self, token_id=None, symbol=None, token_name=None, 
-            startDate=None, endDate=None):
+            startDate=None, endDate=None, **options):
         """Get hourly OHLCV data for tokens with automatic date chunking and pagination.
         
         Args:
@@ -13,14 +16,15 @@ class HourlyOHLCVEndpoint(BaseEndpoint):
             token_name (str, optional): Comma-separated Token Names (e.g., "Bitcoin, Ethereum")
             startDate (str, optional): Start date in YYYY-MM-DD format
             endDate (str, optional): End date in YYYY-MM-DD format
+            **options: Fetch options passed to the paginator (e.g. max_workers, stream, checkpoint, resume, align, deadline)
             
         Returns:
             dict: Hourly OHLCV data with all pages and date ranges combined
             
         Note:
-            This method handles the API's 29-day limit limitation by:
-            1. Automatically chunking the date range into 29-day periods
-            2. Displaying a progress bar during fetching
+            This method handles long date ranges by:
+            1. Automatically chunking the date range into windows sized to fit one page
+            2. Reporting progress to the client's instrumentation hooks
             3. Combining all results into a single response
         """
         params = {
@@ -34,17 +38,43 @@ class HourlyOHLCVEndpoint(BaseEndpoint):
         # Remove None values
         params = {k: v for k, v in params.items() if v is not None}
         
-        # Use custom pagination logic with a 29-day maximum range
-        return self._paginated_request('get', 'hourly-ohlcv', params, max_days=29)
+        # Use custom pagination logic with adaptive date windows
+        return self._paginated_request('get', 'hourly-ohlcv', params, **options)
+    
+    def sync(self, token_id, startDate, endDate, **options):
+        """Get hourly OHLCV data, downloading only the date ranges not held locally.
+        
+        Requires a client created with a sync_store. Already downloaded ranges
+        are served from the store; only the gaps are requested from the API and
+        merged back into the store.
+        
+        Args:
+            token_id (str): Comma-separated Token IDs
+            startDate (str): Start date in YYYY-MM-DD format
+            endDate (str): End date in YYYY-MM-DD format
+            **options: Fetch options passed to the paginator (e.g. max_workers)
+            
+        Returns:
+            dict: Hourly OHLCV data for the requested tokens and date range
+        """
+        params = {
+            'token_id': token_id,
+            'startDate': startDate,
+            'endDate': endDate
+        }
+        
+        return self._sync_request('get', 'hourly-ohlcv', params, **options)
     
-    def get_dataframe(self, **kwargs):
-        """Get hourly OHLCV data as a pandas DataFrame.
+    def get_dataframe(self, backend=None, **kwargs):
+        """Get hourly OHLCV data as a DataFrame.
         
         Args:
+            backend (str, optional): 'pandas', 'arrow' (pyarrow.Table) or 'polars'.
+                If None, uses the client's dataframe_backend setting.
             **kwargs: Arguments to pass to the get method
             
         Returns:
-            pandas.DataFrame: DataFrame containing hourly OHLCV data
+            pandas.DataFrame, pyarrow.Table or polars.DataFrame: Frame containing hourly OHLCV data
         """
         data = self.get(**kwargs)
-        return self.to_dataframe(data)
+        return self.to_dataframe(data, backend)
@@ -1,8 +1,11 @@
 from tmai_api.base import BaseEndpoint
+from tmai_api.schemas import SCHEMAS
 
 class TokensEndpoint(BaseEndpoint):
     """Endpoint for accessing token information"""
     
+    schema = SCHEMAS['tokens']
+    
     def get(self, token_id=None, token_name=None, symbol=None, category=None, 
             exchange=None, blockchain_address=None, limit=1000, page=0):
         """Get the list of tokens supported by Token Metrics.
@@ -36,14 +39,16 @@ class TokensEndpoint(BaseEndpoint):
         
         return self._request('get', 'tokens', params)
     
-    def get_dataframe(self, **kwargs):
-        """Get token information as a pandas DataFrame.
+    def get_dataframe(self, backend=None, **kwargs):
+        """Get token information as a DataFrame.
         
         Args:
+            backend (str, optional): 'pandas', 'arrow' (pyarrow.Table) or 'polars'.
+                If None, uses the client's dataframe_backend setting.
             **kwargs: Arguments to pass to the get method
             
         Returns:
-            pandas.DataFrame: DataFrame containing token information
+            pandas.DataFrame, pyarrow.Table or polars.DataFrame: Frame containing token information
         """
         data = self.get(**kwargs)
-        return self.to_dataframe(data)
+        return self.to_dataframe(data, backend)
@@ -1,11 +1,14 @@
-from tmai_api.base import BaseEndpoint
+from tmai_api.base import BatchedEndpoint
+from tmai_api.schemas import SCHEMAS
 
-class TraderGradesEndpoint(BaseEndpoint):
+class TraderGradesEndpoint(BatchedEndpoint):
     """Endpoint for accessing short-term trading grades"""
     
+    schema = SCHEMAS['trader-grades']
+    
     def get(self, token_id=None, startDate=None, endDate=None, symbol=None,
             category=None, exchange=None, marketcap=None, fdv=None, 
-            volume=None, traderGrade=None, traderGradePercentChange=None):
+            volume=None, traderGrade=None, traderGradePercentChange=None, **options):
         """Get the short-term trading grades with automatic date chunking and pagination.
         
         Args:
@@ -20,14 +23,15 @@ class TraderGradesEndpoint(BaseEndpoint):
             volume (str, optional): Minimum 24h trading volume in $
             traderGrade (str, optional): Minimum TM Trader Grade
             traderGradePercentChange (str, optional): Minimum 24h percent change in TM Trader Grade
+            **options: Fetch options passed to the paginator (e.g. max_workers, stream, checkpoint, resume, align, deadline)
             
         Returns:
             dict: Trader grades data with all pages and date ranges combined
             
         Note:
-            This method handles the API's 29-day limit limitation by:
-            1. Automatically chunking the date range into 29-day periods
-            2. Displaying a progress bar during fetching
+            This method handles long date ranges by:
+            1. Automatically chunking the date range into windows sized to fit one page
+            2. Reporting progress to the client's instrumentation hooks
             3. Combining all results into a single response
         """
         params = {
@@ -47,16 +51,18 @@ class TraderGradesEndpoint(BaseEndpoint):
         # Remove None values
         params = {k: v for k, v in params.items() if v is not None}
         
-        return self._paginated_request('get', 'trader-grades', params, max_days=29)
+        return self._paginated_request('get', 'trader-grades', params, **options)
     
-    def get_dataframe(self, **kwargs):
-        """Get trader grades data as a pandas DataFrame.
+    def get_dataframe(self, backend=None, **kwargs):
+        """Get trader grades data as a DataFrame.
         
         Args:
+            backend (str, optional): 'pandas', 'arrow' (pyarrow.Table) or 'polars'.
+                If None, uses the client's dataframe_backend setting.
             **kwargs: Arguments to pass to the get method
             
         Returns:
-            pandas.DataFrame: DataFrame containing trader grades data
+            pandas.DataFrame, pyarrow.Table or polars.DataFrame: Frame containing trader grades data
         """
         data = self.get(**kwargs)
-        return self.to_dataframe(data)
+        return self.to_dataframe(data, backend)
@@ -1,22 +1,26 @@
-from tmai_api.base import BaseEndpoint
+from tmai_api.base import PaginatedEndpoint
+from tmai_api.schemas import SCHEMAS
 
-class TraderIndicesEndpoint(BaseEndpoint):
+class TraderIndicesEndpoint(PaginatedEndpoint):
     """Endpoint for accessing AI-generated trading portfolios"""
     
-    def get(self, startDate=None, endDate=None):
+    schema = SCHEMAS['trader-indices']
+    
+    def get(self, startDate=None, endDate=None, **options):
         """Get the AI-generated portfolio for Traders with automatic date chunking and pagination.
         
         Args:
             startDate (str, optional): Start date in YYYY-MM-DD format
             endDate (str, optional): End date in YYYY-MM-DD format
+            **options: Fetch options passed to the paginator (e.g. max_workers, stream, checkpoint, resume, align, deadline)
             
         Returns:
             dict: Trader indices data with all pages and date ranges combined
             
         Note:
-            This method handles the API's 29-day limit limitation by:
-            1. Automatically chunking the date range into 29-day periods
-            2. Displaying a progress bar during fetching
+            This method handles long date ranges by:
+            1. Automatically chunking the date range into windows sized to fit one page
+            2. Reporting progress to the client's instrumentation hooks
             3. Combining all results into a single response
         """
         params = {
@@ -27,16 +31,18 @@ class TraderIndicesEndpoint(BaseEndpoint):
         # Remove None values
         params = {k: v for k, v in params.items() if v is not None}
         
-        return self._paginated_request('get', 'trader-indices', params, max_days=29)
+        return self._paginated_request('get', 'trader-indices', params, **options)
     
-    def get_dataframe(self, **kwargs):
-        """Get trader indices data as a pandas DataFrame.
+    def get_dataframe(self, backend=None, **kwargs):
+        """Get trader indices data as a DataFrame.
         
         Args:
+            backend (str, optional): 'pandas', 'arrow' (pyarrow.Table) or 'polars'.
+                If None, uses the client's dataframe_backend setting.
             **kwargs: Arguments to pass to the get method
             
         Returns:
-            pandas.DataFrame: DataFrame containing trader indices data
+            pandas.DataFrame, pyarrow.Table or polars.DataFrame: Frame containing trader indices data
         """
         data = self.get(**kwargs)
-        return self.to_dataframe(data)
+        return self.to_dataframe(data, backend)
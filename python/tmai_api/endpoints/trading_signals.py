@@ -1,11 +1,14 @@
-from tmai_api.base import BaseEndpoint
+from tmai_api.base import BatchedEndpoint
+from tmai_api.schemas import SCHEMAS
 
-class TradingSignalsEndpoint(BaseEndpoint):
+class TradingSignalsEndpoint(BatchedEndpoint):
     """Endpoint for accessing AI-generated trading signals for long and short positions"""
     
+    schema = SCHEMAS['trading-signals']
+    
     def get(self, token_id=None, symbol=None, startDate=None, endDate=None, 
             category=None, exchange=None, marketcap=None, volume=None, 
-            fdv=None, signal=None):
+            fdv=None, signal=None, **options):
         """Get AI-generated trading signals with automatic date chunking and pagination.
         
         Args:
@@ -19,14 +22,15 @@ class TradingSignalsEndpoint(BaseEndpoint):
             volume (str, optional): Minimum 24h trading volume in $
             fdv (str, optional): Minimum fully diluted valuation in $
             signal (str, optional): Signal value: bullish (1), bearish (-1) or no signal (0)
+            **options: Fetch options passed to the paginator (e.g. max_workers, stream, checkpoint, resume, align, deadline)
             
         Returns:
             dict: Trading signals data with all pages and date ranges combined
             
         Note:
-            This method handles the API's 29-day limit limitation by:
-            1. Automatically chunking the date range into 29-day periods
-            2. Displaying a progress bar during fetching
+            This method handles long date ranges by:
+            1. Automatically chunking the date range into windows sized to fit one page
+            2. Reporting progress to the client's instrumentation hooks
             3. Combining all results into a single response
         """
         params = {
@@ -45,16 +49,18 @@ class TradingSignalsEndpoint(BaseEndpoint):
         # Remove None values
         params = {k: v for k, v in params.items() if v is not None}
         
-        return self._paginated_request('get', 'trading-signals', params, max_days=29)
+        return self._paginated_request('get', 'trading-signals', params, **options)
     
-    def get_dataframe(self, **kwargs):
-        """Get trading signals data as a pandas DataFrame.
+    def get_dataframe(self, backend=None, **kwargs):
+        """Get trading signals data as a DataFrame.
         
         Args:
+            backend (str, optional): 'pandas', 'arrow' (pyarrow.Table) or 'polars'.
+                If None, uses the client's dataframe_backend setting.
             **kwargs: Arguments to pass to the get method
             
         Returns:
-            pandas.DataFrame: DataFrame containing trading signals data
+            pandas.DataFrame, pyarrow.Table or polars.DataFrame: Frame containing trading signals data
         """
         data = self.get(**kwargs)
-        return self.to_dataframe(data)
\ No newline at end of file
+        return self.to_dataframe(data, backend)
\ No newline at end of file
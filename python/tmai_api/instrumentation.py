@@ -0,0 +1,258 @@
+import itertools
+import math
+import threading
+import time
+
+from tmai_api.lazy import lazy_import
+
+# tqdm is imported when the first progress bar is shown
+tqdm = lazy_import("tqdm")
+
+# Source of the fetch_id passed to the fetch hooks
+_fetch_ids = itertools.count(1)
+
+def next_fetch_id():
+    """Return a new fetch_id, unique within the process."""
+    return next(_fetch_ids)
+
+class Instrumentation:
+    """Hooks called by the client around requests, retries, cache hits and chunks.
+    
+    Every hook is a no-op, so this class doubles as the default. Subclass it
+    and override the hooks you need; hooks may be called from worker threads.
+    Several fetches of the same endpoint may run at once, so the fetch hooks
+    also receive a fetch_id telling them apart.
+    """
+    
+    def fetch_start(self, endpoint, chunks, fetch_id=None):
+        """Called when a paginated fetch starts.
+        
+        Args:
+            endpoint (str): API endpoint path
+            chunks (int): Number of date chunks (and token batches) to fetch
+            fetch_id (int, optional): Identifier of this fetch
+        """
+    
+    def fetch_end(self, endpoint, fetch_id=None):
+        """Called when a paginated fetch finishes or is abandoned.
+        
+        Args:
+            endpoint (str): API endpoint path
+            fetch_id (int, optional): Identifier of the fetch given to fetch_start
+        """
+    
+    def chunk_done(self, endpoint, params, rows, fetch_id=None):
+        """Called when every page of a chunk has been fetched.
+        
+        Args:
+            endpoint (str): API endpoint path
+            params (dict): Query parameters of the chunk
+            rows (int): Rows in the chunk, or None if the chunk failed
+            fetch_id (int, optional): Identifier of the fetch the chunk belongs to
+        """
+    
+    def request_start(self, endpoint, params):
+        """Called before an API call is sent.
+        
+        Args:
+            endpoint (str): API endpoint path
+            params (dict): Query parameters
+        """
+    
+    def request_end(self, endpoint, params, status_code, elapsed, size=0, rows=0, error=None):
+        """Called when an API call (including its retries) has finished.
+        
+        Args:
+            endpoint (str): API endpoint path
+            params (dict): Query parameters
+            status_code (int): Final HTTP status code, or None if no response arrived
+            elapsed (float): Seconds spent, including retries
+            size (int, optional): Response body size in bytes
+            rows (int, optional): Data rows in the response
+            error (Exception, optional): Exception raised by the call, if any
+        """
+    
+    def retry(self, endpoint, attempt, status_code, delay):
+        """Called before a failed attempt is retried.
+        
+        Args:
+            endpoint (str): API endpoint path
+            attempt (int): Zero-based attempt number that just failed
+            status_code (int): HTTP status code, or None for a connection error
+            delay (float): Seconds to wait before the next attempt
+        """
+    
+    def cache_hit(self, endpoint, params):
+        """Called when a response is served from the response cache.
+        
+        Args:
+            endpoint (str): API endpoint path
+            params (dict): Query parameters
+        """
+
+class CompositeInstrumentation(Instrumentation):
+    """Forwards every hook to several instrumentation objects."""
+    
+    def __init__(self, hooks):
+        """Initialize the composite.
+        
+        Args:
+            hooks (list): Instrumentation objects, called in order
+        """
+        self.hooks = list(hooks)
+    
+    def fetch_start(self, *args, **kwargs):
+        for hook in self.hooks:
+            hook.fetch_start(*args, **kwargs)
+    
+    def fetch_end(self, *args, **kwargs):
+        for hook in self.hooks:
+            hook.fetch_end(*args, **kwargs)
+    
+    def chunk_done(self, *args, **kwargs):
+        for hook in self.hooks:
+            hook.chunk_done(*args, **kwargs)
+    
+    def request_start(self, *args, **kwargs):
+        for hook in self.hooks:
+            hook.request_start(*args, **kwargs)
+    
+    def request_end(self, *args, **kwargs):
+        for hook in self.hooks:
+            hook.request_end(*args, **kwargs)
+    
+    def retry(self, *args, **kwargs):
+        for hook in self.hooks:
+            hook.retry(*args, **kwargs)
+    
+    def cache_hit(self, *args, **kwargs):
+        for hook in self.hooks:
+            hook.cache_hit(*args, **kwargs)
+
+class TqdmProgress(Instrumentation):
+    """Shows a tqdm progress bar per paginated fetch.
+    
+    Bars are keyed by fetch_id, so concurrent fetches of the same endpoint
+    each get their own bar.
+    """
+    
+    def __init__(self, **tqdm_kwargs):
+        """Initialize the progress adapter.
+        
+        Args:
+            **tqdm_kwargs: Extra arguments passed to tqdm (e.g. leave=False)
+        """
+        self.tqdm_kwargs = tqdm_kwargs
+        self._bars = {}
+        self._lock = threading.Lock()
+    
+    def fetch_start(self, endpoint, chunks, fetch_id=None):
+        bar = tqdm.tqdm(total=chunks, desc=f"Fetching {endpoint} data", unit="chunk", **self.tqdm_kwargs)
+        with self._lock:
+            self._bars[endpoint, fetch_id] = bar
+    
+    def chunk_done(self, endpoint, params, rows, fetch_id=None):
+        with self._lock:
+            bar = self._bars.get((endpoint, fetch_id))
+        if bar is not None:
+            bar.update(1)
+    
+    def fetch_end(self, endpoint, fetch_id=None):
+        with self._lock:
+            bar = self._bars.pop((endpoint, fetch_id), None)
+        if bar is not None:
+            bar.close()
+
+class MetricsCollector(Instrumentation):
+    """In-memory aggregator of request latency, throughput, retries and errors."""
+    
+    def __init__(self):
+        """Initialize an empty collector."""
+        self._lock = threading.Lock()
+        self.reset()
+    
+    def reset(self):
+        """Drop every collected measurement."""
+        with self._lock:
+            self._endpoints = {}
+    
+    def _stats(self, endpoint):
+        stats = self._endpoints.get(endpoint)
+        if stats is None:
+            stats = self._endpoints[endpoint] = {
+                "latencies": [], "errors": 0, "retries": 0, "cache_hits": 0,
+                "rows": 0, "bytes": 0, "chunks": 0, "failed_chunks": 0,
+                "first_start": None, "last_end": None,
+            }
+        return stats
+    
+    def request_start(self, endpoint, params):
+        now = time.monotonic()
+        with self._lock:
+            stats = self._stats(endpoint)
+            if stats["first_start"] is None:
+                stats["first_start"] = now
+    
+    def request_end(self, endpoint, params, status_code, elapsed, size=0, rows=0, error=None):
+        with self._lock:
+            stats = self._stats(endpoint)
+            stats["latencies"].append(elapsed)
+            stats["bytes"] += size
+            stats["rows"] += rows
+            stats["last_end"] = time.monotonic()
+            if error is not None:
+                stats["errors"] += 1
+    
+    def retry(self, endpoint, attempt, status_code, delay):
+        with self._lock:
+            self._stats(endpoint)["retries"] += 1
+    
+    def cache_hit(self, endpoint, params):
+        with self._lock:
+            self._stats(endpoint)["cache_hits"] += 1
+    
+    def chunk_done(self, endpoint, params, rows, fetch_id=None):
+        with self._lock:
+            stats = self._stats(endpoint)
+            stats["chunks"] += 1
+            if rows is None:
+                stats["failed_chunks"] += 1
+    
+    @staticmethod
+    def _percentile(ordered, fraction):
+        # Nearest-rank percentile of an already sorted list
+        if not ordered:
+            return None
+        index = max(0, math.ceil(fraction * len(ordered)) - 1)
+        return ordered[index]
+    
+    def summary(self):
+        """Return aggregated metrics per endpoint.
+        
+        Returns:
+            dict: Per-endpoint requests, errors, retries, cache_hits, chunks,
+            failed_chunks, rows, bytes, p50/p95/p99 latency in seconds and
+            rows_per_second over the wall time spent on that endpoint
+        """
+        with self._lock:
+            result = {}
+            for endpoint, stats in self._endpoints.items():
+                ordered = sorted(stats["latencies"])
+                wall = None
+                if stats["first_start"] is not None and stats["last_end"] is not None:
+                    wall = stats["last_end"] - stats["first_start"]
+                result[endpoint] = {
+                    "requests": len(ordered),
+                    "errors": stats["errors"],
+                    "retries": stats["retries"],
+                    "cache_hits": stats["cache_hits"],
+                    "chunks": stats["chunks"],
+                    "failed_chunks": stats["failed_chunks"],
+                    "rows": stats["rows"],
+                    "bytes": stats["bytes"],
+                    "p50": self._percentile(ordered, 0.50),
+                    "p95": self._percentile(ordered, 0.95),
+                    "p99": self._percentile(ordered, 0.99),
+                    "rows_per_second": stats["rows"] / wall if wall else None,
+                }
+            return result
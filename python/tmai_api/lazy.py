@@ -0,0 +1,53 @@
+import importlib
+import importlib.util
+import threading
+
+class LazyModule:
+    """Stand-in for a module that is imported on first attribute access.
+    
+    Heavy dependencies (pandas, pyarrow, polars, tqdm, httpx) are bound
+    through this proxy, so ``import tmai_api`` stays cheap for processes
+    that never build a DataFrame or show a progress bar.
+    """
+    
+    def __init__(self, name):
+        """Initialize the proxy.
+        
+        Args:
+            name (str): Dotted name of the module to import on first use
+        """
+        self._name = name
+        self._module = None
+        self._lock = threading.Lock()
+    
+    def _load(self):
+        if self._module is None:
+            with self._lock:
+                if self._module is None:
+                    self._module = importlib.import_module(self._name)
+        return self._module
+    
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+    
+    def __repr__(self):
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<lazy module {self._name!r} ({state})>"
+
+def lazy_import(name):
+    """Bind an optional module without importing it.
+    
+    Only the top-level package is looked up, which does not execute it, so
+    the usual ``module is None`` checks for missing optional dependencies
+    keep working.
+    
+    Args:
+        name (str): Dotted module name, e.g. "pyarrow.parquet"
+    
+    Returns:
+        LazyModule: Proxy importing the module on first use, or None if the
+        top-level package is not installed
+    """
+    if importlib.util.find_spec(name.split(".")[0]) is None:
+        return None
+    return LazyModule(name)
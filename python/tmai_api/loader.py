@@ -0,0 +1,174 @@
+import asyncio
+import copy
+import threading
+
+# Seconds a batch stays open for more tokens after its first request
+BATCH_WINDOW = 0.01
+
+class _Batch:
+    """Tokens collected for one combined request, and its outcome."""
+    
+    def __init__(self, asynchronous=False):
+        self.token_ids = []
+        self.full = asyncio.Event() if asynchronous else threading.Event()
+        self.done = asyncio.get_running_loop().create_future() if asynchronous else threading.Event()
+        self.task = None
+        self.response = None
+        self.rows_by_token = None
+        self.error = None
+
+class BatchLoader:
+    """Merges single-token requests made at about the same time into one request.
+    
+    Works like a DataLoader: the first load for a set of parameters opens a
+    batch that stays open for ``window`` seconds (or until it holds
+    ``max_batch_size`` tokens). Every load with the same parameters in that
+    time adds its token, one request is sent with the comma-separated token
+    list, and each caller receives the rows of its own token.
+    
+    Counters:
+        loads: Tokens requested through the loader
+        requests: Combined requests sent
+    """
+    
+    def __init__(self, window=BATCH_WINDOW, max_batch_size=None):
+        """Initialize the loader.
+        
+        Args:
+            window (float, optional): Seconds to wait for more tokens before sending a batch
+            max_batch_size (int, optional): Tokens per batch that trigger sending it at once.
+                None only uses the window.
+        """
+        self.window = window
+        self.max_batch_size = max_batch_size
+        self._lock = threading.Lock()
+        self._batches = {}
+        self._async_batches = {}
+        self.loads = 0
+        self.requests = 0
+    
+    def _join(self, batches, key, token_id, asynchronous=False):
+        """Add a token to the open batch for key, opening one if needed.
+        
+        Returns:
+            tuple: (batch, True if this call opened it)
+        """
+        with self._lock:
+            self.loads += 1
+            batch = batches.get(key)
+            opened = batch is None
+            if opened:
+                batch = batches[key] = _Batch(asynchronous)
+            if token_id not in batch.token_ids:
+                batch.token_ids.append(token_id)
+            if self.max_batch_size and len(batch.token_ids) >= self.max_batch_size:
+                # Later loads start a new batch
+                del batches[key]
+                batch.full.set()
+        return batch, opened
+    
+    def _close(self, batches, key, batch):
+        with self._lock:
+            if batches.get(key) is batch:
+                del batches[key]
+            self.requests += 1
+    
+    @staticmethod
+    def _index(response):
+        """Group the rows of a combined response by token ID."""
+        if isinstance(response, dict):
+            rows = response.get("data", [])
+        else:
+            rows = response
+        rows_by_token = {}
+        for row in rows if isinstance(rows, list) else []:
+            if isinstance(row, dict):
+                rows_by_token.setdefault(str(row.get("TOKEN_ID")), []).append(row)
+        return rows_by_token
+    
+    @staticmethod
+    def _split(batch, token_id):
+        """Build one caller's response from the combined response of its batch."""
+        rows = copy.deepcopy(batch.rows_by_token.get(token_id, []))
+        if not isinstance(batch.response, dict):
+            return rows
+        response = dict(batch.response, data=rows)
+        if "length" in response:
+            response["length"] = len(rows)
+        return response
+    
+    def load(self, key, token_id, fetch):
+        """Get the response for one token, batched with concurrent loads of the same key.
+        
+        Args:
+            key (hashable): Identity of the other request parameters; only loads with
+                equal keys are merged
+            token_id (str): Token ID to load
+            fetch (callable): Called with the list of batched token IDs, returns the
+                combined response
+        
+        Returns:
+            dict or list: Response holding only the rows of token_id
+        """
+        batch, opened = self._join(self._batches, key, token_id)
+        if opened:
+            batch.full.wait(self.window)
+            self._close(self._batches, key, batch)
+            try:
+                batch.response = fetch(list(batch.token_ids))
+                batch.rows_by_token = self._index(batch.response)
+            except BaseException as e:
+                batch.error = e
+            finally:
+                batch.done.set()
+        else:
+            batch.done.wait()
+        
+        if batch.error is not None:
+            raise batch.error
+        return self._split(batch, token_id)
+    
+    async def load_async(self, key, token_id, fetch):
+        """Await the response for one token, batched with concurrent loads of the same key.
+        
+        The combined request runs in its own task, so cancelling one caller
+        does not cancel the request for the others.
+        
+        Args:
+            key (hashable): Identity of the other request parameters
+            token_id (str): Token ID to load
+            fetch (callable): Coroutine function called with the list of batched token IDs
+        
+        Returns:
+            dict or list: Response holding only the rows of token_id
+        """
+        batch, opened = self._join(self._async_batches, key, token_id, asynchronous=True)
+        if opened:
+            batch.task = asyncio.ensure_future(self._dispatch_async(key, batch, fetch))
+        await asyncio.shield(batch.done)
+        return self._split(batch, token_id)
+    
+    async def _dispatch_async(self, key, batch, fetch):
+        try:
+            await asyncio.wait_for(batch.full.wait(), self.window)
+        except asyncio.TimeoutError:
+            pass
+        self._close(self._async_batches, key, batch)
+        try:
+            batch.response = await fetch(list(batch.token_ids))
+            batch.rows_by_token = self._index(batch.response)
+        except BaseException as e:
+            batch.done.set_exception(e)
+            # Mark the error as retrieved in case every caller was cancelled
+            batch.done.exception()
+        else:
+            batch.done.set_result(None)
+    
+    def stats(self):
+        """Return a snapshot of the batching counters.
+        
+        Returns:
+            dict: loads and requests counters
+        """
+        with self._lock:
+            return {"loads": self.loads, "requests": self.requests}
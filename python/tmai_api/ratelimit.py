@@ -0,0 +1,189 @@
+import asyncio
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+# HTTP status codes that are retried with backoff
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+class RateLimiter:
+    """Client-side token bucket shared by all endpoints of a client.
+    
+    The bucket refills at ``rate`` requests per second up to ``burst`` tokens.
+    When the API answers 429 with a Retry-After header, the whole bucket is
+    paused for that long so every endpoint backs off together.
+    
+    Counters:
+        requests: Requests that were let through the limiter
+        throttled: Requests that had to wait for a token
+        throttled_seconds: Total time spent waiting for tokens
+        rate_limited: 429 responses received from the API
+        retried: Requests that were retried after a 429/5xx or connection error
+    """
+    
+    def __init__(self, rate=None, burst=None, max_retries=3, backoff_factor=0.5, max_backoff=60):
+        """Initialize the rate limiter.
+        
+        Args:
+            rate (float, optional): Sustained requests per second. None disables throttling
+                (retries still apply).
+            burst (int, optional): Bucket capacity. Defaults to max(1, rate).
+            max_retries (int, optional): Maximum number of retries per request
+            backoff_factor (float, optional): Base delay in seconds for exponential backoff
+            max_backoff (float, optional): Upper bound in seconds for a single backoff delay
+        """
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1, int(rate or 1))
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        
+        self._lock = threading.Lock()
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        
+        self.requests = 0
+        self.throttled = 0
+        self.throttled_seconds = 0.0
+        self.rate_limited = 0
+        self.retried = 0
+    
+    def _reserve(self, timeout=None):
+        """Take a token from the bucket.
+        
+        Args:
+            timeout (float, optional): Longest acceptable wait. If the wait would be
+                longer, no token is taken.
+        
+        Returns:
+            float: Seconds the caller must wait before sending its request, or None
+            if that is longer than timeout
+        """
+        with self._lock:
+            now = time.monotonic()
+            wait = max(0.0, self._blocked_until - now)
+            
+            if self.rate:
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                # Tokens may go negative: each waiting caller reserves its own slot
+                if self._tokens < 1:
+                    wait = max(wait, (1 - self._tokens) / self.rate)
+            
+            if timeout is not None and wait > timeout:
+                return None
+            self.requests += 1
+            if self.rate:
+                self._tokens -= 1
+            if wait > 0:
+                self.throttled += 1
+                self.throttled_seconds += wait
+            return wait
+    
+    def acquire(self, timeout=None):
+        """Block until a request may be sent.
+        
+        Args:
+            timeout (float, optional): Longest time to wait. If the bucket (or a
+                Retry-After pause) would hold the request longer, return at once
+                without taking a token.
+        
+        Returns:
+            float: Seconds spent waiting, or None if the wait would exceed timeout
+        """
+        wait = self._reserve(timeout)
+        if wait is not None and wait > 0:
+            time.sleep(wait)
+        return wait
+    
+    async def acquire_async(self):
+        """Wait on the event loop until a request may be sent.
+        
+        Returns:
+            float: Seconds spent waiting
+        """
+        wait = self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+    
+    def should_retry(self, status_code, attempt):
+        """Check whether a response status should be retried.
+        
+        Args:
+            status_code (int): HTTP status code, or None for a connection error
+            attempt (int): Zero-based attempt number that just failed
+        
+        Returns:
+            bool: True if the request should be retried
+        """
+        if attempt >= self.max_retries:
+            return False
+        return status_code is None or status_code in RETRY_STATUS_CODES
+    
+    def retry_delay(self, attempt, status_code=None, headers=None):
+        """Compute the delay before the next attempt and record the retry.
+        
+        Retry-After is honoured when present; otherwise the delay uses full
+        jitter exponential backoff. A 429 pauses the shared bucket so other
+        endpoints do not keep hammering the API in the meantime.
+        
+        Args:
+            attempt (int): Zero-based attempt number that just failed
+            status_code (int, optional): HTTP status code of the failed attempt
+            headers (dict, optional): Response headers of the failed attempt
+        
+        Returns:
+            float: Seconds to wait before retrying
+        """
+        delay = parse_retry_after((headers or {}).get("Retry-After"))
+        if delay is None:
+            delay = random.uniform(0, min(self.max_backoff, self.backoff_factor * (2 ** attempt)))
+        
+        with self._lock:
+            self.retried += 1
+            if status_code == 429:
+                self.rate_limited += 1
+                self._blocked_until = max(self._blocked_until, time.monotonic() + delay)
+        
+        return delay
+    
+    def stats(self):
+        """Return a snapshot of the limiter counters.
+        
+        Returns:
+            dict: Counter values
+        """
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "throttled": self.throttled,
+                "throttled_seconds": self.throttled_seconds,
+                "rate_limited": self.rate_limited,
+                "retried": self.retried,
+            }
+
+def parse_retry_after(value):
+    """Parse a Retry-After header value.
+    
+    Args:
+        value (str): Header value, either delay seconds or an HTTP date
+    
+    Returns:
+        float: Seconds to wait, or None if the header is missing or invalid
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at is None:
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
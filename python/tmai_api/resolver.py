@@ -0,0 +1,162 @@
+import gzip
+import json
+import os
+import threading
+import time
+
+# Default location of the persisted tokens catalog
+DEFAULT_RESOLVER_PATH = os.path.join(os.path.expanduser("~"), ".cache", "tmai_api", "tokens.json.gz")
+
+# Page size used when downloading the tokens catalog
+CATALOG_PAGE_SIZE = 1000
+
+class TokenResolver:
+    """Local symbol/name to token_id index built from the tokens catalog.
+    
+    The catalog is downloaded once through the tokens endpoint, persisted to
+    disk and indexed by TOKEN_ID, upper-cased TOKEN_SYMBOL and case-folded
+    TOKEN_NAME, so lookups are dictionary hits instead of API calls. The
+    snapshot is refreshed when it is older than ``ttl``.
+    """
+    
+    def __init__(self, client, path=None, ttl=24 * 3600):
+        """Initialize the resolver.
+        
+        Args:
+            client: TokenMetricsClient instance used to download the catalog
+            path (str, optional): File to persist the catalog in. Defaults to
+                ~/.cache/tmai_api/tokens.json.gz. Pass False to keep it in memory only.
+            ttl (float, optional): Seconds before the catalog is downloaded again
+        """
+        self.client = client
+        self.path = DEFAULT_RESOLVER_PATH if path is None else path
+        self.ttl = ttl
+        self.fetched_at = None
+        
+        self._lock = threading.Lock()
+        self._by_id = {}
+        self._by_symbol = {}
+        self._by_name = {}
+    
+    def _build(self, tokens):
+        """Rebuild the hash indexes from catalog rows.
+        
+        Args:
+            tokens (list): Catalog rows with TOKEN_ID, TOKEN_SYMBOL and TOKEN_NAME
+        """
+        by_id, by_symbol, by_name = {}, {}, {}
+        for token in tokens:
+            if not isinstance(token, dict) or token.get("TOKEN_ID") is None:
+                continue
+            by_id[str(token["TOKEN_ID"])] = token
+            if token.get("TOKEN_SYMBOL"):
+                by_symbol.setdefault(str(token["TOKEN_SYMBOL"]).upper(), []).append(token)
+            if token.get("TOKEN_NAME"):
+                by_name.setdefault(str(token["TOKEN_NAME"]).casefold(), []).append(token)
+        self._by_id, self._by_symbol, self._by_name = by_id, by_symbol, by_name
+    
+    def _load(self):
+        """Load the persisted catalog if it is still fresh.
+        
+        Returns:
+            bool: True if the indexes were loaded from disk
+        """
+        if not self.path or not os.path.exists(self.path):
+            return False
+        try:
+            with gzip.open(self.path, "rt", encoding="utf-8") as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if time.time() - snapshot.get("fetched_at", 0) > self.ttl:
+            return False
+        
+        self._build(snapshot.get("tokens", []))
+        self.fetched_at = snapshot["fetched_at"]
+        return True
+    
+    def _save(self, tokens):
+        if not self.path:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+            json.dump({"fetched_at": self.fetched_at, "tokens": tokens}, f, separators=(",", ":"))
+        os.replace(tmp_path, self.path)
+    
+    def refresh(self):
+        """Download the full tokens catalog and rebuild the indexes.
+        
+        Returns:
+            int: Number of tokens in the catalog
+        """
+        with self._lock:
+            params = {'limit': CATALOG_PAGE_SIZE, 'page': 0}
+            response = self.client.tokens._fetch_chunk('get', 'tokens', params)
+            tokens = self.client.tokens._response_items(response)
+            self.fetched_at = time.time()
+            self._build(tokens)
+            self._save(tokens)
+            return len(self._by_id)
+    
+    def _ensure_fresh(self):
+        if self.fetched_at is not None and time.time() - self.fetched_at <= self.ttl:
+            return
+        with self._lock:
+            loaded = self._load()
+        if not loaded:
+            self.refresh()
+    
+    def candidates(self, query):
+        """Return every catalog entry matching a token ID, symbol or name.
+        
+        Args:
+            query (str or int): Token ID, symbol (case-insensitive) or name (case-insensitive)
+        
+        Returns:
+            list: Matching catalog rows
+        """
+        self._ensure_fresh()
+        query = str(query).strip()
+        if query in self._by_id:
+            return [self._by_id[query]]
+        return self._by_symbol.get(query.upper()) or self._by_name.get(query.casefold(), [])
+    
+    def resolve(self, query, name=None):
+        """Resolve a token ID, symbol or name to a single catalog entry.
+        
+        Symbols shared by several tokens are disambiguated by ``name`` when
+        given. Otherwise a ValueError lists the candidates.
+        
+        Args:
+            query (str or int): Token ID, symbol or name
+            name (str, optional): Token name used to pick between tokens sharing a symbol
+        
+        Returns:
+            dict: Catalog row with TOKEN_ID, TOKEN_SYMBOL and TOKEN_NAME
+        """
+        matches = self.candidates(query)
+        if name is not None:
+            matches = [t for t in matches if str(t.get("TOKEN_NAME", "")).casefold() == name.casefold()]
+        
+        if not matches:
+            raise KeyError(f"Unknown token: {query}" + (f" ({name})" if name else ""))
+        if len(matches) > 1:
+            options = ", ".join(f"{t.get('TOKEN_NAME')} (id {t['TOKEN_ID']})" for t in matches)
+            raise ValueError(f"Ambiguous token {query!r}: {options}. Pass name= or a token ID.")
+        return matches[0]
+    
+    def token_ids(self, queries):
+        """Resolve several tokens to the comma-separated token_id string endpoints expect.
+        
+        Args:
+            queries (str or list): Comma-separated string or list of token IDs, symbols or names
+        
+        Returns:
+            str: Comma-separated Token IDs, in the order given
+        """
+        if isinstance(queries, str):
+            queries = queries.split(",")
+        return ",".join(str(self.resolve(q)["TOKEN_ID"]) for q in queries if str(q).strip())
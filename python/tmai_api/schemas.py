@@ -0,0 +1,216 @@
+from functools import lru_cache
+
+from tmai_api.lazy import lazy_import
+
+# Imported on first use; pyarrow and polars are None when not installed
+pd = lazy_import("pandas")
+pa = lazy_import("pyarrow")  # only needed for the Arrow and Polars backends
+pc = lazy_import("pyarrow.compute")
+pl = lazy_import("polars")  # only needed for the Polars backend
+
+# Output backends supported by to_dataframe
+BACKENDS = ('pandas', 'arrow', 'polars')
+
+# dtype marker for columns parsed into timezone-naive UTC datetime64 values
+DATETIME = "datetime64[ns]"
+
+@lru_cache(maxsize=None)
+def iso8601_supported():
+    # pandas 2 can parse mixed ISO 8601 strings ("2023-01-01" and "2023-01-01T00:00:00.000Z")
+    # in one vectorized pass; older versions infer the format per element instead
+    return int(pd.__version__.split(".")[0]) >= 2
+
+# Columns shared by every token-level endpoint
+TOKEN_COLUMNS = {
+    'TOKEN_ID': 'Int64',
+    'TOKEN_NAME': 'category',
+    'TOKEN_SYMBOL': 'category'
+}
+
+# Prices and volumes stay float64: float32 loses cents on large prices
+OHLCV_COLUMNS = dict(TOKEN_COLUMNS, **{
+    'DATE': DATETIME,
+    'OPEN': 'float64',
+    'HIGH': 'float64',
+    'LOW': 'float64',
+    'CLOSE': 'float64',
+    'VOLUME': 'float64'
+})
+
+# Column dtypes per endpoint. Columns that are not listed keep the dtype pandas infers.
+SCHEMAS = {
+    'tokens': TOKEN_COLUMNS,
+    'hourly-ohlcv': OHLCV_COLUMNS,
+    'daily-ohlcv': OHLCV_COLUMNS,
+    'trader-grades': dict(TOKEN_COLUMNS, **{
+        'DATE': DATETIME,
+        'TM_TRADER_GRADE': 'float32',
+        'TA_GRADE': 'float32',
+        'QUANT_GRADE': 'float32'
+    }),
+    'investor-grades': dict(TOKEN_COLUMNS, **{
+        'DATE': DATETIME,
+        'TM_INVESTOR_GRADE': 'float32'
+    }),
+    'trading-signals': dict(TOKEN_COLUMNS, **{
+        'DATE': DATETIME,
+        'TRADING_SIGNAL': 'Int8',
+        'TOKEN_TREND': 'Int8',
+        'TRADING_SIGNALS_RETURNS': 'float32',
+        'HOLDING_RETURNS': 'float32'
+    }),
+    'market-metrics': {
+        'DATE': DATETIME,
+        'FEAR_AND_GREED_VALUE': 'float32'
+    },
+    'trader-indices': {
+        'DATE': DATETIME
+    },
+    'ai-reports': TOKEN_COLUMNS
+}
+
+# Columns results are sorted by, when present
+SORT_COLUMNS = ('TOKEN_ID', 'DATE')
+
+# UTC designators stripped before DATE strings are cast to Arrow timestamps
+UTC_SUFFIX = r"(Z|[+-]00:?00)$"
+
+def _convert(values, dtype):
+    """Convert a list of raw values into a typed pandas object.
+    
+    Args:
+        values (list): Column values as returned by the API
+        dtype (str): Target dtype
+    
+    Returns:
+        pandas.Series or pandas.Index: Typed column, or the untyped values if
+        they cannot be converted
+    """
+    if dtype == DATETIME:
+        if iso8601_supported():
+            parsed = pd.to_datetime(values, utc=True, errors="coerce", format="ISO8601")
+        else:
+            parsed = pd.to_datetime(values, utc=True, errors="coerce")
+        return parsed.tz_convert(None)
+    if dtype == 'category':
+        return pd.Categorical(values)
+    
+    numeric = pd.to_numeric(pd.Series(values), errors="coerce")
+    try:
+        return numeric.astype(dtype)
+    except (TypeError, ValueError):
+        # e.g. fractional values in a nullable integer column
+        return numeric
+
+def _column_names(rows):
+    # Keep the column order of first appearance across all rows
+    names = {}
+    for row in rows:
+        for name in row:
+            names.setdefault(name, None)
+    return list(names)
+
+def build_frame(rows, schema=None):
+    """Build a DataFrame column by column with explicit dtypes.
+    
+    Args:
+        rows (list): Row dicts as returned by the API
+        schema (dict, optional): Mapping of column name to dtype
+    
+    Returns:
+        pandas.DataFrame: Typed DataFrame sorted by TOKEN_ID and DATE when present
+    """
+    schema = schema or {}
+    columns = {}
+    for name in _column_names(rows):
+        values = [row.get(name) for row in rows]
+        columns[name] = _convert(values, schema[name]) if name in schema else values
+    
+    df = pd.DataFrame(columns)
+    
+    sort_by = [name for name in SORT_COLUMNS if name in df.columns]
+    if sort_by:
+        df = df.sort_values(sort_by, kind="stable", ignore_index=True)
+    return df
+
+def _arrow_type(dtype):
+    return {
+        DATETIME: pa.timestamp('ns'),
+        'category': pa.dictionary(pa.int32(), pa.string()),
+        'Int64': pa.int64(),
+        'Int8': pa.int8(),
+        'float64': pa.float64(),
+        'float32': pa.float32()
+    }[dtype]
+
+def _arrow_array(values, dtype=None):
+    """Convert a list of raw values into a typed Arrow array.
+    
+    Args:
+        values (list): Column values as returned by the API
+        dtype (str, optional): Target dtype from the endpoint schema
+    
+    Returns:
+        pyarrow.Array: Typed column, or the inferred array if it cannot be converted
+    """
+    try:
+        array = pa.array(values)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        # Mixed value types: keep the column as strings
+        array = pa.array([None if value is None else str(value) for value in values])
+    if dtype is None:
+        return array
+    
+    try:
+        if dtype == DATETIME and pa.types.is_string(array.type):
+            array = pc.replace_substring_regex(array, UTC_SUFFIX, "")
+        elif dtype == 'category':
+            return array.cast(pa.string()).dictionary_encode()
+        return array.cast(_arrow_type(dtype))
+    except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+        return array
+
+def build_table(rows, schema=None):
+    """Build a pyarrow Table straight from decoded rows, without going through pandas.
+    
+    Args:
+        rows (list): Row dicts as returned by the API
+        schema (dict, optional): Mapping of column name to dtype
+    
+    Returns:
+        pyarrow.Table: Typed table sorted by TOKEN_ID and DATE when present
+    """
+    if pa is None:
+        raise ImportError("The arrow backend requires pyarrow. Install it with: pip install tmai-api[arrow]")
+    
+    schema = schema or {}
+    table = pa.table({
+        name: _arrow_array([row.get(name) for row in rows], schema.get(name))
+        for name in _column_names(rows)
+    })
+    
+    sort_by = [(name, "ascending") for name in SORT_COLUMNS if name in table.column_names]
+    if sort_by:
+        table = table.sort_by(sort_by)
+    return table
+
+def build_output(rows, schema=None, backend='pandas'):
+    """Build a typed frame for the requested output backend.
+    
+    Args:
+        rows (list): Row dicts as returned by the API
+        schema (dict, optional): Mapping of column name to dtype
+        backend (str, optional): 'pandas', 'arrow' or 'polars'
+    
+    Returns:
+        pandas.DataFrame, pyarrow.Table or polars.DataFrame: Typed frame
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unsupported dataframe backend: {backend}")
+    if backend == 'pandas':
+        return build_frame(rows, schema) if rows else pd.DataFrame()
+    if backend == 'polars' and pl is None:
+        raise ImportError("The polars backend requires polars. Install it with: pip install tmai-api[polars]")
+    
+    table = build_table(rows, schema)
+    return pl.from_arrow(table) if backend == 'polars' else table
@@ -0,0 +1,149 @@
+import asyncio
+import copy
+import threading
+import time
+
+from tmai_api.deadline import DeadlineExceeded
+
+class _Call:
+    """A request in flight, awaited by the threads that asked for the same thing."""
+    
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+class SingleFlight:
+    """Coalesces identical requests that are in flight at the same time.
+    
+    The first caller for a key (the leader) makes the upstream call; callers
+    arriving with the same key before it finishes wait for it and receive a
+    copy of its result, or its exception. A leader's deadline is its own:
+    when the call fails with DeadlineExceeded (or the leading task is
+    cancelled), a waiting caller makes the call again instead of inheriting
+    the failure. Nothing is kept once the call
+    completes, so this only removes duplicate concurrent calls; reuse across
+    time is the job of the response cache.
+    
+    Counters:
+        calls: Upstream calls made by leaders
+        shared: Callers served by another caller's upstream call
+    """
+    
+    def __init__(self):
+        """Initialize an empty set of in-flight calls."""
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._futures = {}
+        self.calls = 0
+        self.shared = 0
+    
+    def do(self, key, fn, timeout=None):
+        """Run fn once for all threads asking for key at the same time.
+        
+        If the leader's call fails with DeadlineExceeded, the leader ran out
+        of its own budget: a waiting thread retries as the new leader with
+        its own fn instead of failing.
+        
+        Args:
+            key (hashable): Identity of the request
+            fn (callable): Makes the request and returns its result
+            timeout (float, optional): Longest time this caller waits for a shared
+                call before raising DeadlineExceeded. None waits until it ends.
+        
+        Returns:
+            Result of fn; waiting callers get a deep copy so they cannot
+            affect each other by mutating it
+        """
+        expires = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                call = self._calls.get(key)
+                leader = call is None
+                if leader:
+                    call = self._calls[key] = _Call()
+                    self.calls += 1
+                else:
+                    self.shared += 1
+            if leader:
+                break
+            
+            if not call.done.wait(None if expires is None else max(0.0, expires - time.monotonic())):
+                raise DeadlineExceeded("timed out waiting for an identical request in flight")
+            if isinstance(call.error, DeadlineExceeded):
+                # The leader's deadline ran out, not this caller's: retry as a new leader
+                with self._lock:
+                    self.shared -= 1
+                continue
+            if call.error is not None:
+                raise call.error
+            return copy.deepcopy(call.result)
+        
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+    
+    async def do_async(self, key, fn):
+        """Await fn once for all tasks asking for key at the same time.
+        
+        If the leading task is cancelled, a waiting task takes over and makes
+        the call itself instead of failing.
+        
+        Args:
+            key (hashable): Identity of the request
+            fn (callable): Coroutine function making the request
+        
+        Returns:
+            Result of fn; waiting tasks get a deep copy
+        """
+        while True:
+            future = self._futures.get(key)
+            if future is None:
+                break
+            with self._lock:
+                self.shared += 1
+            try:
+                result = await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if future.cancelled():
+                    # The leader was cancelled, not this task: retry as a new leader
+                    with self._lock:
+                        self.shared -= 1
+                    continue
+                raise
+            return copy.deepcopy(result)
+        
+        future = self._futures[key] = asyncio.get_running_loop().create_future()
+        with self._lock:
+            self.calls += 1
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark the exception as retrieved when no task is waiting for it
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._futures[key]
+    
+    def stats(self):
+        """Return a snapshot of the coalescing counters.
+        
+        Returns:
+            dict: calls and shared counters
+        """
+        with self._lock:
+            return {"calls": self.calls, "shared": self.shared}
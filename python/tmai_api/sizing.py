@@ -0,0 +1,68 @@
+import threading
+
+class RowRateEstimator:
+    """Learns how many rows each endpoint returns per day, shared by all endpoints of a client.
+    
+    Paginated endpoints size their date windows from these rates, so a
+    window holds about one page of rows. Rates are kept separately for
+    queries filtered by token (rows per token per day) and for unfiltered
+    queries (rows per day for the whole universe), and are smoothed with an
+    exponential moving average so one sparse chunk does not swing the
+    window size.
+    """
+    
+    def __init__(self, smoothing=0.5):
+        """Initialize the estimator.
+        
+        Args:
+            smoothing (float, optional): Weight of the latest observation in the moving average
+        """
+        self.smoothing = smoothing
+        self._lock = threading.Lock()
+        self._rates = {}
+    
+    def rate(self, endpoint, per_token=True):
+        """Return the learned row rate of an endpoint.
+        
+        Args:
+            endpoint (str): API endpoint path
+            per_token (bool, optional): Rate of token-filtered queries (rows per token
+                per day) rather than unfiltered ones (rows per day)
+        
+        Returns:
+            float: Learned rate, or None if no chunk has been observed yet
+        """
+        with self._lock:
+            return self._rates.get((endpoint, per_token))
+    
+    def observe(self, endpoint, rows, days, tokens=None):
+        """Record the size of a fetched chunk.
+        
+        Args:
+            endpoint (str): API endpoint path
+            rows (int): Rows returned for the chunk
+            days (int): Number of days the chunk covered
+            tokens (int, optional): Number of tokens the chunk was filtered by,
+                or None for an unfiltered query
+        """
+        if rows <= 0 or days <= 0:
+            return
+        observed = rows / days / (tokens or 1)
+        key = (endpoint, tokens is not None)
+        with self._lock:
+            previous = self._rates.get(key)
+            if previous is None:
+                self._rates[key] = observed
+            else:
+                self._rates[key] = previous + self.smoothing * (observed - previous)
+    
+    def stats(self):
+        """Return the learned rates.
+        
+        Returns:
+            dict: Rate per endpoint, keyed "<endpoint>" for token-filtered queries
+            and "<endpoint>:all" for unfiltered ones
+        """
+        with self._lock:
+            return {endpoint if per_token else f"{endpoint}:all": rate
+                    for (endpoint, per_token), rate in sorted(self._rates.items())}
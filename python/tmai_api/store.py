@@ -0,0 +1,178 @@
+import datetime
+import os
+import threading
+
+from tmai_api.lazy import lazy_import
+
+# pyarrow is only needed for the local columnar store; imported on first use, None if missing
+pa = lazy_import("pyarrow")
+pq = lazy_import("pyarrow.parquet")
+ds = lazy_import("pyarrow.dataset")
+
+# Partition value used for endpoints whose rows are not tied to a token
+ALL_TOKENS = "all"
+
+class LocalStore:
+    """Partitioned columnar store for paginated endpoint data.
+    
+    Rows are written as Parquet files partitioned by endpoint, token and
+    month::
+        
+        <root>/<endpoint>/token_id=<id>/month=<YYYY-MM>/data.parquet
+    
+    Queries scan the whole endpoint as one Arrow dataset: partitions that
+    do not match the requested tokens and months are pruned without being
+    opened, the date filter is pushed down to the Parquet row groups, and
+    only the requested columns are read.
+    """
+    
+    def __init__(self, root):
+        """Initialize the local store.
+        
+        Args:
+            root (str): Root directory of the store
+        """
+        if pa is None:
+            raise ImportError("LocalStore requires pyarrow. Install it with: pip install tmai-api[store]")
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+        self._lock = threading.Lock()
+    
+    def _partition_dir(self, endpoint, token_id, month):
+        return os.path.join(self.root, endpoint, f"token_id={token_id}", f"month={month}")
+    
+    def write(self, endpoint, records):
+        """Write rows into their partitions, replacing rows with the same DATE.
+        
+        Args:
+            endpoint (str): API endpoint path
+            records (list): Rows as returned by the API, each with a DATE field
+        
+        Returns:
+            int: Number of partitions written
+        """
+        partitions = {}
+        for row in records:
+            if not isinstance(row, dict) or not row.get("DATE"):
+                continue
+            date = row["DATE"]
+            token_id = row.get("TOKEN_ID", ALL_TOKENS)
+            partitions.setdefault((str(token_id), str(date)[:7]), []).append(row)
+        
+        with self._lock:
+            for (token_id, month), rows in partitions.items():
+                directory = self._partition_dir(endpoint, token_id, month)
+                path = os.path.join(directory, "data.parquet")
+                
+                merged = {}
+                if os.path.exists(path):
+                    for row in pq.read_table(path).to_pylist():
+                        merged[row["DATE"]] = row
+                for row in rows:
+                    merged[row["DATE"]] = row
+                
+                os.makedirs(directory, exist_ok=True)
+                table = pa.Table.from_pylist([merged[date] for date in sorted(merged)])
+                # Dot-prefixed so dataset scans never pick up a half-written file
+                tmp_path = os.path.join(directory, ".data.parquet.tmp")
+                pq.write_table(table, tmp_path)
+                os.replace(tmp_path, path)
+        
+        return len(partitions)
+    
+    def partitions(self, endpoint, token_ids=None, startDate=None, endDate=None):
+        """List the partition files that may hold rows for a query.
+        
+        Args:
+            endpoint (str): API endpoint path
+            token_ids (list, optional): Token IDs to include. None includes all tokens.
+            startDate (str, optional): Start date in YYYY-MM-DD format
+            endDate (str, optional): End date in YYYY-MM-DD format
+        
+        Returns:
+            list: Parquet file paths, ordered by token and month
+        """
+        endpoint_dir = os.path.join(self.root, endpoint)
+        if not os.path.isdir(endpoint_dir):
+            return []
+        
+        wanted = None if token_ids is None else {str(t).strip() for t in token_ids}
+        start_month = startDate[:7] if startDate else None
+        end_month = endDate[:7] if endDate else None
+        
+        paths = []
+        for token_dir in sorted(os.listdir(endpoint_dir)):
+            token_id = token_dir.split("=", 1)[-1]
+            if wanted is not None and token_id not in wanted:
+                continue
+            for month_dir in sorted(os.listdir(os.path.join(endpoint_dir, token_dir))):
+                month = month_dir.split("=", 1)[-1]
+                if (start_month and month < start_month) or (end_month and month > end_month):
+                    continue
+                path = os.path.join(endpoint_dir, token_dir, month_dir, "data.parquet")
+                if os.path.exists(path):
+                    paths.append(path)
+        return paths
+    
+    def query(self, endpoint, token_ids=None, startDate=None, endDate=None, columns=None):
+        """Read rows from the store.
+        
+        Args:
+            endpoint (str): API endpoint path
+            token_ids (list or str, optional): Token IDs (list or comma-separated string).
+                None reads all tokens.
+            startDate (str, optional): Start date in YYYY-MM-DD format
+            endDate (str, optional): End date in YYYY-MM-DD format
+            columns (list, optional): Columns to read. None reads every column.
+        
+        Returns:
+            pyarrow.Table: Matching rows, ordered by token and DATE
+        """
+        if isinstance(token_ids, str):
+            token_ids = token_ids.split(",")
+        
+        endpoint_dir = os.path.join(self.root, endpoint)
+        if not os.path.isdir(endpoint_dir):
+            return pa.table({})
+        
+        partitioning = ds.partitioning(pa.schema([("token_id", pa.string()), ("month", pa.string())]),
+                                       flavor="hive")
+        dataset = ds.dataset(endpoint_dir, format="parquet", partitioning=partitioning)
+        
+        # Partition filters prune files by path, before any of them is opened
+        partition_filter = None
+        conditions = []
+        if token_ids is not None:
+            conditions.append(ds.field("token_id").isin([str(t).strip() for t in token_ids]))
+        if startDate:
+            conditions.append(ds.field("month") >= startDate[:7])
+        if endDate:
+            conditions.append(ds.field("month") <= endDate[:7])
+        for condition in conditions:
+            partition_filter = condition if partition_filter is None else partition_filter & condition
+        fragments = sorted(dataset.get_fragments(filter=partition_filter), key=lambda f: f.path)
+        if not fragments:
+            return pa.table({})
+        
+        # Partitions written at different times may disagree on types (e.g. all-null columns)
+        schemas = [fragment.physical_schema for fragment in fragments]
+        try:
+            schema = pa.unify_schemas(schemas, promote_options="permissive")
+        except TypeError:
+            # Older pyarrow versions have no promote_options
+            schema = pa.unify_schemas(schemas)
+        dataset = ds.FileSystemDataset(fragments, schema, dataset.format, dataset.filesystem)
+        
+        # DATE holds ISO strings, so the range is a string comparison the row group
+        # statistics can answer; the end bound is exclusive to keep the whole last day
+        row_filter = None
+        if startDate:
+            row_filter = ds.field("DATE") >= startDate[:10]
+        if endDate:
+            next_day = datetime.date.fromisoformat(endDate[:10]) + datetime.timedelta(days=1)
+            upper = ds.field("DATE") < next_day.isoformat()
+            row_filter = upper if row_filter is None else row_filter & upper
+        
+        if columns is None:
+            columns = schema.names
+        return dataset.to_table(columns=[c for c in columns if c in schema.names], filter=row_filter)
@@ -0,0 +1,186 @@
+import datetime
+import gzip
+import json
+import os
+import threading
+
+class CoverageIndex:
+    """Date intervals already held locally, per (endpoint, token) key.
+    
+    Intervals are inclusive [start, end] pairs of YYYY-MM-DD strings and are
+    kept sorted and merged, so subtracting them from a requested range is a
+    single pass.
+    """
+    
+    def __init__(self, intervals=None):
+        """Initialize the coverage index.
+        
+        Args:
+            intervals (dict, optional): Mapping of key to a list of [start, end] pairs
+        """
+        self.intervals = {key: [list(pair) for pair in pairs] for key, pairs in (intervals or {}).items()}
+    
+    @staticmethod
+    def _parse(value):
+        return datetime.datetime.strptime(value[:10], "%Y-%m-%d").date()
+    
+    def add(self, key, start, end):
+        """Mark an inclusive date range as covered.
+        
+        Args:
+            key (str): Coverage key, e.g. "daily-ohlcv/3375"
+            start (str): Start date in YYYY-MM-DD format
+            end (str): End date in YYYY-MM-DD format
+        """
+        start, end = self._parse(start), self._parse(end)
+        if end < start:
+            return
+        
+        merged = []
+        for pair in self.intervals.get(key, []):
+            lo, hi = self._parse(pair[0]), self._parse(pair[1])
+            # Merge overlapping and adjacent intervals
+            if hi + datetime.timedelta(days=1) < start or end + datetime.timedelta(days=1) < lo:
+                merged.append((lo, hi))
+            else:
+                start, end = min(start, lo), max(end, hi)
+        merged.append((start, end))
+        merged.sort()
+        self.intervals[key] = [[lo.isoformat(), hi.isoformat()] for lo, hi in merged]
+    
+    def missing(self, key, start, end):
+        """Return the parts of a date range that are not covered yet.
+        
+        Args:
+            key (str): Coverage key, e.g. "daily-ohlcv/3375"
+            start (str): Start date in YYYY-MM-DD format
+            end (str): End date in YYYY-MM-DD format
+        
+        Returns:
+            list: (start, end) tuples of YYYY-MM-DD strings, in chronological order
+        """
+        cursor, end = self._parse(start), self._parse(end)
+        gaps = []
+        for pair in self.intervals.get(key, []):
+            lo, hi = self._parse(pair[0]), self._parse(pair[1])
+            if hi < cursor:
+                continue
+            if lo > end:
+                break
+            if lo > cursor:
+                gaps.append((cursor.isoformat(), (lo - datetime.timedelta(days=1)).isoformat()))
+            cursor = hi + datetime.timedelta(days=1)
+            if cursor > end:
+                break
+        if cursor <= end:
+            gaps.append((cursor.isoformat(), end.isoformat()))
+        return gaps
+
+class SyncStore:
+    """Local record store backing incremental OHLCV syncs.
+    
+    Rows are kept per (endpoint, token) in gzip-compressed JSON files keyed
+    by DATE, next to a coverage index that records which date ranges have
+    been downloaded completely.
+    """
+    
+    def __init__(self, path):
+        """Initialize the sync store.
+        
+        Args:
+            path (str): Directory holding the coverage index and record files
+        """
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        self._lock = threading.Lock()
+        self.coverage = CoverageIndex(self._load_json(self._coverage_path, {}))
+    
+    @property
+    def _coverage_path(self):
+        return os.path.join(self.path, "coverage.json")
+    
+    @staticmethod
+    def key(endpoint, token_id):
+        """Build the coverage key for an endpoint and token.
+        
+        Args:
+            endpoint (str): API endpoint path
+            token_id (str or int): Token ID
+        
+        Returns:
+            str: Coverage key
+        """
+        return f"{endpoint}/{token_id}"
+    
+    def _records_path(self, endpoint, token_id):
+        return os.path.join(self.path, "records", endpoint, f"{token_id}.json.gz")
+    
+    @staticmethod
+    def _load_json(path, default):
+        if not os.path.exists(path):
+            return default
+        opener = gzip.open if path.endswith(".gz") else open
+        with opener(path, "rt", encoding="utf-8") as f:
+            return json.load(f)
+    
+    @staticmethod
+    def _dump_json(path, value):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        opener = gzip.open if path.endswith(".gz") else open
+        tmp_path = path + ".tmp"
+        with opener(tmp_path, "wt", encoding="utf-8") as f:
+            json.dump(value, f, separators=(",", ":"))
+        os.replace(tmp_path, path)
+    
+    def missing(self, endpoint, token_id, start, end):
+        """Return the date ranges of a request that are not held locally.
+        
+        Args:
+            endpoint (str): API endpoint path
+            token_id (str or int): Token ID
+            start (str): Start date in YYYY-MM-DD format
+            end (str): End date in YYYY-MM-DD format
+        
+        Returns:
+            list: (start, end) tuples still to be fetched
+        """
+        with self._lock:
+            return self.coverage.missing(self.key(endpoint, token_id), start, end)
+    
+    def merge(self, endpoint, token_id, rows, start=None, end=None):
+        """Merge downloaded rows into the store and mark their range as covered.
+        
+        Args:
+            endpoint (str): API endpoint path
+            token_id (str or int): Token ID
+            rows (list): Rows for this token, each with a DATE field
+            start (str, optional): Start of the fully downloaded range
+            end (str, optional): End of the fully downloaded range. Pass None for
+                ranges that may still receive new rows (e.g. today).
+        """
+        path = self._records_path(endpoint, token_id)
+        with self._lock:
+            stored = self._load_json(path, {})
+            for row in rows:
+                stored[row["DATE"]] = row
+            self._dump_json(path, stored)
+            
+            if start and end:
+                self.coverage.add(self.key(endpoint, token_id), start, end)
+                self._dump_json(self._coverage_path, self.coverage.intervals)
+    
+    def records(self, endpoint, token_id, start, end):
+        """Return the stored rows of a token within a date range.
+        
+        Args:
+            endpoint (str): API endpoint path
+            token_id (str or int): Token ID
+            start (str): Start date in YYYY-MM-DD format
+            end (str): End date in YYYY-MM-DD format
+        
+        Returns:
+            list: Rows sorted by DATE
+        """
+        with self._lock:
+            stored = self._load_json(self._records_path(endpoint, token_id), {})
+        return [stored[date] for date in sorted(stored) if start <= date[:10] <= end]
@@ -0,0 +1,304 @@
+import asyncio
+import base64
+import datetime
+import gzip
+import hashlib
+import io
+import json
+import os
+import time
+from urllib.parse import parse_qsl, urlsplit
+
+from requests import Response
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+try:
+    import httpx
+except ImportError:  # httpx is only needed for the httpx transports
+    httpx = None
+
+# Fixture modes: replay only, record only, or replay with recording on a miss
+MODES = ('replay', 'record', 'auto')
+
+# Response headers not stored in fixtures: bodies are stored decoded, and these
+# either describe the wire encoding or change on every request
+SKIPPED_HEADERS = ('content-encoding', 'content-length', 'transfer-encoding', 'connection',
+                   'keep-alive', 'date', 'set-cookie')
+
+# Transient responses are passed through but never recorded, so a replay does
+# not retry the same throttled or failed response forever
+UNRECORDED_STATUSES = (429, 500, 502, 503, 504)
+
+class FixtureNotFound(LookupError):
+    """Raised in replay mode when no fixture matches a request."""
+
+class FixtureStore:
+    """Directory of gzipped JSON response fixtures shared by every transport.
+    
+    A fixture is keyed by the request method, URL path, sorted query
+    parameters and body, but not by host or headers, so recordings made with
+    requests replay through httpx and vice versa, and API keys never end up
+    on disk. Files are written deterministically (sorted keys, no gzip
+    timestamp), so recording the same responses twice gives identical bytes.
+    """
+    
+    def __init__(self, path):
+        """Initialize the store.
+        
+        Args:
+            path (str): Directory holding the fixture files
+        """
+        self.path = path
+    
+    @staticmethod
+    def key(method, url, body=None):
+        """Build the fixture file name of a request.
+        
+        Args:
+            method (str): HTTP method
+            url (str): Full request URL including the query string
+            body (bytes or str, optional): Request body
+        
+        Returns:
+            str: File name made of the endpoint path and a hash of the request
+        """
+        parts = urlsplit(url)
+        if isinstance(body, str):
+            body = body.encode()
+        query = sorted(parse_qsl(parts.query, keep_blank_values=True))
+        identity = json.dumps([method.upper(), parts.path, query, hashlib.sha256(body or b"").hexdigest()])
+        digest = hashlib.sha256(identity.encode()).hexdigest()[:24]
+        name = parts.path.strip("/").replace("/", "_") or "root"
+        return f"{method.lower()}-{name}-{digest}.json.gz"
+    
+    def load(self, key):
+        """Load a recorded response.
+        
+        Args:
+            key (str): Fixture file name from key()
+        
+        Returns:
+            dict: Recorded response, or None if there is no fixture
+        """
+        try:
+            with gzip.open(os.path.join(self.path, key), "rt", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+    
+    def save(self, key, method, url, status, headers, content, elapsed):
+        """Record a response, unless it is a transient error.
+        
+        Args:
+            key (str): Fixture file name from key()
+            method (str): HTTP method
+            url (str): Request URL, stored for reference only
+            status (int): HTTP status code
+            headers (dict): Response headers
+            content (bytes): Decoded response body
+            elapsed (float): Seconds the live request took
+        """
+        if status in UNRECORDED_STATUSES:
+            return
+        
+        parts = urlsplit(url)
+        record = {
+            "method": method.upper(),
+            "path": parts.path,
+            "query": parts.query,
+            "status": status,
+            "headers": {name.lower(): value for name, value in headers.items()
+                        if name.lower() not in SKIPPED_HEADERS},
+            "body": base64.b64encode(content).decode("ascii"),
+            "elapsed": round(elapsed, 6)
+        }
+        os.makedirs(self.path, exist_ok=True)
+        path = os.path.join(self.path, key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        payload = json.dumps(record, sort_keys=True, separators=(",", ":")).encode()
+        # A fixed mtime keeps fixtures byte-identical across recordings; gzip.compress
+        # only takes mtime from Python 3.8
+        buffer = io.BytesIO()
+        with gzip.GzipFile(fileobj=buffer, mode="wb", mtime=0) as gz:
+            gz.write(payload)
+        with open(tmp_path, "wb") as f:
+            f.write(buffer.getvalue())
+        os.replace(tmp_path, path)
+
+def _check_mode(mode):
+    if mode not in MODES:
+        raise ValueError(f"Unsupported fixture mode: {mode}")
+
+def _replay_delay(record, latency):
+    """Return the simulated latency of a replayed response.
+    
+    Args:
+        record (dict): Recorded response
+        latency (float or str): Fixed delay in seconds, 'recorded' for the live
+            timing, or None for no delay
+    
+    Returns:
+        float: Seconds to wait before returning the response
+    """
+    if latency == 'recorded':
+        return record.get("elapsed", 0.0)
+    return latency or 0.0
+
+class RecordReplayAdapter(HTTPAdapter):
+    """requests transport adapter recording responses to, or replaying them from, fixtures.
+    
+    Mount it through ``TokenMetricsClient(transport=...)``. Everything above
+    the adapter (retries, rate limiting, caching, pagination) runs unchanged,
+    so replayed runs exercise the same code path as live ones.
+    """
+    
+    def __init__(self, path, mode='replay', latency=None, **adapter_kwargs):
+        """Initialize the adapter.
+        
+        Args:
+            path (str): Fixture directory
+            mode (str, optional): 'replay' (fixtures only, a miss raises FixtureNotFound),
+                'record' (always hit the network and store the response) or 'auto'
+                (replay, recording on a miss)
+            latency (float or str, optional): Simulated latency of replayed responses in
+                seconds, or 'recorded' to reuse the live timing
+            **adapter_kwargs: Arguments for HTTPAdapter (e.g. pool_maxsize) used when recording
+        """
+        _check_mode(mode)
+        super().__init__(**adapter_kwargs)
+        self.fixtures = FixtureStore(path)
+        self.mode = mode
+        self.latency = latency
+    
+    def send(self, request, **kwargs):
+        key = self.fixtures.key(request.method, request.url, request.body)
+        if self.mode != 'record':
+            record = self.fixtures.load(key)
+            if record is not None:
+                time.sleep(_replay_delay(record, self.latency))
+                return self._build_response(request, record)
+            if self.mode == 'replay':
+                raise FixtureNotFound(f"No fixture for {request.method} {request.url}")
+        
+        response = super().send(request, **kwargs)
+        self.fixtures.save(key, request.method, request.url, response.status_code, response.headers,
+                           response.content, response.elapsed.total_seconds())
+        return response
+    
+    def _build_response(self, request, record):
+        response = Response()
+        response.status_code = record["status"]
+        response.headers = CaseInsensitiveDict(record["headers"])
+        response._content = base64.b64decode(record["body"])
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        response.elapsed = datetime.timedelta(seconds=record.get("elapsed", 0.0))
+        return response
+
+def _httpx_record(fixtures, key, request, response, elapsed):
+    # httpx has already decoded the body; store and return it without the wire encoding
+    fixtures.save(key, request.method, str(request.url), response.status_code, response.headers,
+                  response.content, elapsed)
+    headers = [(name, value) for name, value in response.headers.items()
+               if name.lower() not in ('content-encoding', 'content-length', 'transfer-encoding')]
+    return httpx.Response(response.status_code, headers=headers, content=response.content, request=request)
+
+def _httpx_response(request, record):
+    return httpx.Response(record["status"], headers=record["headers"],
+                          content=base64.b64decode(record["body"]), request=request)
+
+class RecordReplayTransport(httpx.BaseTransport if httpx else object):
+    """httpx transport recording responses to, or replaying them from, fixtures.
+    
+    Uses the same fixture format as RecordReplayAdapter. Pass it to
+    ``httpx.Client(transport=...)``.
+    """
+    
+    def __init__(self, path, mode='replay', latency=None, transport=None):
+        """Initialize the transport.
+        
+        Args:
+            path (str): Fixture directory
+            mode (str, optional): 'replay', 'record' or 'auto' (see RecordReplayAdapter)
+            latency (float or str, optional): Simulated latency of replayed responses in
+                seconds, or 'recorded' to reuse the live timing
+            transport (httpx.BaseTransport, optional): Transport used when recording.
+                Defaults to httpx.HTTPTransport().
+        """
+        if httpx is None:
+            raise ImportError("RecordReplayTransport requires httpx. Install it with: pip install tmai-api[async]")
+        _check_mode(mode)
+        self.fixtures = FixtureStore(path)
+        self.mode = mode
+        self.latency = latency
+        self.transport = transport or httpx.HTTPTransport()
+    
+    def handle_request(self, request):
+        key = self.fixtures.key(request.method, str(request.url), request.read())
+        if self.mode != 'record':
+            record = self.fixtures.load(key)
+            if record is not None:
+                time.sleep(_replay_delay(record, self.latency))
+                return _httpx_response(request, record)
+            if self.mode == 'replay':
+                raise FixtureNotFound(f"No fixture for {request.method} {request.url}")
+        
+        started = time.monotonic()
+        response = self.transport.handle_request(request)
+        try:
+            response.read()
+        finally:
+            response.close()
+        return _httpx_record(self.fixtures, key, request, response, time.monotonic() - started)
+    
+    def close(self):
+        self.transport.close()
+
+class AsyncRecordReplayTransport(httpx.AsyncBaseTransport if httpx else object):
+    """Asyncio counterpart of RecordReplayTransport for ``httpx.AsyncClient(transport=...)``."""
+    
+    def __init__(self, path, mode='replay', latency=None, transport=None):
+        """Initialize the transport.
+        
+        Args:
+            path (str): Fixture directory
+            mode (str, optional): 'replay', 'record' or 'auto' (see RecordReplayAdapter)
+            latency (float or str, optional): Simulated latency of replayed responses in
+                seconds, or 'recorded' to reuse the live timing
+            transport (httpx.AsyncBaseTransport, optional): Transport used when recording.
+                Defaults to httpx.AsyncHTTPTransport().
+        """
+        if httpx is None:
+            raise ImportError("AsyncRecordReplayTransport requires httpx. Install it with: pip install tmai-api[async]")
+        _check_mode(mode)
+        self.fixtures = FixtureStore(path)
+        self.mode = mode
+        self.latency = latency
+        self.transport = transport or httpx.AsyncHTTPTransport()
+    
+    async def handle_async_request(self, request):
+        key = self.fixtures.key(request.method, str(request.url), await request.aread())
+        if self.mode != 'record':
+            record = self.fixtures.load(key)
+            if record is not None:
+                delay = _replay_delay(record, self.latency)
+                if delay:
+                    await asyncio.sleep(delay)
+                return _httpx_response(request, record)
+            if self.mode == 'replay':
+                raise FixtureNotFound(f"No fixture for {request.method} {request.url}")
+        
+        started = time.monotonic()
+        response = await self.transport.handle_async_request(request)
+        try:
+            await response.aread()
+        finally:
+            await response.aclose()
+        return _httpx_record(self.fixtures, key, request, response, time.monotonic() - started)
+    
+    async def aclose(self):
+        await self.transport.aclose()
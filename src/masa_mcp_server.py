@@ -1,12 +1,13 @@
 # masa_mcp_server.py
 import asyncio
+import time
 from typing import Dict, Optional, Any
 
 import httpx
 from mcp.server.fastmcp import FastMCP, Context
 
-from config import get_masa_api_key
-from masa_util import get_sentiment_for_token
+from config import get_http_transport, get_masa_api_key
+from masa_util import REQUEST_TIMEOUT, SENTIMENT_DEADLINE, get_sentiment_for_token
 
 # Initialize our MCP server
 mcp = FastMCP("Masa Data API")
@@ -31,7 +32,8 @@ async def masa_api_request(
         "Content-Type": "application/json"
     }
     
-    async with httpx.AsyncClient(verify=False) as client:
+    async with httpx.AsyncClient(verify=False, transport=get_http_transport(verify=False),
+                                 timeout=REQUEST_TIMEOUT) as client:
         if method.lower() == "get":
             response = await client.get(url, headers=headers, params=params)
         elif method.lower() == "post":
@@ -217,12 +219,14 @@ async def check_sentiment_for_token_on_twitter(token_symbol: str) -> str:
         token_symbol: The symbol of the crypto token to check sentiment for (e.g., "BTC", "ETH")
 
     Returns:
-        A string indicating the sentiment for the token
+        A string indicating the sentiment for the token, or saying that the lookup timed out
     """
     if not token_symbol:
         raise ValueError("Token symbol cannot be empty.")
 
-    return get_sentiment_for_token(token_symbol)
+    # Run the blocking lookup off the event loop, bounded by SENTIMENT_DEADLINE
+    deadline = time.monotonic() + SENTIMENT_DEADLINE
+    return await asyncio.to_thread(get_sentiment_for_token, token_symbol, deadline)
 
 
 # ===== RESOURCES =====
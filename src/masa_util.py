@@ -78,11 +78,40 @@ from typing import Dict, Any, Optional
 
 import requests
 
-from config import get_masa_api_key
+from config import get_masa_api_key, load_config
+
+# Seconds allowed for one HTTP call to the Masa API, and for a whole sentiment lookup
+REQUEST_TIMEOUT = float(load_config("MASA_REQUEST_TIMEOUT", "10"))
+SENTIMENT_DEADLINE = float(load_config("MASA_SENTIMENT_DEADLINE", "45"))
+
+# Seconds between polls of a live search's status
+STATUS_POLL_INTERVAL = 5
+
+
+def request_timeout(deadline: Optional[float] = None) -> float:
+    """
+    Return the timeout of the next HTTP call: REQUEST_TIMEOUT, capped by the time left before deadline.
+
+    Args:
+        deadline (float, optional): time.monotonic() value by which the whole operation must finish.
+
+    Returns:
+        float: Timeout in seconds.
+
+    Raises:
+        TimeoutError: If the deadline has already passed.
+    """
+    if deadline is None:
+        return REQUEST_TIMEOUT
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        raise TimeoutError("Masa API call ran out of time")
+    return min(REQUEST_TIMEOUT, remaining)
 
 
 def make_post_call(url: str, request_body: Dict[str, Any], api_key: str = None,
-                   headers: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+                   headers: Optional[Dict[str, str]] = None,
+                   timeout: float = REQUEST_TIMEOUT) -> Dict[str, Any]:
     """
     Make an HTTP POST request to the specified URL with a JSON request body and optional API key.
 
@@ -92,6 +121,7 @@ def make_post_call(url: str, request_body: Dict[str, Any], api_key: str = None,
         api_key (str, optional): API key to be included as a Bearer token.
         headers (Optional[Dict[str, str]]): Additional headers to include in the request.
                                            Default Content-Type will be application/json.
+        timeout (float, optional): Seconds to wait for the server before giving up.
 
     Returns:
         Dict[str, Any]: The JSON response from the server.
@@ -117,7 +147,8 @@ def make_post_call(url: str, request_body: Dict[str, Any], api_key: str = None,
         response = requests.post(
             url=url,
             data=json.dumps(request_body),
-            headers=headers
+            headers=headers,
+            timeout=timeout
         )
 
         # Raise an exception for bad status codes
@@ -134,7 +165,8 @@ def make_post_call(url: str, request_body: Dict[str, Any], api_key: str = None,
         raise
 
 
-def make_get_call(url: str, api_key: str, headers: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+def make_get_call(url: str, api_key: str, headers: Optional[Dict[str, str]] = None,
+                  timeout: float = REQUEST_TIMEOUT) -> Dict[str, Any]:
     """
     Make an HTTP GET request to the specified URL.
 
@@ -142,6 +174,7 @@ def make_get_call(url: str, api_key: str, headers: Optional[Dict[str, str]] = No
         url (str): The URL to send the request to.
         api_key (str): API key to be included as a Bearer token.
         headers (Optional[Dict[str, str]]): Additional headers to include in the request.
+        timeout (float, optional): Seconds to wait for the server before giving up.
 
     Returns:
         Dict[str, Any]: The JSON response from the server.
@@ -156,7 +189,7 @@ def make_get_call(url: str, api_key: str, headers: Optional[Dict[str, str]] = No
 
     try:
         # Make the GET request
-        response = requests.get(url, headers=headers)
+        response = requests.get(url, headers=headers, timeout=timeout)
 
         # Raise an exception for bad status codes
         response.raise_for_status()
@@ -169,13 +202,14 @@ def make_get_call(url: str, api_key: str, headers: Optional[Dict[str, str]] = No
         raise
 
 
-def call_extraction_api(user_input: str, api_key: str = None) -> Dict[str, Any]:
+def call_extraction_api(user_input: str, api_key: str = None, deadline: Optional[float] = None) -> Dict[str, Any]:
     """
     Call the extraction API with the provided user input.
 
     Args:
         user_input (str): The user input to send to the API.
         api_key (str, optional): API key to authenticate with the service.
+        deadline (float, optional): time.monotonic() value by which the call must finish.
 
     Returns:
         Dict[str, Any]: A dictionary containing the full response from the API.
@@ -184,20 +218,21 @@ def call_extraction_api(user_input: str, api_key: str = None) -> Dict[str, Any]:
     request_body = {"userInput": user_input}
 
     # Use our reusable function to make the API call
-    response_data = make_post_call(url, request_body, api_key)
+    response_data = make_post_call(url, request_body, api_key, timeout=request_timeout(deadline))
 
     return response_data
 
 
 # https://data.dev.masalabs.ai/api/v1/search/live/twitter with POST method, request body of
 # #    {"query":"sentiment","type":"searchbyquery","max_results":10}
-def search_live_twitter(query: str, api_key: str = None) -> Dict[str, Any]:
+def search_live_twitter(query: str, api_key: str = None, deadline: Optional[float] = None) -> Dict[str, Any]:
     """
     Call the live Twitter search API with the provided query.
 
     Args:
         query (str): The search query to send to the API.
         api_key (str, optional): API key to authenticate with the service.
+        deadline (float, optional): time.monotonic() value by which the call must finish.
 
     Returns:
         Dict[str, Any]: A dictionary containing the full response from the API.
@@ -206,7 +241,7 @@ def search_live_twitter(query: str, api_key: str = None) -> Dict[str, Any]:
     request_body = {"query": query, "type": "searchbyquery", "max_results": 10}
 
     # Use our reusable function to make the API call
-    response_data = make_post_call(url, request_body, api_key)
+    response_data = make_post_call(url, request_body, api_key, timeout=request_timeout(deadline))
 
     return response_data
 
@@ -215,12 +250,13 @@ MASA_API_KEY = get_masa_api_key()
 
 
 # Example usage
-def check_status(search_uuid: str) -> str:
+def check_status(search_uuid: str, deadline: Optional[float] = None) -> str:
     """
     Check the status of a search operation using the provided UUID.
 
     Args:
         search_uuid (str): The UUID of the search operation to check.
+        deadline (float, optional): time.monotonic() value after which polling stops with "timeout".
 
     Returns:
         done or error or timeout
@@ -230,7 +266,7 @@ def check_status(search_uuid: str) -> str:
 
     # retry until the status is done
     for i in range(10):
-        response_data = make_get_call(url, MASA_API_KEY)
+        response_data = make_get_call(url, MASA_API_KEY, timeout=request_timeout(deadline))
         print(f"Status Response: {response_data}")
 
         # Check if status is done
@@ -241,20 +277,23 @@ def check_status(search_uuid: str) -> str:
         elif status == "error":
             print("An error occurred during the search.")
             return "error"
+        elif deadline is not None and time.monotonic() + STATUS_POLL_INTERVAL >= deadline:
+            print("Search is still in progress but no time is left. Exiting.")
+            return "timeout"
         else:
             print("Search is still in progress. Retrying...")
             # Sleep for a while before retrying
-            time.sleep(5)
+            time.sleep(STATUS_POLL_INTERVAL)
 
     print("Max retries reached. Exiting.")
     return "timeout"
 
 
-def get_search_result(search_uuid: str):
+def get_search_result(search_uuid: str, deadline: Optional[float] = None):
     # 4. call the api https://data.dev.masalabs.ai/api/v1/search/live/twitter/result/451fef48-afe1-4cd0-a4c4-4874cb74ea27
     #    to get the result, the response data has data field in json form
     url = f"https://data.dev.masalabs.ai/api/v1/search/live/twitter/result/{search_uuid}"
-    response_data = make_get_call(url, MASA_API_KEY)
+    response_data = make_get_call(url, MASA_API_KEY, timeout=request_timeout(deadline))
     print(f"Search Result: {response_data}")
     return response_data
 
@@ -288,13 +327,14 @@ def format_tweet_info(tweet_data):
 
 
 def call_analysis(analysis_input: Dict[str, Any],  # {"tweets": tweets, "prompt": user_input}
-                  api_key: str = None) -> Dict[str, Any]:
+                  api_key: str = None, deadline: Optional[float] = None) -> Dict[str, Any]:
     """
     Call the analysis API with the provided tweets.
 
     Args:
         analysis_input (dict): The tweets and prompt to send to the API.
         api_key (str, optional): API key to authenticate with the service.
+        deadline (float, optional): time.monotonic() value by which the call must finish.
 
     Returns:
         Dict[str, Any]: A dictionary containing the full response from the API.
@@ -302,7 +342,7 @@ def call_analysis(analysis_input: Dict[str, Any],  # {"tweets": tweets, "prompt"
     url = "https://data.dev.masalabs.ai/api/v1/search/analysis"
 
     # Use our reusable function to make the API call
-    response_data = make_post_call(url, analysis_input, api_key)
+    response_data = make_post_call(url, analysis_input, api_key, timeout=request_timeout(deadline))
 
     return response_data
 
@@ -322,21 +362,25 @@ def format_search_result(original_query: str,
     return full_text
 
 
-def get_sentiment_for_token(token: str) -> str:
+def get_sentiment_for_token(token: str, deadline: Optional[float] = None) -> str:
+    # Every step below shares the time left before the deadline (a time.monotonic() value)
+    search_result = None
     try:
         user_input = f"What is the current sentiment on X about {token}?"
-        extraction_result = call_extraction_api(user_input, MASA_API_KEY)
+        extraction_result = call_extraction_api(user_input, MASA_API_KEY, deadline)
         print(f"Search Term: {extraction_result.get('searchTerm')}")
         search_term = extraction_result.get('searchTerm')
         # search live twitter
-        search_response = search_live_twitter(search_term, MASA_API_KEY)
+        search_response = search_live_twitter(search_term, MASA_API_KEY, deadline)
         print(f"Twitter Search Response: {search_response}")
         search_uuid = search_response.get('uuid')
         # check status
-        search_status = check_status(search_uuid)
+        search_status = check_status(search_uuid, deadline)
+        if search_status == 'timeout':
+            return f"Timed out: the X search for {token} did not finish in time, so no sentiment is available."
 
         if search_status == 'done':
-            search_result = get_search_result(search_uuid)
+            search_result = get_search_result(search_uuid, deadline)
             tweets = format_search_result(original_query=user_input,
                                           optimized_query=search_term,
                                           search_result=search_result)
@@ -344,10 +388,16 @@ def get_sentiment_for_token(token: str) -> str:
             analysis_input['tweets'] = tweets
             analysis_input['prompt'] = user_input
             ## call analysis API with formated
-            analysis_result = call_analysis(analysis_input, MASA_API_KEY)
+            analysis_result = call_analysis(analysis_input, MASA_API_KEY, deadline)
             # print(f"Analysis Result: {analysis_result}")
             return analysis_result.get('analysis')
 
+    except (TimeoutError, requests.exceptions.Timeout) as e:
+        print(f"Timed out: {e}")
+        if search_result:
+            return (f"Partial result: {len(search_result)} posts about {token} were found, "
+                    f"but the sentiment analysis did not finish in time.")
+        return f"Timed out: the sentiment lookup for {token} did not finish in time."
     except Exception as e:
         print(f"An error occurred: {e}")
         return "Error occurred while fetching sentiment."
@@ -1,16 +1,20 @@
 import asyncio
+import copy
 import json
 import logging
 import os
+import random
+import time
 import traceback
 from datetime import datetime, timedelta  # Make sure to import the datetime class
+from email.utils import parsedate_to_datetime
 from typing import Dict, Any, List, Optional
 
 import httpx
 from mcp.server.fastmcp import FastMCP, Context
 from pydantic import BaseModel
 
-from config import get_token_metrics_api_key
+from config import get_http_transport, get_token_metrics_api_key, load_config
 
 # Configure logging
 logging.basicConfig(
@@ -24,18 +28,23 @@ logger = logging.getLogger('mcp_server')
 # Initialize our MCP server
 mcp = FastMCP("TokenMetrics API")
 
-# TokenMetrics API configuration
-TOKEN_METRICS_API_BASE = "https://api.tokenmetrics.com/v2"
+# TokenMetrics API configuration; override TOKEN_METRICS_API_BASE to target a local stand-in
+TOKEN_METRICS_API_BASE = load_config("TOKEN_METRICS_API_BASE", "https://api.tokenmetrics.com/v2")
 
+# Seconds allowed for one HTTP attempt, and for a whole tool call including retries.
+# A tool that runs out of time answers with what it has instead of stalling the conversation.
+REQUEST_TIMEOUT = float(load_config("TOKEN_METRICS_REQUEST_TIMEOUT", "10"))
+TOOL_DEADLINE = float(load_config("TOKEN_METRICS_TOOL_DEADLINE", "25"))
 
-def fetch_token_metrics() -> Dict[str, Any]:
+
+async def fetch_token_metrics() -> Dict[str, Any]:
     """Make a request to the TokenMetrics API to fetch token information"""
-    url = "https://api.tokenmetrics.com/v2/tokens"
+    url = f"{TOKEN_METRICS_API_BASE}/tokens"
     params = {"limit": 100000}
 
-    with httpx.Client() as client:
+    async with httpx.AsyncClient(transport=get_http_transport(), timeout=REQUEST_TIMEOUT) as client:
         try:
-            response = client.get(url, params=params)
+            response = await client.get(url, params=params)
             response.raise_for_status()
 
             try:
@@ -55,6 +64,48 @@ def fetch_token_metrics() -> Dict[str, Any]:
             return {"error": f"An error occurred: {str(e)}"}
 
 
+# Seconds before the cached tokens catalog is downloaded again
+TOKEN_INDEX_TTL = 24 * 3600
+
+# Symbol index over the tokens catalog, built once and refreshed after TOKEN_INDEX_TTL.
+# "pending" holds the download in progress, shared by concurrent tool calls.
+token_index: Dict[str, Any] = {"fetched_at": 0.0, "by_symbol": {}, "pending": None}
+
+
+async def get_token_index() -> Dict[str, List[Dict[str, Any]]]:
+    """Return the upper-cased symbol -> tokens index, downloading the catalog only when stale
+
+    The download runs on the async client, so other tool calls keep being
+    served meanwhile, and concurrent callers await the same download.
+
+    Raises:
+        RuntimeError: If the catalog could not be downloaded
+    """
+    if token_index["by_symbol"] and time.time() - token_index["fetched_at"] < TOKEN_INDEX_TTL:
+        return token_index["by_symbol"]
+
+    pending = token_index["pending"]
+    if pending is None:
+        pending = token_index["pending"] = asyncio.ensure_future(refresh_token_index())
+        pending.add_done_callback(lambda _: token_index.update(pending=None))
+    return await asyncio.shield(pending)
+
+
+async def refresh_token_index() -> Dict[str, List[Dict[str, Any]]]:
+    """Download the tokens catalog and rebuild the symbol index"""
+    result = await fetch_token_metrics()
+    if "error" in result:
+        raise RuntimeError(result["error"])
+
+    by_symbol: Dict[str, List[Dict[str, Any]]] = {}
+    for token in result.get("data", []):
+        by_symbol.setdefault(str(token.get("TOKEN_SYMBOL", "")).upper(), []).append(token)
+
+    token_index.update(fetched_at=time.time(), by_symbol=by_symbol)
+    logging.info(f"Indexed {len(by_symbol)} token symbols")
+    return by_symbol
+
+
 @mcp.tool()
 async def get_token_info(symbol: str, name: str) -> Dict[str, Any]:
     """
@@ -72,44 +123,27 @@ async def get_token_info(symbol: str, name: str) -> Dict[str, Any]:
         - data: token information (token_id, token_name, token_symbol) if found
     """
 
-    # result = await fetch_token_metrics()
-    result = fetch_token_metrics()
-
-    logging.info('get token info result', result)
-
-    if "error" in result:
-        return {
-            "success": False,
-            "message": result["error"],
-            "data": None
-        }
-
-    logging.info('before for loop')
-
-    ### create a dictionary of token symbol to a list of tokens
-    token_dict = {}
-    for token in result.get("data", []):
-        tmp = token.get("TOKEN_SYMBOL")
-        if tmp not in token_dict:
-            token_dict[tmp] = []
-        token_dict[tmp].append(token)
-
-    logging.info('after for loop')
-    # Check if the symbol exists in the token_dict
-    if symbol in token_dict:
-        # Check if the name exists in the list of tokens for that symbol
-        for token in token_dict[symbol]:
-            if token.get("TOKEN_NAME") == name:
-                # Return the token information
-                return {
-                    "success": True,
-                    "message": f"Found token with symbol {symbol} and name {name}",
-                    "data": {
-                        "token_id": token.get("TOKEN_ID"),
-                        "token_name": token.get("TOKEN_NAME"),
-                        "token_symbol": token.get("TOKEN_SYMBOL")
-                    }
+    try:
+        token_dict = await get_token_index()
+    except RuntimeError as e:
+        # Without the catalog the symbol cannot be resolved; answer as for an unknown symbol
+        logging.warning(f"Token catalog unavailable: {e}")
+        token_dict = {}
+
+    # Check if the symbol exists in the token index
+    for token in token_dict.get(symbol.upper(), []):
+        # Check if the name matches one of the tokens for that symbol
+        if str(token.get("TOKEN_NAME", "")).casefold() == name.casefold():
+            # Return the token information
+            return {
+                "success": True,
+                "message": f"Found token with symbol {symbol} and name {name}",
+                "data": {
+                    "token_id": token.get("TOKEN_ID"),
+                    "token_name": token.get("TOKEN_NAME"),
+                    "token_symbol": token.get("TOKEN_SYMBOL")
                 }
+            }
 
     return {
         "success": False,
@@ -222,31 +256,141 @@ class TradingSignalResponse(BaseModel):
 
 TOKEN_METRICS_API_KEY = get_token_metrics_api_key()
 
+# Retry configuration for Token Metrics API requests
+MAX_RETRIES = 3
+BACKOFF_FACTOR = 0.5
+MAX_BACKOFF = 30
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+# Counters for throttled, retried and coalesced requests, useful when tuning request volume
+request_stats = {"requests": 0, "rate_limited": 0, "retried": 0, "coalesced": 0}
+
+# Requests in flight, keyed by endpoint, params and API key; identical concurrent
+# tool calls await the same task instead of each calling the API
+in_flight_requests: Dict[str, Dict[str, Any]] = {}
+
+
+def retry_delay(attempt: int, response: Optional[httpx.Response] = None) -> float:
+    """Return the delay before the next retry, honouring Retry-After when present"""
+    if response is not None:
+        retry_after = response.headers.get("Retry-After")
+        if retry_after:
+            try:
+                return max(0.0, float(retry_after))
+            except ValueError:
+                try:
+                    retry_at = parsedate_to_datetime(retry_after)
+                    return max(0.0, retry_at.timestamp() - time.time())
+                except (TypeError, ValueError):
+                    pass
+    # Full jitter exponential backoff
+    return random.uniform(0, min(MAX_BACKOFF, BACKOFF_FACTOR * (2 ** attempt)))
+
+
+def time_left(deadline: Optional[float]) -> Optional[float]:
+    """Return the seconds left before deadline (a time.monotonic() value), or None without a deadline"""
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
 # Helper function to make authenticated requests to the Token Metrics API
 async def make_api_request(
         endpoint: str,
         params: Dict[str, Any],
         api_key: str = TOKEN_METRICS_API_KEY,
-        ctx: Optional[Context] = None
+        ctx: Optional[Context] = None,
+        deadline: Optional[float] = None
 ) -> Dict[str, Any]:
-    """Make an authenticated request to the Token Metrics API"""
+    """Make an authenticated request to the Token Metrics API, sharing identical in-flight calls
+
+    Parallel tool calls often ask for the same data at once. The first caller
+    starts the request in its own task; identical calls arriving before it
+    completes wait for the same task and get a copy of its result (or its error).
+
+    The shared request has no deadline of its own, so one caller's deadline
+    never decides the outcome for the others. With a deadline (a
+    time.monotonic() value), the caller stops waiting once it passes and
+    asyncio.TimeoutError is raised. The request is cancelled once no caller
+    is waiting for it any more.
+    """
     if not api_key:
         raise ValueError(
             "API key is required. Set the TOKEN_METRICS_API_KEY environment variable or provide it as a parameter.")
 
+    key = json.dumps([endpoint, params, api_key], sort_keys=True, default=str)
+    flight = in_flight_requests.get(key)
+    leader = flight is None
+    if leader:
+        flight = in_flight_requests[key] = {
+            "task": asyncio.ensure_future(send_api_request(endpoint, params, api_key, ctx)),
+            "callers": 0
+        }
+        flight["task"].add_done_callback(
+            lambda _: in_flight_requests.pop(key) if in_flight_requests.get(key) is flight else None)
+    else:
+        request_stats["coalesced"] += 1
+        if ctx:
+            await ctx.info(f"Joining in-flight request to {endpoint} with params: {params}")
+
+    flight["callers"] += 1
+    try:
+        # wait_for enforces the deadline even while a response body is still trickling in
+        result = await asyncio.wait_for(asyncio.shield(flight["task"]), time_left(deadline))
+    finally:
+        flight["callers"] -= 1
+        if not flight["callers"] and not flight["task"].done():
+            # Every caller gave up: stop the request and let the next caller start afresh
+            flight["task"].cancel()
+            if in_flight_requests.get(key) is flight:
+                del in_flight_requests[key]
+    return result if leader else copy.deepcopy(result)
+
+
+async def send_api_request(
+        endpoint: str,
+        params: Dict[str, Any],
+        api_key: str,
+        ctx: Optional[Context] = None
+) -> Dict[str, Any]:
+    """Send one authenticated request to the Token Metrics API, retrying 429/5xx responses
+
+    Each attempt is limited to REQUEST_TIMEOUT. Callers bound the whole
+    request, retries included, with their own deadline.
+    """
     url = f"{TOKEN_METRICS_API_BASE}/{endpoint}"
     headers = {"accept": "application/json", "api_key": api_key}
 
     if ctx:
-        ctx.info(f"Making request to {endpoint} with params: {params}")
+        await ctx.info(f"Making request to {endpoint} with params: {params}")
 
-    async with httpx.AsyncClient() as client:
-        response = await client.get(url, params=params, headers=headers)
+    async with httpx.AsyncClient(transport=get_http_transport(), timeout=REQUEST_TIMEOUT) as client:
+        attempt = 0
+        while True:
+            request_stats["requests"] += 1
+            try:
+                response = await client.get(url, params=params, headers=headers)
+            except httpx.TransportError as e:
+                if attempt >= MAX_RETRIES:
+                    raise
+                delay = retry_delay(attempt)
+                logging.warning(f"Request to {endpoint} failed ({e}), retrying in {delay:.2f}s")
+            else:
+                if response.status_code not in RETRY_STATUS_CODES or attempt >= MAX_RETRIES:
+                    break
+                if response.status_code == 429:
+                    request_stats["rate_limited"] += 1
+                delay = retry_delay(attempt, response)
+                logging.warning(f"Request to {endpoint} returned {response.status_code}, retrying in {delay:.2f}s")
+
+            request_stats["retried"] += 1
+            attempt += 1
+            await asyncio.sleep(delay)
 
         if response.status_code != 200:
             error_message = f"API request failed with status code {response.status_code}: {response.text}"
             if ctx:
-                ctx.error(error_message)
+                await ctx.error(error_message)
             raise ValueError(error_message)
 
         return json.loads(response.text)
@@ -292,7 +436,8 @@ async def list_popular_cryptocurrencies() -> str:
 async def get_trading_signals_by_token_ids(
         token_ids: List[int] = [3375],
         days: int = 2,
-        ctx: Context = None
+        ctx: Context = None,
+        deadline: Optional[float] = None
 ) -> TradingSignalResponse:
     """
     Get trading signals for a specific cryptocurrency.
@@ -300,6 +445,7 @@ async def get_trading_signals_by_token_ids(
     Args:
         token_ids: The Token Metrics IDs for the cryptocurrencies (default: [3375] for [Bitcoin])
         days: Number of days of data to retrieve (default: 2)
+        deadline: time.monotonic() value by which the API must have answered (default: none)
     
     Returns:
         TradingSignalResponse object containing:
@@ -344,7 +490,7 @@ async def get_trading_signals_by_token_ids(
     try:
         logging.info(f"Fetching trading signals for token IDs: {token_ids} from {start_date_str} to {end_date_str}")
         # Make API request
-        response_data = await make_api_request("trading-signals", params, key, ctx)
+        response_data = await make_api_request("trading-signals", params, key, ctx, deadline)
 
         # Check for successful response
         if not response_data.get("success", False):
@@ -365,6 +511,8 @@ async def get_trading_signals_by_token_ids(
                                      data = trading_signals)
         return resp
 
+    except asyncio.TimeoutError:
+        raise
     except Exception as e:
         logging.error(f"An error occurred: {str(e)}")
         error_message = str(e)
@@ -401,6 +549,8 @@ async def get_trading_signals(token_symbols: List[str], days: int = 3, ctx: Cont
     """
 
     logging.info(f"To find trading signals for: {token_symbols}")
+    # The whole tool call, including retries, must answer within TOOL_DEADLINE
+    deadline = time.monotonic() + TOOL_DEADLINE
     # Check if token_symbols is empty
     if not token_symbols:
         raise ValueError("No token symbols provided")
@@ -410,6 +560,17 @@ async def get_trading_signals(token_symbols: List[str], days: int = 3, ctx: Cont
         token_ids = []
         for symbol in token_symbols:
             token_id = popular_cryptos_dict.get(symbol, "")
+            if not token_id:
+                # Fall back to the catalog index when the symbol is unambiguous
+                try:
+                    # The catalog download counts against the tool deadline too
+                    token_dict = await asyncio.wait_for(get_token_index(), time_left(deadline))
+                    matches = token_dict.get(symbol.upper(), [])
+                except RuntimeError as e:
+                    logging.warning(f"Token catalog unavailable, skipping {symbol}: {e}")
+                    matches = []
+                if len(matches) == 1:
+                    token_id = matches[0].get("TOKEN_ID")
             if token_id:
                 token_ids.append(token_id)
             logging.info(f"Token ID for {symbol}: {token_id}")
@@ -420,8 +581,17 @@ async def get_trading_signals(token_symbols: List[str], days: int = 3, ctx: Cont
 
         logging.info(f"To get signals for token IDs: {token_ids}")
 
-        return await get_trading_signals_by_token_ids(token_ids=token_ids, days=days, ctx=ctx)
-
+        return await get_trading_signals_by_token_ids(token_ids=token_ids, days=days, ctx=ctx,
+                                                      deadline=deadline)
+
+    except asyncio.TimeoutError:
+        logging.warning(f"Trading signals for {token_symbols} timed out after {TOOL_DEADLINE:g}s")
+        # Tell the model the data is missing because of the time limit, not because there is none
+        return TradingSignalResponse(success=False,
+                                     message=f"Timed out: the Token Metrics API did not answer within "
+                                             f"{TOOL_DEADLINE:g}s, so no signals are included. Try again later.",
+                                     length=0,
+                                     data=[])
     except Exception as e:
         logger.error("An error occurred: %s", traceback.format_exc())
         traceback.print_exc()